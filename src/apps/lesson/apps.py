@@ -6,4 +6,5 @@ class LessonConfig(AppConfig):
     label = "lesson_app"
      
     def ready(self):
-        from . import signals
\ No newline at end of file
+        from . import signals
+        from .dashboard import signals as dashboard_signals
\ No newline at end of file
@@ -0,0 +1,194 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (Count, F, IntegerField, OuterRef, Subquery,
+                              Window)
+from django.db.models.functions import Coalesce, RowNumber
+
+from ..models import LessonContent, Progress, Submission
+from ...skills.models import Enrollment
+from ...skills.payments.models import Purchase
+from ...users.profiles.models import ChildProfile
+
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PREFIX = "guardian_dashboard"
+# bumped when lesson contents change, that touches every dashboard at once
+_CONTENT_VERSION_KEY = f"{_CACHE_PREFIX}:content_version"
+
+
+def _timeout() -> int:
+    return getattr(settings, "GUARDIAN_DASHBOARD_CACHE_TTL", 60 * 5)
+
+
+def _recent_limit() -> int:
+    return getattr(settings, "GUARDIAN_DASHBOARD_RECENT", 5)
+
+
+def _content_version() -> int:
+    return cache.get_or_set(_CONTENT_VERSION_KEY, 1, timeout=None)
+
+
+def _cache_key(guardian_id) -> str:
+    return f"{_CACHE_PREFIX}:{_content_version()}:{guardian_id}"
+
+
+def _count(queryset, group: str):
+    # a correlated COUNT that is 0 instead of NULL without rows
+    return Coalesce(
+        Subquery(queryset.order_by().values(group).annotate(
+            total=Count("pk")).values("total"),
+                 output_field=IntegerField()), 0)
+
+
+def _latest_per_child(queryset, order_by):
+    # the newest rows of every child in one query; filtering on the window
+    # wraps it in a subquery, whose row order the outer query does not keep
+    return queryset.annotate(row=Window(RowNumber(),
+                                        partition_by=F("child_profile"),
+                                        order_by=order_by)).filter(
+                                            row__lte=_recent_limit()).order_by(
+                                                order_by)
+
+
+def _enrollments(child_ids) -> dict:
+    contents = LessonContent.objects.filter(skill=OuterRef("skill"),
+                                            is_active=True)
+    completed = Progress.objects.filter(
+        child_profile=OuterRef("child_profile"),
+        lesson_content__skill=OuterRef("skill"),
+        lesson_content__is_active=True,
+        is_completed=True)
+    rows = Enrollment.objects.filter(
+        child_profile__in=child_ids, is_active=True).annotate(
+            total_contents=_count(contents, "skill"),
+            completed_contents=_count(completed, "child_profile")).values(
+                "child_profile", "skill", "skill__name", "created_at",
+                "total_contents", "completed_contents")
+    enrollments = defaultdict(list)
+    for row in rows:
+        total = row["total_contents"]
+        enrollments[row["child_profile"]].append({
+            "skill_id": row["skill"],
+            "skill": row["skill__name"],
+            "enrolled_at": row["created_at"],
+            "total_contents": total,
+            "completed_contents": row["completed_contents"],
+            "completion": round(100 * row["completed_contents"] / total, 1)
+            if total else 0.0,
+        })
+    return enrollments
+
+
+def _submissions(child_ids) -> dict:
+    statuses = Submission.SubmissionStatus
+    submissions = defaultdict(lambda: {
+        "pending": 0,
+        "approved": 0,
+        "rejected": 0,
+        "recent": []
+    })
+    counts = Submission.objects.filter(child_profile__in=child_ids).values(
+        "child_profile", "status").annotate(total=Count("pk")).order_by()
+    names = {
+        statuses.SUBMITTED: "pending",
+        statuses.APPROVED: "approved",
+        statuses.REJECT: "rejected"
+    }
+    for row in counts:
+        if row["status"] in names:
+            submissions[row["child_profile"]][names[row["status"]]] = row[
+                "total"]
+    recent = _latest_per_child(
+        Submission.objects.filter(
+            child_profile__in=child_ids,
+            status__in=[statuses.SUBMITTED, statuses.APPROVED]),
+        F("created_at").desc()).values("child_profile", "submission_id",
+                                       "project__title", "status",
+                                       "submitted_at", "approved_at")
+    for row in recent:
+        child = row.pop("child_profile")
+        row["project"] = row.pop("project__title")
+        submissions[child]["recent"].append(row)
+    return submissions
+
+
+def _purchases(child_ids) -> dict:
+    purchases = defaultdict(list)
+    rows = _latest_per_child(
+        Purchase.objects.filter(purchased_for__in=child_ids).annotate(
+            child_profile=F("purchased_for")),
+        F("created_at").desc()).values("child_profile", "purchase_id",
+                                       "skill", "skill__name",
+                                       "purchase_status", "price",
+                                       "created_at")
+    for row in rows:
+        child = row.pop("child_profile")
+        row["skill_id"] = row.pop("skill")
+        row["skill"] = row.pop("skill__name")
+        purchases[child].append(row)
+    return purchases
+
+
+def build_dashboard(guardian) -> list:
+    """
+    Every active child of ``guardian`` with enrollments, completion per
+    skill, submissions and recent purchases.
+
+    Each section is one grouped query over all the children, so the
+    dashboard takes five queries however many children there are.
+    """
+    children = list(
+        ChildProfile.objects.filter(guardian=guardian,
+                                    is_active=True,
+                                    is_deleted=False).values(
+                                        "child_id", "first_name",
+                                        "last_name", "date_of_birth"))
+    if not children:
+        return []
+    child_ids = [child["child_id"] for child in children]
+    enrollments = _enrollments(child_ids)
+    submissions = _submissions(child_ids)
+    purchases = _purchases(child_ids)
+    for child in children:
+        child_id = child["child_id"]
+        child["enrollments"] = enrollments.get(child_id, [])
+        child["submissions"] = submissions[child_id]
+        child["purchases"] = purchases.get(child_id, [])
+    return children
+
+
+def get_dashboard(guardian) -> list:
+    """ The cached dashboard of ``guardian``, built on a miss """
+    key = _cache_key(guardian.pk)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(guardian)
+        cache.set(key, dashboard, timeout=_timeout())
+    return dashboard
+
+
+def invalidate_dashboard(guardian_id):
+    """ Drop a guardian's dashboard once the current transaction commits """
+    if guardian_id is None:
+        return
+    transaction.on_commit(lambda: cache.delete(_cache_key(guardian_id)))
+
+
+def invalidate_child_dashboard(child_id):
+    guardian_id = ChildProfile.objects.filter(pk=child_id).values_list(
+        "guardian_id", flat=True).first()
+    invalidate_dashboard(guardian_id)
+
+
+def invalidate_all_dashboards():
+    def bump():
+        try:
+            cache.incr(_CONTENT_VERSION_KEY)
+        except ValueError:
+            cache.set(_CONTENT_VERSION_KEY, 2, timeout=None)
+
+    transaction.on_commit(bump)
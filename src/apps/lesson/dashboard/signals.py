@@ -0,0 +1,32 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+
+from ..models import LessonContent, Progress, Submission
+from ...skills.models import Enrollment
+from ...skills.payments.models import Purchase
+from ...users.profiles.models import ChildProfile
+from .services import (invalidate_dashboard, invalidate_child_dashboard,
+                       invalidate_all_dashboards)
+
+
+@receiver([post_save, post_delete], sender=ChildProfile)
+def child_profile_changed(sender, instance, **kwargs):
+    invalidate_dashboard(instance.guardian_id)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+@receiver([post_save, post_delete], sender=Progress)
+@receiver([post_save, post_delete], sender=Submission)
+def child_activity_changed(sender, instance, **kwargs):
+    invalidate_child_dashboard(instance.child_profile_id)
+
+
+@receiver([post_save, post_delete], sender=Purchase)
+def purchase_changed(sender, instance, **kwargs):
+    invalidate_child_dashboard(instance.purchased_for_id)
+
+
+@receiver([post_save, post_delete], sender=LessonContent)
+def lesson_content_changed(sender, instance, **kwargs):
+    # completion percentages of every enrolled child move
+    invalidate_all_dashboards()
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+dashboard_urlpatterns = [
+    path("guardian/dashboard/",
+         views.GuardianDashboardView.as_view(),
+         name="guardian_dashboard")
+]
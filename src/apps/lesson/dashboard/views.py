@@ -0,0 +1,22 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework import status
+
+from ...users.profiles.permissions import IsGuardian
+from .services import get_dashboard
+
+
+class GuardianDashboardView(APIView):
+    """ Everything the guardian app shows for each child, in one call """
+    http_method_names = ["get"]
+    permission_classes = [IsGuardian]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "status": "success",
+                "detail": {
+                    "children": get_dashboard(request.user)
+                }
+            },
+            status=status.HTTP_200_OK)
@@ -6,11 +6,12 @@ from django.db import transaction
 
 from .models import Recommendation, Skills
 from ...skills.helpers import _child_age_or_none
-from .services.recommendation_service import AgeRecommendation, AIRecommendation
+from .services.recommendation_service import (AgeRecommendation, AIRecommendation,
+                                              InterestRecommendation)
 from ...skills.serializers import SkillReadSerializer
 
 class RecommendationSerializer(serializers.ModelSerializer):
-    choices = ["system", "ai"]
+    choices = ["system", "ai", "interest"]
 
     class Meta:
         model = Recommendation
@@ -57,6 +58,23 @@ class RecommendationSerializer(serializers.ModelSerializer):
                     recommendation_table.skills.set(response)
             except Exception as e:
                 raise serializers.ValidationError("Error creating recommendation", code="invalid_request")
+        elif recommendation_choices.lower() == self.choices[2]:
+            # mapped interests, answered from the database without the LLM
+            response = InterestRecommendation(child_profile).recommend()
+            if not response:
+                raise NotFound()
+            try:
+                with transaction.atomic():
+                    recommendation_table = Recommendation.objects.create(
+                            child_profile=child_profile,
+                            recommendation_score=max(skill.score for skill in response),
+                            reason="Interest-based recommendation",
+                            recommendation_type=Recommendation.RecommendationType.INTEREST_BASED,
+                            recommended_by=Recommendation.RecommendedBy.SYSTEM
+                        )
+                    recommendation_table.skills.set(response)
+            except Exception as e:
+                raise serializers.ValidationError("Error creating recommendation", code="invalid_request")
         elif recommendation_choices.lower() == self.choices[1]:
             list_of_child_interest = list()
             child_interest = child_profile.interest.all()
@@ -1,4 +1,8 @@
 from ....skills.models import Skills
+from ....users.profiles.models import ChildInterest
+
+from django.db import connection
+from django.db.models import Sum
 from .prompts import build_prompt
 from .generate_service import generate_recommendations
 
@@ -19,10 +23,69 @@ class AgeRecommendation:
 
         # Get recommendation where the min_age > child_age or the max_age < child_age
         age_based_recommendation = queryset.filter(min_age__lte=self.child_age, 
-                                                   max_age__gte=self.child_age, is_active=True, is_delete=False)
+                                                   max_age__gte=self.child_age, is_active=True, is_deleted=False)
 
         return age_based_recommendation
+
+    @classmethod
+    def for_children(cls, children):
+        """
+        Age appropriate skill ids for many children, keyed by child id.
+
+        One query joins the children's stored ``ChildProfile.age`` to the
+        skills whose age range holds it, through the (min_age, max_age)
+        index. A child without a matching skill maps to an empty list.
+        """
+        ages, params = children.filter(age__isnull=False).order_by().values(
+            "pk", "age").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT c.pk, s.skill_id FROM ({ages}) c "
+                f"LEFT JOIN {Skills._meta.db_table} s "
+                "ON s.min_age <= c.age AND s.max_age >= c.age "
+                "AND s.is_active AND NOT s.is_deleted", params)
+            rows = cursor.fetchall()
+        # raw rows carry the backend's pk values, uuids are text on sqlite
+        child_pk = children.model._meta.pk.to_python
+        skill_pk = Skills._meta.pk.to_python
+        gated = {}
+        for child_id, skill_id in rows:
+            skill_ids = gated.setdefault(child_pk(child_id), [])
+            if skill_id is not None:
+                skill_ids.append(skill_pk(skill_id))
+        return gated
     
+class InterestRecommendation:
+    """
+    Skills matched to a child's interests through the interest vocabulary
+    and the weighted ``InterestSkill`` map: one indexed join, no LLM call.
+    """
+
+    def __init__(self, child_profile, limit: int = 20):
+        self.child_profile = child_profile
+        self.limit = limit
+
+    def recommend(self):
+        # each topic once, however many of the child's interests resolve
+        # to it
+        topics = ChildInterest.objects.filter(child=self.child_profile,
+                                              is_active=True,
+                                              is_deleted=False,
+                                              topic__is_active=True).values(
+                                                  "topic_id")
+        queryset = Skills.objects.select_related("category", "user").filter(
+            interest_links__interest__in=topics,
+            is_active=True,
+            is_deleted=False)
+        age = getattr(self.child_profile, "age", None)
+        if age is not None:
+            queryset = queryset.filter(min_age__lte=age, max_age__gte=age)
+        # a skill serving several of the child's interests adds up
+        return queryset.annotate(
+            score=Sum("interest_links__weight")).order_by(
+                "-score", "name")[:self.limit]
+
+
 class AIRecommendation:
     def __init__(self, interest = None, age: int = None):
         self.interest = interest
@@ -1,5 +1,5 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
 from django.utils import timezone
 
 from .models import Submission
@@ -8,19 +8,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-@receiver(post_save, sender=Submission)
-def set_time_submitted_after_submission(sender, instance, created, **kwargs):
-    if not created:
-        return 
+@receiver(pre_save, sender=Submission)
+def set_time_submitted_after_submission(sender, instance, **kwargs):
+    """ Stamp a new submission in the same INSERT instead of re-saving it """
+    if not instance._state.adding:
+        return
     if not isinstance(instance, Submission):
-        return  
-    
+        return
+
     logger.debug("Signal fired for time submission")
-    try:
+    if instance.submitted_at is None:
         instance.submitted_at = timezone.now()
+    if not instance.status:
         instance.status = Submission.SubmissionStatus.SUBMITTED
-        instance.save(update_fields=["submitted_at"])
-        logger.debug("Successfully set time of submission")
-    except Exception as e:
-        logger.exception(f"error setting time of submission: {str(e)}")
-
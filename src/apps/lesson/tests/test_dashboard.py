@@ -0,0 +1,140 @@
+from ..models import LessonContent, Progress, Projects, Submission
+from ..dashboard.services import build_dashboard
+from ...skills.models import Skills, Enrollment
+from ...skills.payments.models import Purchase
+
+from tests_config.factories import ChildProfileFactory, UserFactory
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+
+PATH = "/api/v1/sk/guardian/dashboard/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _skill(owner, name):
+    skill = Skills.objects.create(user=owner, name=name, min_age=5,
+                                  max_age=15)
+    contents = [
+        LessonContent.objects.create(skill=skill,
+                                     title=f"{name} {order}",
+                                     description="",
+                                     content_type="TEXT",
+                                     content_order=order)
+        for order in range(1, 5)
+    ]
+    return skill, contents
+
+
+def _submission(child, project, status):
+    return Submission.objects.create(child_profile=child,
+                                     project=project,
+                                     submission_type="TEXT",
+                                     status=status,
+                                     work_rating=5,
+                                     instructors_points=50,
+                                     total_points_after_validatiokn=50)
+
+
+def _family(guardian_user, children=2):
+    owner = UserFactory(user_role="INSTRUCTOR")
+    skill, contents = _skill(owner, "robotics")
+    projects = [
+        Projects.objects.create(lesson_content=content,
+                                title=content.title,
+                                instructions="-",
+                                requirements="-",
+                                description="-",
+                                difficulty="EASY") for content in contents
+    ]
+    kids = []
+    for index in range(children):
+        child = ChildProfileFactory(guardian=guardian_user)
+        Enrollment.objects.create(child_profile=child, skill=skill)
+        Progress.objects.create(child_profile=child,
+                                lesson_content=contents[0],
+                                is_completed=True)
+        _submission(child, projects[0], "SUBMITTED")
+        _submission(child, projects[1], "APPROVED")
+        Purchase.objects.create(skill=skill,
+                                purchased_by=guardian_user,
+                                purchased_for=child,
+                                price="10.00",
+                                tx_ref=f"tx-{child.pk}")
+        kids.append(child)
+    return skill, contents, kids
+
+
+@pytest.mark.django_db
+class TestGuardianDashboard:
+
+    def test_sections_per_child(self, guardian_user):
+        skill, _, kids = _family(guardian_user)
+        dashboard = build_dashboard(guardian_user)
+        assert {child["child_id"] for child in dashboard} == {
+            kid.pk for kid in kids
+        }
+        child = dashboard[0]
+        assert child["enrollments"] == [{
+            "skill_id": skill.pk,
+            "skill": "robotics",
+            "enrolled_at": child["enrollments"][0]["enrolled_at"],
+            "total_contents": 4,
+            "completed_contents": 1,
+            "completion": 25.0,
+        }]
+        submissions = child["submissions"]
+        assert (submissions["pending"], submissions["approved"],
+                submissions["rejected"]) == (1, 1, 0)
+        # newest first
+        assert [row["status"] for row in submissions["recent"]
+                ] == ["APPROVED", "SUBMITTED"]
+        assert child["purchases"][0]["skill"] == "robotics"
+
+    def test_query_count_does_not_grow_with_children(self, guardian_user):
+        _family(guardian_user, children=1)
+        with CaptureQueriesContext(connection) as one:
+            build_dashboard(guardian_user)
+        _family(guardian_user, children=4)
+        with CaptureQueriesContext(connection) as five:
+            assert len(build_dashboard(guardian_user)) == 5
+        assert len(one) == len(five) == 5
+
+    def test_cached_until_a_write(self, guardian_client: APIClient,
+                                  guardian_user,
+                                  django_capture_on_commit_callbacks):
+        _, contents, kids = _family(guardian_user, children=1)
+        first = guardian_client.get(PATH)
+        assert first.status_code == status.HTTP_200_OK
+        with CaptureQueriesContext(connection) as queries:
+            guardian_client.get(PATH)
+        assert not any("lesson_app_progress" in query["sql"]
+                       for query in queries)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Progress.objects.create(child_profile=kids[0],
+                                    lesson_content=contents[1],
+                                    is_completed=True)
+        child = guardian_client.get(PATH).json()["detail"]["children"][0]
+        assert child["enrollments"][0]["completion"] == 50.0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            contents[3].delete()
+        child = guardian_client.get(PATH).json()["detail"]["children"][0]
+        assert child["enrollments"][0]["total_contents"] == 3
+
+    def test_only_guardians(self, instructor_client: APIClient):
+        response = instructor_client.get(PATH)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
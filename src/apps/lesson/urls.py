@@ -2,6 +2,7 @@ from django.urls import path
 
 from . import views
 from .recommendation.urls import recommendation_urlpatterns
+from .dashboard.urls import dashboard_urlpatterns
 
 
 content_view = views.LessonContentViewSet.as_view({
@@ -63,4 +64,5 @@ urlpatterns = [
 
 
 # extend recommendation url 
-urlpatterns.extend(recommendation_urlpatterns)
\ No newline at end of file
+urlpatterns.extend(recommendation_urlpatterns)
+urlpatterns.extend(dashboard_urlpatterns)
\ No newline at end of file
@@ -5,3 +5,7 @@ class SkillsConfig(AppConfig):
     name = 'apps.skills'
     label = "skills"
 
+    def ready(self):
+        from . import signals
+        from .search import signals as search_signals
+
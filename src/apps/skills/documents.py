@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.http import HttpResponse
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Skills, SkillDocument
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 500
+
+
+def _dumps(data) -> str:
+    # what JSONRenderer emits with the default compact, unicode settings
+    return json.dumps(data,
+                      cls=JSONEncoder,
+                      ensure_ascii=False,
+                      separators=(",", ":"))
+
+
+def render_documents(skills) -> dict:
+    """ ``SkillReadSerializer`` output of ``skills`` as JSON text, by pk """
+    # serializers imports this module for the enrollment read path
+    from .serializers import SkillReadSerializer
+
+    skills = list(skills)
+    data = SkillReadSerializer(skills, many=True).data
+    return {skill.pk: _dumps(item) for skill, item in zip(skills, data)}
+
+
+def _store(documents: dict):
+    SkillDocument.objects.bulk_create(
+        [
+            SkillDocument(skill_id=skill_id, body=body)
+            for skill_id, body in documents.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["skill"],
+        update_fields=["body", "updated_at"])
+
+
+def rebuild_skill_documents(skill_ids=None) -> int:
+    """
+    Render and store the documents of ``skill_ids``, of every skill when
+    it is ``None``. Runs in the caller's transaction.
+    """
+    skills = Skills.objects.select_related("user", "category").order_by("pk")
+    if skill_ids is not None:
+        skill_ids = list(set(skill_ids))
+        if not skill_ids:
+            return 0
+        skills = skills.filter(pk__in=skill_ids)
+    count = 0
+    batch = []
+    for skill in skills.iterator(chunk_size=_CHUNK):
+        batch.append(skill)
+        if len(batch) == _CHUNK:
+            _store(render_documents(batch))
+            count += len(batch)
+            batch = []
+    if batch:
+        _store(render_documents(batch))
+        count += len(batch)
+    return count
+
+
+def skill_documents(skill_ids: list) -> list:
+    """
+    The stored documents of ``skill_ids``, in that order.
+
+    A skill written around the signals, by ``bulk_create`` or a queryset
+    update, may have none yet: it is rendered and stored on the way.
+    """
+    documents = dict(
+        SkillDocument.objects.filter(skill_id__in=skill_ids).values_list(
+            "skill_id", "body"))
+    missing = [skill_id for skill_id in skill_ids if skill_id not in documents]
+    if missing:
+        rendered = render_documents(
+            Skills.objects.select_related("user",
+                                          "category").filter(pk__in=missing))
+        with transaction.atomic():
+            _store(rendered)
+        documents.update(rendered)
+    return [documents[skill_id] for skill_id in skill_ids
+            if skill_id in documents]
+
+
+def skill_document(skill) -> str:
+    """ The document of ``skill``, use ``select_related("document")`` """
+    try:
+        return skill.document.body
+    except SkillDocument.DoesNotExist:
+        return skill_documents([skill.pk])[0]
+
+
+def documents_response(envelope: dict, documents: list,
+                       key: str = "results", status: int = 200):
+    """
+    ``envelope`` with the ``documents`` spliced in under ``key`` as they
+    are, the documents are never parsed again.
+    """
+    head = _dumps(envelope)[:-1]
+    separator = "," if envelope else ""
+    body = f'{head}{separator}"{key}":[{",".join(documents)}]}}'
+    return HttpResponse(body,
+                        status=status,
+                        content_type="application/json")
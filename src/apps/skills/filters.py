@@ -0,0 +1,52 @@
+from django_filters import rest_framework as filters
+
+from .models import Skills, SkillCategory
+from .search.services import search_skills
+
+
+class DifficultyInFilter(filters.BaseInFilter, filters.ChoiceFilter):
+    pass
+
+
+class SkillFilter(filters.FilterSet):
+    """
+    Typed catalogue filters, each one a predicate an index can serve.
+
+    ``age`` keeps the skills a child of that age can take, ``age_min`` and
+    ``age_max`` the skills whose age range overlaps theirs. ``difficulty``
+    takes a comma separated set, ``q`` a free text term looked up in the
+    search index.
+    """
+    age = filters.NumberFilter(method="filter_age", min_value=0)
+    age_min = filters.NumberFilter(field_name="max_age",
+                                   lookup_expr="gte",
+                                   min_value=0)
+    age_max = filters.NumberFilter(field_name="min_age",
+                                   lookup_expr="lte",
+                                   min_value=0)
+    difficulty = DifficultyInFilter(field_name="skill_difficulty",
+                                    lookup_expr="in",
+                                    choices=Skills.SkillDifficulty.choices)
+    category = filters.ChoiceFilter(field_name="category__name",
+                                    choices=SkillCategory.Category.choices)
+    price_min = filters.NumberFilter(field_name="price",
+                                     lookup_expr="gte",
+                                     min_value=0)
+    price_max = filters.NumberFilter(field_name="price",
+                                     lookup_expr="lte",
+                                     min_value=0)
+    is_paid = filters.BooleanFilter()
+    q = filters.CharFilter(method="filter_text", max_length=200)
+    # the name ``q`` had before
+    query = filters.CharFilter(method="filter_text", max_length=200)
+
+    class Meta:
+        model = Skills
+        fields = ["category__name", "min_age", "max_age", "name", "price"]
+
+    def filter_age(self, queryset, name, value):
+        return queryset.filter(min_age__lte=value, max_age__gte=value)
+
+    def filter_text(self, queryset, name, value):
+        ranked = search_skills(queryset, value)
+        return queryset if ranked is None else ranked
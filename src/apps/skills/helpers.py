@@ -1,16 +1,17 @@
 from ..users.profiles.models import ChildProfile
-
-from django.utils import timezone
+from ..users.profiles.ages import age_on
 
 def _child_age_or_none(child_profile):
     if not isinstance(child_profile, ChildProfile):
         return None
+    # stored on the profile and moved on at each birthday
+    age = getattr(child_profile, "age", None)
+    if age is not None:
+        return age
     date_of_birth = getattr(child_profile, "date_of_birth", None)
     if date_of_birth is None:
         return None
-    current_year = timezone.now().year
-    child_birth_year = date_of_birth.year
-    return current_year - child_birth_year
+    return age_on(date_of_birth)
 
 def _is_age_appropriate(skill, age):
     min_age = getattr(skill, "min_age", None)
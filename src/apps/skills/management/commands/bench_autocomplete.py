@@ -0,0 +1,85 @@
+from django.core.management import BaseCommand
+
+from apps.skills.search.autocomplete import AutocompleteIndex
+
+from faker import Faker
+import random
+import statistics
+import time
+import tracemalloc
+
+
+class Command(BaseCommand):
+    help = ("benchmark the skill autocomplete index against a scan of every "
+            "name, on synthetic skill names")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skills", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=2_000)
+        parser.add_argument("--typo-rate", type=float, default=0.3,
+                            help="share of queries with one wrong letter")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def _names(self, count, faker):
+        return [faker.text(max_nb_chars=50).rstrip(".") for _ in range(count)]
+
+    def _queries(self, names, count, typo_rate, rng):
+        queries = []
+        for _ in range(count):
+            name = rng.choice(names).lower()
+            query = name[:rng.randint(2, min(len(name), 15))]
+            if len(query) > 3 and rng.random() < typo_rate:
+                position = rng.randrange(1, len(query))
+                query = (query[:position] + rng.choice("aeiourst") +
+                         query[position + 1:])
+            queries.append(query)
+        return queries
+
+    def _latencies(self, search, queries):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        return latencies
+
+    def _report(self, label, latencies):
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        self.stdout.write(
+            f"{label:<8} p50 {statistics.median(latencies):8.3f} ms "
+            f"p99 {p99:8.3f} ms max {latencies[-1]:8.3f} ms")
+        return p99
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        faker = Faker()
+        faker.seed_instance(options["seed"])
+        names = self._names(options["skills"], faker)
+        queries = self._queries(names, options["queries"],
+                                options["typo_rate"], rng)
+        self.stdout.write(
+            self.style.NOTICE(f"Indexing {len(names)} skill names..."))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = AutocompleteIndex.build(
+            (str(slot), name) for slot, name in enumerate(names))
+        built = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.stdout.write(
+            f"built in {built:.2f} s, {memory / 2**20:.1f} MiB, "
+            f"{len(index.vocabulary)} words, "
+            f"{sum(map(len, index.postings))} postings")
+
+        lowered = [name.lower() for name in names]
+        scan = self._report(
+            "scan", self._latencies(
+                lambda query: [name for name in lowered if query in name][:10],
+                queries[:200]))
+        indexed = self._report("index",
+                               self._latencies(index.search, queries))
+        self.stdout.write(
+            self.style.SUCCESS(f"p99 is {scan / indexed:.1f}x lower than a "
+                               "scan of every name"))
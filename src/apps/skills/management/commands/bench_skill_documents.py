@@ -0,0 +1,100 @@
+from django.core.management import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from apps.skills.documents import (documents_response, skill_documents,
+                                   rebuild_skill_documents)
+from apps.skills.models import SkillCategory, Skills
+from apps.skills.serializers import SkillReadSerializer
+
+import random
+import statistics
+import time
+import uuid
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ("benchmark stored skill documents against SkillReadSerializer "
+            "on a generated catalogue that is rolled back afterwards")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skills", type=int, default=10_000)
+        parser.add_argument("--instructors", type=int, default=50)
+        parser.add_argument("--page-size", type=int, default=30)
+        parser.add_argument("--pages", type=int, default=300)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def _catalogue(self, skills, instructors):
+        users = User.objects.bulk_create([
+            User(email=f"bench_instructor_{index}@example.com",
+                 first_name=f"Instructor{index}",
+                 last_name="Bench",
+                 user_role="INSTRUCTOR") for index in range(instructors)
+        ])
+        category, _ = SkillCategory.objects.get_or_create(name="TECH")
+        Skills.objects.bulk_create([
+            Skills(skill_id=uuid.uuid4(),
+                   user=users[index % instructors],
+                   category=category,
+                   name=f"Bench skill {index}",
+                   description="Learn by building things. " * 4,
+                   min_age=5,
+                   max_age=15,
+                   price=1000 + index % 9000) for index in range(skills)
+        ],
+                                   batch_size=1000)
+
+    def _serialized(self, page):
+        skills = Skills.objects.select_related("user",
+                                               "category").filter(pk__in=page)
+        data = SkillReadSerializer(skills, many=True).data
+        return JSONRenderer().render({
+            "next": None,
+            "previous": None,
+            "results": data
+        })
+
+    def _documents(self, page):
+        return documents_response({
+            "next": None,
+            "previous": None
+        }, skill_documents(page)).content
+
+    def _measure(self, label, render, pages):
+        timings = []
+        for page in pages:
+            start = time.perf_counter()
+            render(page)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        mean = statistics.mean(timings)
+        self.stdout.write(f"{label:<11} mean {mean:7.3f} ms "
+                          f"p99 {p99:7.3f} ms per page")
+        return mean
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        self.stdout.write(
+            self.style.NOTICE(f"Generating {options['skills']} skills..."))
+        with transaction.atomic():
+            self._catalogue(options["skills"], options["instructors"])
+            start = time.perf_counter()
+            count = rebuild_skill_documents()
+            self.stdout.write(f"built {count} documents in "
+                              f"{time.perf_counter() - start:.2f} s")
+            skill_ids = list(Skills.objects.values_list("pk", flat=True))
+            pages = [
+                rng.sample(skill_ids, options["page_size"])
+                for _ in range(options["pages"])
+            ]
+            before = self._measure("serializer", self._serialized, pages)
+            after = self._measure("documents", self._documents, pages)
+            transaction.set_rollback(True)
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored documents are {before / after:.1f}x "
+                               "faster per page"))
@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from ...search.services import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = ("index every skill for search again, after writes that skip "
+            "signals such as bulk_create or queryset updates")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} skills"))
@@ -2,6 +2,8 @@ from django.core.management import BaseCommand
 from django.contrib.auth import get_user_model
 
 from ...models import SkillCategory, Skills
+from ...search.services import rebuild_search_index
+from ...documents import rebuild_skill_documents
 
 from faker import Faker
 import random
@@ -46,4 +48,7 @@ class Command(BaseCommand):
         #if any left overs 
         if len(skills) > 0:
             Skills.objects.bulk_create(skills)
+        # bulk_create sends no signals
+        rebuild_search_index()
+        rebuild_skill_documents()
         self.stdout.write(self.style.SUCCESS("Successfully Populated skills table.."))
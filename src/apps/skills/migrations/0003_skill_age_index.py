@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skills',
+            index=models.Index(fields=['min_age', 'max_age'], name='skill_age_idx'),
+        ),
+    ]
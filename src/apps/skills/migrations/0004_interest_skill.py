@@ -0,0 +1,34 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:33
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_skill_age_index'),
+        ('users', '0008_interest_vocabulary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterestSkill',
+            fields=[
+                ('link_id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('weight', models.FloatField(validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)])),
+                ('source', models.CharField(choices=[('INSTRUCTOR', 'Instructor'), ('BATCH', 'Batch')], default='INSTRUCTOR', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='users.interest')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interest_links', to='skills.skills')),
+            ],
+            options={
+                'verbose_name': 'interest skill',
+                'indexes': [models.Index(fields=['interest', '-weight'], name='interest_weight_idx')],
+                'constraints': [models.UniqueConstraint(fields=('interest', 'skill'), name='unique_interest_skill')],
+            },
+        ),
+    ]
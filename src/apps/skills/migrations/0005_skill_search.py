@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# the search table as it was created, kept here so that later changes to
+# apps.skills.search.services never rewrite this migration
+_LIVE_SKILLS = ("FROM skills_skills s LEFT JOIN skills_skillcategory c "
+                "ON c.category_id = s.category_id "
+                "WHERE s.is_active AND NOT s.is_deleted")
+
+CREATE_SQL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS skills_search USING fts5("
+        "skill_id, name, description, category, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+        # skills written from now on are indexed by signals
+        "INSERT INTO skills_search (skill_id, name, description, category) "
+        "SELECT s.skill_id, s.name, COALESCE(s.description, ''), "
+        f"COALESCE(c.name, '') {_LIVE_SKILLS}",
+    ],
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS skills_search ("
+        "skill_id uuid PRIMARY KEY REFERENCES skills_skills (skill_id) "
+        "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+        "document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS skills_search_document_idx ON "
+        "skills_search USING GIN (document)",
+        "INSERT INTO skills_search (skill_id, document) SELECT s.skill_id, "
+        "setweight(to_tsvector('simple', s.name), 'A') || "
+        "setweight(to_tsvector('simple', COALESCE(c.name, '')), 'B') || "
+        "setweight(to_tsvector('simple', COALESCE(s.description, '')), 'C') "
+        f"{_LIVE_SKILLS}",
+    ],
+}
+
+DROP_SQL = {
+    "sqlite": ["DROP TABLE IF EXISTS skills_search"],
+    "postgresql": ["DROP TABLE IF EXISTS skills_search"],
+}
+
+
+def _run(statements, schema_editor):
+    # other databases search with icontains, they get no table
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql, params=None)
+
+
+def create_index(apps, schema_editor):
+    _run(CREATE_SQL, schema_editor)
+
+
+def drop_index(apps, schema_editor):
+    _run(DROP_SQL, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0004_interest_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0005_skill_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skills',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['category', 'min_age', 'max_age'], name='skill_live_category_age_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skills',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['skill_difficulty', 'min_age', 'max_age'], name='skill_live_difficulty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skills',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['price'], name='skill_live_price_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0006_skill_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillDocument',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='skills.skills')),
+                ('body', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'skill document',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-18 14:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0007_skill_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skills',
+            index=models.Index(fields=['updated_at'], name='skill_updated_at_idx'),
+        ),
+    ]
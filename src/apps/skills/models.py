@@ -3,7 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
-from ..users.profiles.models import ChildProfile
+from ..users.profiles.models import ChildProfile, Interest
 
 import uuid
 
@@ -107,7 +107,21 @@ class Skills(models.Model):
             models.Index(fields=["is_deleted"], name="deleted_idx"),
             models.Index(fields=["name"], name="skill_name_idx"),
             models.Index(fields=["is_active", "is_deleted"],
-                         name="deleted_active_idx")
+                         name="deleted_active_idx"),
+            models.Index(fields=["min_age", "max_age"], name="skill_age_idx"),
+            # the catalogue only lists live skills, and an equality on a
+            # boolean column is not something every planner seeks on
+            models.Index(fields=["category", "min_age", "max_age"],
+                         condition=models.Q(is_active=True, is_deleted=False),
+                         name="skill_live_category_age_idx"),
+            models.Index(fields=["skill_difficulty", "min_age", "max_age"],
+                         condition=models.Q(is_active=True, is_deleted=False),
+                         name="skill_live_difficulty_idx"),
+            models.Index(fields=["price"],
+                         condition=models.Q(is_active=True, is_deleted=False),
+                         name="skill_live_price_idx"),
+            # the autocomplete change feed, see search.autocomplete
+            models.Index(fields=["updated_at"], name="skill_updated_at_idx")
         ]
 
 
@@ -143,3 +157,77 @@ class Enrollment(models.Model):
     def __str__(self):
         return "Enrollment({}, {})".format(self.child_profile.first_name,
                                            self.skill.name)
+
+
+class InterestSkill(models.Model):
+    """
+    How well a skill serves an interest, from 0 to 1.
+
+    Rows come from the skill's instructor or from the nightly
+    ``rebuild_interest_skill_weights`` job, which never overwrites an
+    instructor's row.
+    """
+
+    class Source(models.TextChoices):
+        INSTRUCTOR = "INSTRUCTOR", "Instructor"
+        BATCH = "BATCH", "Batch"
+
+    link_id = models.UUIDField(primary_key=True,
+                               unique=True,
+                               max_length=20,
+                               default=uuid.uuid4)
+    interest = models.ForeignKey(Interest,
+                                 on_delete=models.CASCADE,
+                                 related_name="skill_links")
+    skill = models.ForeignKey(Skills,
+                              on_delete=models.CASCADE,
+                              related_name="interest_links")
+    weight = models.FloatField(validators=[
+        MinValueValidator(0.0),
+        MaxValueValidator(1.0),
+    ])
+    source = models.CharField(max_length=20,
+                              choices=Source.choices,
+                              default=Source.INSTRUCTOR)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("interest skill")
+        constraints = [
+            models.UniqueConstraint(fields=["interest", "skill"],
+                                    name="unique_interest_skill")
+        ]
+        indexes = [
+            # interest -> best skills, the recommendation path
+            models.Index(fields=["interest", "-weight"],
+                         name="interest_weight_idx"),
+        ]
+
+    def __str__(self):
+        return "InterestSkill({}, {}, {})".format(self.interest_id,
+                                                  self.skill_id, self.weight)
+
+
+class SkillDocument(models.Model):
+    """
+    The ``SkillReadSerializer`` output of a skill, stored as JSON text.
+
+    List endpoints emit these as they are instead of running the nested
+    serializers per row. They are rebuilt when the skill, its category or
+    its instructor is written.
+    """
+    skill = models.OneToOneField(Skills,
+                                 on_delete=models.CASCADE,
+                                 primary_key=True,
+                                 related_name="document")
+    body = models.TextField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("skill document")
+
+    def __str__(self):
+        return "SkillDocument({})".format(self.skill_id)
@@ -4,4 +4,13 @@ class CustomSkillPagination(CursorPagination):
     page_size = 5
     max_page_size = 5
     page_size_query_param = "page_size"
-    ordering = ("-created_at",)
\ No newline at end of file
+    ordering = ("-created_at",)
+
+
+class SkillSearchPagination(CustomSkillPagination):
+    """Pages through search results by rank, browsing stays newest first."""
+
+    def get_ordering(self, request, queryset, view):
+        if "search_rank" in queryset.query.annotations:
+            return ("search_rank", )
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,413 @@
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+from ..models import Skills
+
+from array import array
+from collections import Counter
+import datetime
+import bisect
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[^\W_]+")
+# candidates few enough to check one by one rather than by set operations
+_FILTER_BELOW = 2_000
+# vocabulary words a misspelt query word may stand for
+_SIMILAR_WORDS = 32
+
+
+def normalize_name(name: str) -> str:
+    """Lower case words without accents or punctuation."""
+    name = (name or "").lower()
+    if not name.isascii():
+        name = "".join(char for char in unicodedata.normalize("NFKD", name)
+                       if not unicodedata.combining(char))
+    return " ".join(_WORD.findall(name))
+
+
+def word_trigrams(word: str, partial: bool = False) -> set:
+    # padded like pg_trgm, a word still being typed has no end
+    padded = f"  {word}" if partial else f"  {word} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class AutocompleteIndex:
+    """
+    Skill names by word, held in process.
+
+    Each skill gets a slot and each distinct word of a name gets an id.
+    A word's postings are an ``array`` of the slots whose name has it,
+    kept shortest name first, and a second one for the names it starts.
+    A query word matches the vocabulary words it starts, or when that
+    finds too little, the words that share enough of its trigrams, which
+    is what lets typos through. The names with a match for every query
+    word are ranked by whether they start with the first one, then
+    shortest first.
+
+    A renamed or removed skill leaves a dead slot behind, dead slots are
+    skipped at query time and dropped by ``compact``.
+
+    ``add`` and ``remove`` change the index in place, an index that is
+    being read is changed through a ``copy``.
+    """
+
+    def __init__(self, min_similarity: float = 0.4):
+        self.min_similarity = min_similarity
+        self.skill_ids = []
+        self.names = []
+        self.lengths = array("H")
+        self.words_of = []
+        self.first_words = array("I")
+        self.slot_of = {}
+        self.dead = 0
+        self.word_ids = {}
+        self.vocabulary = []
+        self.sorted_vocabulary = []
+        self.word_grams = {}
+        self.postings = []
+        self.first_postings = []
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    @classmethod
+    def build(cls, rows, min_similarity: float = 0.4):
+        """An index of ``(skill_id, name)`` rows, sorted once at the end."""
+        index = cls(min_similarity)
+        for skill_id, name in rows:
+            index._append(skill_id, name, sort=False)
+        key = index.lengths.__getitem__
+        for postings in (index.postings, index.first_postings):
+            for word_id, slots in enumerate(postings):
+                postings[word_id] = array("I", sorted(slots, key=key))
+        index.sorted_vocabulary.sort()
+        return index
+
+    def _word_id(self, word: str, sort: bool) -> int:
+        word_id = self.word_ids.get(word)
+        if word_id is not None:
+            return word_id
+        word_id = self.word_ids[word] = len(self.vocabulary)
+        self.vocabulary.append(word)
+        if sort:
+            bisect.insort(self.sorted_vocabulary, word)
+        else:
+            self.sorted_vocabulary.append(word)
+        self.postings.append(array("I"))
+        self.first_postings.append(array("I"))
+        for gram in word_trigrams(word):
+            self.word_grams.setdefault(gram, array("I")).append(word_id)
+        return word_id
+
+    def _append(self, skill_id: str, name: str, sort: bool = True):
+        slot = len(self.names)
+        words = normalize_name(name).split()
+        word_ids = [self._word_id(word, sort) for word in words]
+        self.skill_ids.append(skill_id)
+        self.names.append(name)
+        self.lengths.append(min(len(name), 0xFFFF))
+        self.words_of.append(tuple(word_ids))
+        self.slot_of[skill_id] = slot
+        if not word_ids:
+            # no word, never found
+            self.first_words.append(0xFFFFFFFF)
+            return
+        self.first_words.append(word_ids[0])
+        key = self.lengths.__getitem__
+        lists = [self.postings[word_id] for word_id in set(word_ids)]
+        lists.append(self.first_postings[word_ids[0]])
+        for postings in lists:
+            if sort:
+                bisect.insort(postings, slot, key=key)
+            else:
+                postings.append(slot)
+
+    def copy(self) -> "AutocompleteIndex":
+        """A copy sharing nothing ``add`` or ``remove`` would change."""
+        index = AutocompleteIndex(self.min_similarity)
+        index.skill_ids = list(self.skill_ids)
+        index.names = list(self.names)
+        index.lengths = self.lengths[:]
+        index.words_of = list(self.words_of)
+        index.first_words = self.first_words[:]
+        index.slot_of = dict(self.slot_of)
+        index.dead = self.dead
+        index.word_ids = dict(self.word_ids)
+        index.vocabulary = list(self.vocabulary)
+        index.sorted_vocabulary = list(self.sorted_vocabulary)
+        index.word_grams = {
+            gram: word_ids[:]
+            for gram, word_ids in self.word_grams.items()
+        }
+        index.postings = [slots[:] for slots in self.postings]
+        index.first_postings = [slots[:] for slots in self.first_postings]
+        return index
+
+    def has(self, skill_id: str, name: str = None) -> bool:
+        """Whether ``skill_id`` is indexed, under ``name`` when given."""
+        slot = self.slot_of.get(skill_id)
+        return slot is not None and name in (None, self.names[slot])
+
+    def add(self, skill_id: str, name: str):
+        """Index ``name`` for ``skill_id``, replacing what it had."""
+        slot = self.slot_of.get(skill_id)
+        if slot is not None:
+            if self.names[slot] == name:
+                return
+            self.remove(skill_id)
+        self._append(skill_id, name)
+
+    def remove(self, skill_id: str):
+        slot = self.slot_of.pop(skill_id, None)
+        if slot is None:
+            return
+        self.skill_ids[slot] = None
+        self.dead += 1
+
+    def compact(self) -> "AutocompleteIndex":
+        """A copy without dead slots."""
+        return AutocompleteIndex.build(
+            ((skill_id, self.names[slot])
+             for slot, skill_id in enumerate(self.skill_ids)
+             if skill_id is not None), self.min_similarity)
+
+    def _prefixed(self, word: str) -> list:
+        vocabulary = self.sorted_vocabulary
+        start = bisect.bisect_left(vocabulary, word)
+        end = bisect.bisect_left(vocabulary, word + "\uffff", start)
+        return [self.word_ids[match] for match in vocabulary[start:end]]
+
+    def _similar(self, word: str, partial: bool) -> list:
+        grams = word_trigrams(word, partial)
+        need = max(1, math.ceil(len(grams) * self.min_similarity))
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.word_grams.get(gram, ()))
+        return [
+            word_id
+            for word_id, count in counts.most_common(_SIMILAR_WORDS)
+            if count >= need
+        ]
+
+    def _stream(self, words: list, limit: int, found: list) -> list:
+        # one query word, every name that has a match is in: walk the
+        # postings shortest first, the names it starts first
+        seen = set(found)
+        key = self.lengths.__getitem__
+        for lists in ([self.first_postings[word_id] for word_id in words],
+                      [self.postings[word_id] for word_id in words]):
+            for slot in heapq.merge(*lists, key=key):
+                if slot in seen or self.skill_ids[slot] is None:
+                    continue
+                seen.add(slot)
+                found.append(slot)
+                if len(found) == limit:
+                    return found
+        return found
+
+    def _intersect(self, alternatives: list, limit: int, found: list) -> list:
+        # several query words: the names of the rarest one, narrowed down
+        # by the others
+        wanted = sorted(alternatives,
+                        key=lambda words: sum(
+                            len(self.postings[word_id]) for word_id in words))
+        candidates = set().union(*(self.postings[word_id]
+                                   for word_id in wanted[0]))
+        candidates.difference_update(found)
+        for words in wanted[1:]:
+            if len(candidates) > _FILTER_BELOW:
+                candidates &= set().union(*(self.postings[word_id]
+                                            for word_id in words))
+                continue
+            words = frozenset(words)
+            candidates = {
+                slot for slot in candidates
+                if not words.isdisjoint(self.words_of[slot])
+            }
+        first = frozenset(alternatives[0])
+        best = heapq.nsmallest(
+            limit - len(found),
+            (slot for slot in candidates if self.skill_ids[slot] is not None),
+            key=lambda slot: (self.first_words[slot] not in first,
+                              self.lengths[slot]))
+        return found + best
+
+    def _collect(self, alternatives: list, limit: int, found: list) -> list:
+        if not all(alternatives):
+            return found
+        if len(alternatives) == 1:
+            return self._stream(alternatives[0], limit, found)
+        return self._intersect(alternatives, limit, found)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Up to ``limit`` names matching ``query`` as ``(skill_id, name)``.
+
+        Names that start with the query rank first, then the shortest.
+        Misspelt words are only looked up when the words as typed do not
+        fill ``limit``.
+        """
+        words = normalize_name(query).split()
+        if not words:
+            return []
+        *typed, partial = words
+        exact = [[self.word_ids[word]] if word in self.word_ids else []
+                 for word in typed]
+        found = self._collect(exact + [self._prefixed(partial)], limit, [])
+        if len(found) < limit:
+            similar = [self._similar(word, False) for word in typed]
+            similar.append(
+                list(set(self._prefixed(partial)) |
+                     set(self._similar(partial, True))))
+            found = self._collect(similar, limit, found)
+        return [(self.skill_ids[slot], self.names[slot]) for slot in found]
+
+
+def _refresh_every() -> float:
+    return getattr(settings, "SKILL_AUTOCOMPLETE_REFRESH_SECONDS", 5)
+
+
+class SkillAutocomplete:
+    """
+    An ``AutocompleteIndex`` of active skills, following the database.
+
+    The index is loaded in full once and then reads the skills whose
+    ``updated_at`` moved since the last read. Skills deleted outright
+    leave no trace in that feed, they drop out at the next full load.
+
+    Both run on a daemon thread started by ``start``. Changes are applied
+    to a copy of the index which then replaces it, a request keeps reading
+    the index it started with.
+    """
+    # rows are read again this far back, a write committed a little after
+    # its ``updated_at`` is still seen and applying a row twice is a no-op
+    overlap = datetime.timedelta(seconds=30)
+
+    def __init__(self):
+        self.index = None
+        self.watermark = None
+        self.loaded_at = 0
+        self.refreshed_at = 0
+        self.lock = threading.Lock()
+        self.refresher = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def load(self):
+        started = timezone.now()
+        rows = Skills.objects.filter(is_active=True,
+                                     is_deleted=False).values_list(
+                                         "pk", "name")
+        self.index = AutocompleteIndex.build(
+            ((str(skill_id), name)
+             for skill_id, name in rows.iterator(chunk_size=5000)),
+            getattr(settings, "SKILL_AUTOCOMPLETE_MIN_SIMILARITY", 0.4))
+        self.watermark = started
+        self.loaded_at = self.refreshed_at = time.monotonic()
+        logger.info("Loaded %s skills for autocomplete", len(self.index))
+
+    def refresh(self) -> int:
+        """Apply the skills written since the last read."""
+        started = timezone.now()
+        changes = Skills.objects.filter(
+            updated_at__gte=self.watermark - self.overlap).order_by(
+                "updated_at").values_list("pk", "name", "is_active",
+                                          "is_deleted")
+        # the overlap reads rows already applied, only copy for real changes
+        pending = []
+        for skill_id, name, is_active, is_deleted in changes:
+            live = is_active and not is_deleted
+            if self.index.has(str(skill_id), name if live else None) != live:
+                pending.append((str(skill_id), name, live))
+        applied = len(pending)
+        if pending:
+            index = self.index.copy()
+            for skill_id, name, live in pending:
+                if live:
+                    index.add(skill_id, name)
+                else:
+                    index.remove(skill_id)
+            if index.dead > max(1000, len(index) // 4):
+                index = index.compact()
+            self.index = index
+        self.watermark = started
+        self.refreshed_at = time.monotonic()
+        return applied
+
+    def tick(self):
+        """Reload or refresh the index when either is due."""
+        now = time.monotonic()
+        reload_every = getattr(settings, "SKILL_AUTOCOMPLETE_RELOAD_SECONDS",
+                               60 * 60)
+        with self.lock:
+            if self.index is None or now - self.loaded_at >= reload_every:
+                self.load()
+            elif now - self.refreshed_at >= _refresh_every():
+                self.refresh()
+
+    def _run(self):
+        while True:
+            time.sleep(max(1, _refresh_every()))
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Skill autocomplete refresh failed")
+            finally:
+                # the thread keeps its own connection, drop it when stale
+                close_old_connections()
+
+    def start(self):
+        """Keep the index current from a daemon thread of this process."""
+        with self.lock:
+            if self.refresher is not None:
+                return
+            self.refresher = threading.Thread(target=self._run,
+                                              name="skill-autocomplete",
+                                              daemon=True)
+            self.refresher.start()
+
+    def _after_fork(self):
+        # threads do not survive a fork and a lock held by one never
+        # comes free, the child keeps the index and starts its own
+        self.lock = threading.Lock()
+        if self.refresher is not None:
+            self.refresher = None
+            self.start()
+
+    def current(self) -> AutocompleteIndex:
+        if self.index is None:
+            # only until the first load, see warm_autocomplete
+            self.tick()
+        return self.index
+
+    def search(self, query: str, limit: int = 10) -> list:
+        return self.current().search(query, limit)
+
+    def reset(self):
+        with self.lock:
+            self.index = None
+
+
+skill_autocomplete = SkillAutocomplete()
+
+
+def warm_autocomplete():
+    """
+    Load the index when a worker starts rather than on its first query,
+    and keep it current from then on.
+    """
+    try:
+        skill_autocomplete.current()
+    except DatabaseError as exc:
+        # the refresher loads it once the database answers
+        logger.warning("Skill autocomplete not loaded: %s", exc)
+    skill_autocomplete.start()
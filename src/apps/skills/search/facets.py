@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+from collections import Counter
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PREFIX = "skill_facets"
+# bumped on every write to the catalogue, that retires all cached counts
+_VERSION_KEY = f"{_CACHE_PREFIX}:catalogue_version"
+
+# a skill is in every band its age range overlaps
+AGE_BANDS = (("5-7", 5, 7), ("8-10", 8, 10), ("11-13", 11, 13),
+             ("14-15", 14, 15))
+# upper bounds are exclusive
+PRICE_BUCKETS = (("0-999", 0, 1000), ("1000-4999", 1000, 5000),
+                 ("5000-9999", 5000, 10000), ("10000+", 10000, None))
+
+
+def _timeout() -> int:
+    return getattr(settings, "SKILL_FACETS_CACHE_TTL", 60 * 10)
+
+
+def catalogue_version() -> int:
+    return cache.get_or_set(_VERSION_KEY, 1, timeout=None)
+
+
+def bump_catalogue_version():
+    """ Retire every cached count once the current transaction commits """
+
+    def bump():
+        try:
+            cache.incr(_VERSION_KEY)
+        except ValueError:
+            cache.set(_VERSION_KEY, 2, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def _price_bucket():
+    return Case(*[
+        When(Q(price__gte=low) & (Q(price__lt=high) if high else Q()),
+             then=Value(label)) for label, low, high in PRICE_BUCKETS
+    ],
+                output_field=CharField())
+
+
+def _age_band_counts() -> dict:
+    return {
+        f"band_{index}": Count("pk",
+                               filter=Q(min_age__lte=high, max_age__gte=low))
+        for index, (_, low, high) in enumerate(AGE_BANDS)
+    }
+
+
+def compute_facets(queryset) -> dict:
+    """
+    Counts per category, difficulty, age band, price bucket and free or
+    paid for ``queryset``, from a single grouped query.
+
+    The rows are grouped by every single valued facet at once and summed
+    up per facet here; age bands overlap, so they are conditional counts
+    on the same rows.
+    """
+    rows = queryset.order_by().values(
+        "category__name", "skill_difficulty", "is_paid",
+        bucket=_price_bucket()).annotate(total=Count("pk"),
+                                         **_age_band_counts())
+    category, difficulty, price, paid, age = (Counter(), Counter(), Counter(),
+                                              Counter(), Counter())
+    for row in rows:
+        total = row["total"]
+        category[row["category__name"]] += total
+        difficulty[row["skill_difficulty"]] += total
+        paid["paid" if row["is_paid"] else "free"] += total
+        if row["is_paid"] and row["bucket"] is not None:
+            price[row["bucket"]] += total
+        for index, (label, _, _) in enumerate(AGE_BANDS):
+            age[label] += row[f"band_{index}"]
+    return {
+        "category": dict(category),
+        "skill_difficulty": dict(difficulty),
+        "age_band": {label: age[label] for label, _, _ in AGE_BANDS},
+        "price_bucket": {
+            label: price[label]
+            for label, _, _ in PRICE_BUCKETS
+        },
+        "is_paid": {
+            "free": paid["free"],
+            "paid": paid["paid"]
+        },
+    }
+
+
+def _cache_key(state: dict) -> str:
+    normalized = "&".join(f"{key}={value}"
+                          for key, value in sorted(state.items()))
+    digest = hashlib.md5(normalized.encode()).hexdigest()
+    return f"{_CACHE_PREFIX}:{catalogue_version()}:{digest}"
+
+
+def get_facets(queryset, state: dict) -> dict:
+    """
+    The cached facet counts of ``queryset``.
+
+    ``state`` is everything that narrowed the queryset, the filters and
+    the route, it is what tells two cached results apart.
+    """
+    key = _cache_key(state)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, timeout=_timeout())
+    return facets
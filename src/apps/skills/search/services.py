@@ -0,0 +1,239 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, When, Value, IntegerField, Q
+
+from ..models import Skills, SkillCategory
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "skills_search"
+# words of the query, every one of them must match the start of a word
+_TERM = re.compile(r"[^\W_]+")
+_MAX_TERMS = 8
+_CHUNK = 500
+
+
+def search_terms(query: str) -> list:
+    return _TERM.findall((query or "").lower())[:_MAX_TERMS]
+
+
+def _chunks(values: list):
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def _placeholders(values: list) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def _document_source(columns: str, skill_ids: list = None):
+    # the searchable text of every live skill, or of ``skill_ids`` only
+    skills, categories = Skills._meta.db_table, SkillCategory._meta.db_table
+    sql = (f"SELECT {columns} FROM {skills} s "
+           f"LEFT JOIN {categories} c ON c.category_id = s.category_id "
+           "WHERE s.is_active AND NOT s.is_deleted")
+    if skill_ids is None:
+        return sql, []
+    return f"{sql} AND s.skill_id IN ({_placeholders(skill_ids)})", skill_ids
+
+
+def _within(within) -> tuple:
+    # ``within`` is the compiled sql of a skill pk subquery
+    if within is None:
+        return "", []
+    sql, params = within
+    return f" AND skill_id IN ({sql})", list(params)
+
+
+class SQLiteSearchBackend:
+    """
+    An FTS5 table of skill name, description and category.
+
+    ``skill_id`` is an indexed column too, FTS5 can only find a row by
+    what it indexes, and searches are limited to the other columns.
+    """
+    vendor = "sqlite"
+    # bm25 column weights: skill_id, name, description, category
+    weights = (0.0, 10.0, 1.0, 4.0)
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "skill_id, name, description, category, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')")
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def remove(self, cursor, skill_ids: list):
+        match = "skill_id : ({})".format(" OR ".join(
+            f'"{skill_id}"' for skill_id in skill_ids))
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN (SELECT rowid FROM "
+            f"{SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s)", [match])
+
+    def insert(self, cursor, skill_ids: list = None):
+        source, params = _document_source(
+            "s.skill_id, s.name, COALESCE(s.description, ''), "
+            "COALESCE(c.name, '')", skill_ids)
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (skill_id, name, description, "
+            f"category) {source}", params)
+
+    def clear(self, cursor):
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    def search(self, cursor, terms: list, limit: int, within=None) -> list:
+        match = "{name description category} : (%s)" % " AND ".join(
+            f'"{term}"*' for term in terms)
+        condition, params = _within(within)
+        cursor.execute(
+            f"SELECT skill_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} "
+            f"MATCH %s{condition} ORDER BY bm25({SEARCH_TABLE}, "
+            f"{', '.join(map(str, self.weights))}) LIMIT %s",
+            [match, *params, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """
+    A weighted ``tsvector`` per skill behind a GIN index.
+
+    The ``simple`` configuration keeps words as typed so that prefix
+    queries match what the user sees.
+    """
+    vendor = "postgresql"
+    document = ("setweight(to_tsvector('simple', s.name), 'A') || "
+                "setweight(to_tsvector('simple', COALESCE(c.name, '')), 'B') "
+                "|| setweight(to_tsvector('simple', "
+                "COALESCE(s.description, '')), 'C')")
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            f"skill_id uuid PRIMARY KEY REFERENCES {Skills._meta.db_table} "
+            "(skill_id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)")
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx ON "
+            f"{SEARCH_TABLE} USING GIN (document)")
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def remove(self, cursor, skill_ids: list):
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE skill_id IN "
+            f"({_placeholders(skill_ids)})", skill_ids)
+
+    def insert(self, cursor, skill_ids: list = None):
+        source, params = _document_source(f"s.skill_id, {self.document}",
+                                          skill_ids)
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (skill_id, document) {source}",
+            params)
+
+    def clear(self, cursor):
+        cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+
+    def search(self, cursor, terms: list, limit: int, within=None) -> list:
+        condition, params = _within(within)
+        cursor.execute(
+            f"SELECT skill_id FROM {SEARCH_TABLE}, to_tsquery('simple', %s) "
+            f"query WHERE document @@ query{condition} ORDER BY "
+            "ts_rank_cd(document, query) DESC, skill_id LIMIT %s",
+            [" & ".join(f"{term}:*" for term in terms), *params, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+_BACKENDS = {
+    backend.vendor: backend
+    for backend in (SQLiteSearchBackend(), PostgresSearchBackend())
+}
+
+
+def get_search_backend(conn=None):
+    """The backend for ``conn``, ``None`` when its database has none."""
+    return _BACKENDS.get((conn or connection).vendor)
+
+
+def _db_ids(skill_ids) -> list:
+    field = Skills._meta.pk
+    return [
+        field.get_db_prep_value(field.to_python(skill_id), connection)
+        for skill_id in skill_ids
+    ]
+
+
+def index_skills(skill_ids):
+    """
+    Bring the search rows of ``skill_ids`` in line with the skills table.
+
+    Skills that are gone, inactive or soft deleted are dropped from the
+    index. Runs in the caller's transaction.
+    """
+    backend = get_search_backend()
+    skill_ids = _db_ids(set(skill_ids))
+    if backend is None or not skill_ids:
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(skill_ids):
+            backend.remove(cursor, chunk)
+            backend.insert(cursor, chunk)
+
+
+def rebuild_search_index() -> int:
+    """Index the whole catalogue again, for writes that skip signals."""
+    backend = get_search_backend()
+    if backend is None:
+        return 0
+    with connection.cursor() as cursor:
+        backend.clear(cursor)
+        backend.insert(cursor)
+        count = cursor.rowcount
+    logger.info("Rebuilt the skill search index with %s skills", count)
+    return count
+
+
+def search_skills(queryset, query: str, narrowed: bool = True):
+    """
+    ``queryset`` narrowed to the skills matching ``query``, best first.
+
+    Every word of the query matches as a prefix of a word in the name,
+    description or category. At most ``SKILL_SEARCH_MAX_RESULTS`` of the
+    skills in ``queryset`` are ranked, their position is annotated as
+    ``search_rank``. Its filters run inside the index query, a caller
+    whose ``queryset`` holds every live skill passes ``narrowed=False`` to
+    skip them. Returns ``None`` when the query has no words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    limit = getattr(settings, "SKILL_SEARCH_MAX_RESULTS", 200)
+    backend = get_search_backend()
+    if backend is None:
+        condition = Q()
+        for term in terms:
+            condition &= (Q(name__icontains=term)
+                          | Q(description__icontains=term)
+                          | Q(category__name__icontains=term))
+        skill_ids = list(
+            queryset.filter(condition).order_by("name").values_list(
+                "pk", flat=True)[:limit])
+    else:
+        within = (queryset.order_by().values("pk").query.sql_with_params()
+                  if narrowed else None)
+        with connection.cursor() as cursor:
+            skill_ids = [
+                Skills._meta.pk.to_python(skill_id)
+                for skill_id in backend.search(cursor, terms, limit, within)
+            ]
+    if not skill_ids:
+        return queryset.none().annotate(search_rank=Value(0))
+    return queryset.filter(pk__in=skill_ids).annotate(search_rank=Case(
+        *[When(pk=skill_id, then=Value(rank))
+          for rank, skill_id in enumerate(skill_ids)],
+        output_field=IntegerField()))
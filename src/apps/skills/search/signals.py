@@ -0,0 +1,22 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+
+from ..models import Skills, SkillCategory
+from .services import index_skills
+from .facets import bump_catalogue_version
+
+
+@receiver([post_save, post_delete], sender=Skills)
+def skill_changed(sender, instance, **kwargs):
+    index_skills([instance.pk])
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=SkillCategory)
+def category_changed(sender, instance, created, **kwargs):
+    if not created:
+        index_skills(instance.skills.values_list("pk", flat=True))
+        bump_catalogue_version()
+
+# a deleted category is handled with the skill documents, see
+# apps.skills.signals.category_deleted
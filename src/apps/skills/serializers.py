@@ -5,13 +5,16 @@ from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 
-from .models import SkillCategory, Skills, Enrollment
+from .models import SkillCategory, Skills, Enrollment, InterestSkill
+from ..users.profiles.models import Interest
 from ..users.serializers import UserReadSerializer
 from ..users.profiles.serializers import ChildReadSerializer
 from .payments.models import Purchase
 from .helpers import _child_age_or_none, _is_age_appropriate
+from .documents import skill_document
 
 import email_validator
+import json
 
 User = get_user_model()
 
@@ -118,7 +121,7 @@ class EnrollmentSerializer(serializers.Serializer):
                                               code="invalid_request")
         email = value.strip()
         try:
-            email_validator.validate_email(email, check_deliverability=True)
+            email_validator.validate_email(email, check_deliverability=False)
         except email_validator.EmailNotValidError:
             self.fail("invalid_email")
         request = self.context.get("request")
@@ -176,8 +179,19 @@ class EnrollmentSerializer(serializers.Serializer):
         return validated_data
 
 
+class SkillDocumentField(serializers.Field):
+    """ A skill from its stored document rather than the nested fields """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return json.loads(skill_document(value))
+
+
 class EnrollmentReadSerializer(serializers.ModelSerializer):
-    skill = SkillReadSerializer(read_only=True)
+    skill = SkillDocumentField()
     child_profile = ChildReadSerializer(read_only=True)
 
     class Meta:
@@ -185,3 +199,30 @@ class EnrollmentReadSerializer(serializers.ModelSerializer):
         fields = [
             "child_profile", "skill", "is_active", "created_at", "enrol_id"
         ]
+
+
+class InterestSkillSerializer(serializers.ModelSerializer):
+    interest = serializers.CharField(max_length=200, write_only=True)
+    interest_name = serializers.CharField(source="interest.name",
+                                          read_only=True)
+
+    class Meta:
+        model = InterestSkill
+        fields = ["link_id", "interest", "interest_name", "weight", "source"]
+        read_only_fields = ["link_id", "source"]
+
+    def create(self, validated_data):
+        skill = self.context.get("skill")
+        name = validated_data.pop("interest")
+        interest = Interest.objects.resolve(name)
+        with transaction.atomic():
+            if interest is None:
+                interest = Interest.objects.create(name=name)
+            link, _ = InterestSkill.objects.update_or_create(
+                interest=interest,
+                skill=skill,
+                defaults={
+                    "weight": validated_data["weight"],
+                    "source": InterestSkill.Source.INSTRUCTOR
+                })
+        return link
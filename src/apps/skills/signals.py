@@ -0,0 +1,50 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.contrib.auth import get_user_model
+
+from .models import Skills, SkillCategory
+from .documents import rebuild_skill_documents
+from .search.services import index_skills
+from .search.facets import bump_catalogue_version
+from ..users.serializers import UserReadSerializer
+
+User = get_user_model()
+
+# what a skill document shows of its instructor
+_INSTRUCTOR_FIELDS = frozenset(UserReadSerializer.Meta.fields)
+
+
+@receiver(post_save, sender=Skills)
+def rebuild_skill_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rebuild_skill_documents([instance.pk])
+
+
+@receiver(post_save, sender=SkillCategory)
+def rebuild_category_documents(sender, instance, created, **kwargs):
+    if not created:
+        rebuild_skill_documents(instance.skills.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=SkillCategory)
+def remember_category_skills(sender, instance, **kwargs):
+    # the skills are detached with a bulk update that sends no signals
+    instance._detached_skill_ids = list(
+        instance.skills.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=SkillCategory)
+def category_deleted(sender, instance, **kwargs):
+    skill_ids = getattr(instance, "_detached_skill_ids", [])
+    index_skills(skill_ids)
+    rebuild_skill_documents(skill_ids)
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=User)
+def rebuild_instructor_documents(sender, instance, created, update_fields=None,
+                                 **kwargs):
+    if created or (update_fields is not None
+                   and not _INSTRUCTOR_FIELDS.intersection(update_fields)):
+        return
+    rebuild_skill_documents(instance.skills.values_list("pk", flat=True))
@@ -0,0 +1,69 @@
+from celery import shared_task
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Enrollment, InterestSkill
+from ..users.profiles.models import ChildInterest
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def rebuild_interest_skill_weights():
+    """
+    Derive interest -> skill weights from what children enrol in.
+
+    The weight of a pair is the share of children with the interest who
+    are enrolled in the skill, for interests held by at least
+    ``INTEREST_SKILL_MIN_CHILDREN`` children. Pairs an instructor set by
+    hand are left alone and batch pairs that no longer hold are removed.
+    """
+    min_children = getattr(settings, "INTEREST_SKILL_MIN_CHILDREN", 3)
+    started = timezone.now()
+    holders = dict(
+        ChildInterest.objects.filter(
+            is_active=True, is_deleted=False,
+            topic__isnull=False).values("topic").annotate(
+                children=Count("child", distinct=True)).filter(
+                    children__gte=min_children).values_list(
+                        "topic", "children"))
+    pairs = Enrollment.objects.filter(
+        is_active=True,
+        child_profile__interest__topic__in=list(holders),
+        child_profile__interest__is_active=True,
+        child_profile__interest__is_deleted=False).values(
+            "child_profile__interest__topic",
+            "skill").annotate(children=Count("child_profile",
+                                             distinct=True)).order_by()
+    manual = set(
+        InterestSkill.objects.filter(
+            source=InterestSkill.Source.INSTRUCTOR).values_list(
+                "interest_id", "skill_id"))
+    links = [
+        InterestSkill(interest_id=pair["child_profile__interest__topic"],
+                      skill_id=pair["skill"],
+                      weight=round(
+                          pair["children"] /
+                          holders[pair["child_profile__interest__topic"]], 4),
+                      source=InterestSkill.Source.BATCH) for pair in pairs
+        if (pair["child_profile__interest__topic"],
+            pair["skill"]) not in manual
+    ]
+    with transaction.atomic():
+        InterestSkill.objects.bulk_create(
+            links,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["interest", "skill"],
+            update_fields=["weight", "source", "updated_at"])
+        removed, _ = InterestSkill.objects.filter(
+            source=InterestSkill.Source.BATCH,
+            updated_at__lt=started).delete()
+    logger.info("Interest skill map rebuilt: %s links, %s removed",
+                len(links), removed)
+    return {"links": len(links), "removed": removed}
@@ -0,0 +1,145 @@
+from ..models import Skills
+from ..search.autocomplete import (AutocompleteIndex, SkillAutocomplete,
+                                   skill_autocomplete)
+
+from django.utils import timezone
+
+from tests_config.helpers import assert_no_full_scan
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from unittest import mock
+import pytest
+
+PATH = "/api/v1/sk/skills/autocomplete/"
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(settings):
+    settings.SKILL_AUTOCOMPLETE_REFRESH_SECONDS = 0
+    skill_autocomplete.reset()
+    yield
+    skill_autocomplete.reset()
+
+
+def _names(results):
+    return [name for _, name in results]
+
+
+class TestAutocompleteIndex:
+
+    @pytest.fixture
+    def index(self):
+        return AutocompleteIndex.build([
+            ("1", "Robotics for beginners"),
+            ("2", "Advanced robotics"),
+            ("3", "Robot dance"),
+            ("4", "Painting"),
+            ("5", "Café cooking"),
+        ])
+
+    def test_prefix_ranks_starts_then_shortest(self, index):
+        assert _names(index.search("rob")) == [
+            "Robot dance", "Robotics for beginners", "Advanced robotics"
+        ]
+        assert _names(index.search("robotics beg")) == [
+            "Robotics for beginners"
+        ]
+        assert _names(index.search("cafe")) == ["Café cooking"]
+        assert index.search("  ") == []
+
+    def test_typos(self, index):
+        assert _names(index.search("robitics", limit=2)) == [
+            "Robotics for beginners", "Advanced robotics"
+        ]
+        assert _names(index.search("paintnig")) == ["Painting"]
+        assert index.search("zebra") == []
+
+    def test_incremental_changes(self, index):
+        index.add("4", "Watercolour painting")
+        index.add("6", "Robo")
+        index.remove("3")
+        assert _names(index.search("rob"))[:2] == [
+            "Robo", "Robotics for beginners"
+        ]
+        assert _names(index.search("paint")) == ["Watercolour painting"]
+        compact = index.compact()
+        assert compact.dead == 0 and len(compact) == len(index) == 5
+        assert compact.search("paint") == index.search("paint")
+
+    def test_copy_leaves_the_original_alone(self, index):
+        before = index.search("rob")
+        copy = index.copy()
+        copy.add("6", "Robo")
+        copy.add("7", "Rowing")
+        copy.remove("3")
+        assert index.search("rob") == before
+        assert not index.has("6") and index.has("3")
+        assert _names(copy.search("ro"))[:2] == ["Robo", "Rowing"]
+
+
+@pytest.mark.django_db
+class TestSkillAutocomplete:
+
+    def test_follows_the_change_feed(self, instructor_user,
+                                     django_assert_num_queries):
+        skill = Skills.objects.create(user=instructor_user,
+                                      name="Chess openings",
+                                      min_age=5,
+                                      max_age=15)
+        assert _names(skill_autocomplete.search("che")) == ["Chess openings"]
+
+        skill.name = "Chess endgames"
+        skill.save()
+        Skills.objects.create(user=instructor_user,
+                              name="Chemistry",
+                              min_age=5,
+                              max_age=15,
+                              is_active=False)
+        # requests only read, the refresher applies the changes
+        with django_assert_num_queries(0):
+            assert _names(
+                skill_autocomplete.search("che")) == ["Chess openings"]
+        read = skill_autocomplete.current()
+        with django_assert_num_queries(1):
+            skill_autocomplete.tick()
+        assert _names(skill_autocomplete.search("che")) == ["Chess endgames"]
+        # an index a request is reading is replaced, never changed
+        assert _names(read.search("che")) == ["Chess openings"]
+
+        skill.is_deleted = True
+        skill.save()
+        skill_autocomplete.tick()
+        assert skill_autocomplete.search("che") == []
+
+    def test_one_refresher_per_process(self):
+        autocomplete = SkillAutocomplete()
+        with mock.patch.object(autocomplete, "_run"):
+            autocomplete.start()
+            first = autocomplete.refresher
+            autocomplete.start()
+            assert autocomplete.refresher is first
+            # what a forked worker runs
+            autocomplete._after_fork()
+            assert autocomplete.refresher not in (None, first)
+
+    def test_change_feed_uses_an_index(self):
+        assert_no_full_scan(
+            Skills.objects.filter(
+                updated_at__gte=timezone.now()).order_by("updated_at"))
+
+    def test_endpoint(self, instructor_user, settings):
+        settings.SKILL_AUTOCOMPLETE_REFRESH_SECONDS = 60
+        skill = Skills.objects.create(user=instructor_user,
+                                      name="Pottery",
+                                      min_age=5,
+                                      max_age=15)
+        response = APIClient().get(PATH, {"q": "potery"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["detail"] == [{
+            "skill_id": str(skill.pk),
+            "name": "Pottery"
+        }]
+        assert APIClient().get(PATH, {"q": "pot", "limit": "x"}).json(
+        )["detail"][0]["name"] == "Pottery"
@@ -0,0 +1,82 @@
+from ..models import Skills, SkillCategory, SkillDocument, Enrollment
+from ..documents import skill_documents, documents_response
+from ..serializers import SkillReadSerializer, EnrollmentReadSerializer
+
+from rest_framework.renderers import JSONRenderer
+
+import json
+import pytest
+
+
+@pytest.fixture
+def tech(admin_user):
+    return SkillCategory.objects.create(user=admin_user, name="TECH")
+
+
+@pytest.fixture
+def skill(instructor_user, tech):
+    return Skills.objects.create(user=instructor_user,
+                                 category=tech,
+                                 name="Robots",
+                                 min_age=5,
+                                 max_age=15,
+                                 price="1500.00")
+
+
+def _document(skill):
+    return json.loads(SkillDocument.objects.get(skill=skill).body)
+
+
+@pytest.mark.django_db
+class TestSkillDocuments:
+
+    def test_same_bytes_as_the_serializer(self, skill):
+        skill = Skills.objects.select_related("user", "category").get(
+            pk=skill.pk)
+        rendered = JSONRenderer().render(SkillReadSerializer(skill).data)
+        assert SkillDocument.objects.get(
+            skill=skill).body.encode() == rendered
+
+    def test_rebuilt_on_writes(self, skill, tech, instructor_user):
+        skill.name = "Drones"
+        skill.save()
+        assert _document(skill)["name"] == "Drones"
+
+        tech.name = "CRAFT"
+        tech.save()
+        assert _document(skill)["category"]["name"] == "CRAFT"
+
+        instructor_user.first_name = "Ada"
+        instructor_user.save()
+        assert _document(skill)["user"]["first_name"] == "Ada"
+
+        tech.delete()
+        assert _document(skill)["category"] is None
+
+    def test_missing_documents_are_built_on_read(self, instructor_user):
+        skills = Skills.objects.bulk_create([
+            Skills(user=instructor_user, name=name, min_age=5, max_age=15)
+            for name in ("Chess", "Go")
+        ])
+        ids = [skills[1].pk, skills[0].pk]
+        assert not SkillDocument.objects.exists()
+        documents = skill_documents(ids)
+        assert [json.loads(doc)["name"] for doc in documents] == ["Go", "Chess"]
+        assert SkillDocument.objects.count() == 2
+
+    def test_response_splices_documents(self):
+        response = documents_response({"next": None}, ['{"a":1}', '{"b":2}'])
+        assert json.loads(response.content) == {
+            "next": None,
+            "results": [{"a": 1}, {"b": 2}]
+        }
+
+    def test_enrollment_reads_the_document(self, skill, child_profile,
+                                           django_assert_num_queries):
+        Enrollment.objects.create(skill=skill, child_profile=child_profile)
+        enrollment = Enrollment.objects.select_related(
+            "child_profile", "skill__document").get()
+        with django_assert_num_queries(2):
+            # the child's interests and guardian, the skill costs nothing
+            data = EnrollmentReadSerializer(enrollment).data
+        assert data["skill"] == _document(skill)
@@ -0,0 +1,79 @@
+from ..models import Skills, SkillCategory
+from ..search.facets import compute_facets
+
+from django.core.cache import cache
+
+from rest_framework import status
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tech(admin_user):
+    return SkillCategory.objects.create(user=admin_user, name="TECH")
+
+
+def _skill(owner, category, name, min_age=5, max_age=15, price=None,
+           difficulty=Skills.SkillDifficulty.BEGINNER):
+    return Skills.objects.create(user=owner,
+                                 category=category,
+                                 name=name,
+                                 min_age=min_age,
+                                 max_age=max_age,
+                                 price=price,
+                                 is_paid=price is not None,
+                                 skill_difficulty=difficulty)
+
+
+@pytest.mark.django_db
+class TestFacets:
+
+    def test_one_grouped_query(self, instructor_user, tech, admin_user,
+                               django_assert_num_queries):
+        craft = SkillCategory.objects.create(user=admin_user, name="CRAFT")
+        _skill(instructor_user, tech, "Coding", min_age=5, max_age=8,
+               price=1500)
+        _skill(instructor_user, tech, "Robots", min_age=12, max_age=15,
+               price=12000, difficulty=Skills.SkillDifficulty.ADVANCED)
+        _skill(instructor_user, craft, "Pottery", min_age=9, max_age=10)
+
+        with django_assert_num_queries(1):
+            facets = compute_facets(Skills.objects.all())
+
+        assert facets == {
+            "category": {"TECH": 2, "CRAFT": 1},
+            "skill_difficulty": {"BEGINNER": 2, "ADVANCED": 1},
+            "age_band": {"5-7": 1, "8-10": 2, "11-13": 1, "14-15": 1},
+            "price_bucket": {"0-999": 0, "1000-4999": 1, "5000-9999": 0,
+                             "10000+": 1},
+            "is_paid": {"free": 1, "paid": 2},
+        }
+
+    def test_cached_per_filter_state_until_a_write(
+            self, instructor_user, instructor_client, tech,
+            django_assert_num_queries, django_capture_on_commit_callbacks):
+        _skill(instructor_user, tech, "Coding", min_age=5, max_age=8)
+        path = f"/api/v1/sk/category/{tech.pk}/skills/"
+
+        response = instructor_client.get(path)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["facets"]["category"] == {"TECH": 1}
+        with django_assert_num_queries(1):
+            # the page only, the counts come from the cache
+            instructor_client.get(path)
+
+        narrowed = instructor_client.get(path, {"min_age": 6}).json()
+        assert narrowed["facets"]["is_paid"] == {"free": 0, "paid": 0}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _skill(instructor_user, tech, "Robots", min_age=12)
+        facets = instructor_client.get(path).json()["facets"]
+        assert facets["category"] == {"TECH": 2}
+        assert facets["age_band"]["14-15"] == 1
@@ -0,0 +1,83 @@
+from ..models import Skills, SkillCategory
+from ..filters import SkillFilter
+
+from django.core.cache import cache
+
+from tests_config.helpers import assert_no_full_scan
+
+from rest_framework import status
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tech(admin_user):
+    return SkillCategory.objects.create(user=admin_user, name="TECH")
+
+
+@pytest.fixture
+def catalogue(instructor_user, tech):
+    specs = [
+        ("Coding", 5, 8, "BEGINNER", None),
+        ("Robots", 9, 12, "INTERMEDIATE", 2000),
+        ("Drones", 12, 15, "ADVANCED", 9000),
+    ]
+    return {
+        name: Skills.objects.create(user=instructor_user,
+                                    category=tech,
+                                    name=name,
+                                    min_age=min_age,
+                                    max_age=max_age,
+                                    skill_difficulty=difficulty,
+                                    price=price,
+                                    is_paid=price is not None)
+        for name, min_age, max_age, difficulty, price in specs
+    }
+
+
+def _live():
+    return Skills.objects.select_related("user", "category").filter(
+        is_active=True, is_deleted=False)
+
+
+@pytest.mark.django_db
+class TestSkillFilter:
+
+    @pytest.mark.parametrize("params, expected", [
+        ({"age": 9}, {"Robots"}),
+        ({"age_min": 7, "age_max": 9}, {"Coding", "Robots"}),
+        ({"difficulty": "BEGINNER,ADVANCED"}, {"Coding", "Drones"}),
+        ({"category": "TECH", "price_min": 1000, "price_max": 5000},
+         {"Robots"}),
+        ({"is_paid": "false"}, {"Coding"}),
+        ({"q": "dron"}, {"Drones"}),
+    ])
+    def test_filters(self, catalogue, params, expected):
+        assert {skill.name
+                for skill in SkillFilter(params, _live()).qs} == expected
+
+    def test_through_the_view(self, catalogue, tech, instructor_client):
+        path = f"/api/v1/sk/category/{tech.pk}/skills/"
+        response = instructor_client.get(path, {"age": 10, "q": "robo"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [skill["name"]
+                for skill in response.json()["results"]] == ["Robots"]
+        response = instructor_client.get(path, {"difficulty": "EXPERT"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize("params", [
+        {"category": "TECH", "age": 7},
+        {"difficulty": "BEGINNER,ADVANCED"},
+        {"price_min": 100, "price_max": 500},
+        {"age_min": 6, "age_max": 9},
+    ])
+    def test_hot_filters_use_an_index(self, params):
+        assert_no_full_scan(
+            SkillFilter(params, _live()).qs.order_by("-created_at"))
@@ -0,0 +1,151 @@
+from ..models import Skills, Enrollment, InterestSkill
+from ..tasks import rebuild_interest_skill_weights
+from ...users.profiles.models import (Interest, InterestSynonym, ChildInterest,
+                                      ChildProfile)
+from ...lesson.recommendation.services.recommendation_service import \
+    InterestRecommendation
+
+from tests_config.factories import ChildProfileFactory, UserFactory
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+
+
+def _skill(owner, name, min_age=5, max_age=15):
+    return Skills.objects.create(user=owner,
+                                 name=name,
+                                 min_age=min_age,
+                                 max_age=max_age)
+
+
+def _likes(child, name):
+    return ChildInterest.objects.create(child=child,
+                                        name=name,
+                                        description="")
+
+
+@pytest.fixture
+def robots():
+    interest = Interest.objects.create(name="  Robots ")
+    InterestSynonym.objects.create(interest=interest, name="Robotics")
+    return interest
+
+
+@pytest.mark.django_db
+class TestInterestVocabulary:
+
+    def test_names_and_synonyms_resolve(self, robots):
+        assert robots.name == "robots" and robots.label == "Robots"
+        assert Interest.objects.resolve("ROBOTICS") == robots
+        assert Interest.objects.resolve("gardening") is None
+
+    def test_child_interest_is_linked(self, robots, child_profile):
+        interest = _likes(child_profile, "Robotics")
+        assert interest.topic == robots
+        interest.name = "painting"
+        interest.save(update_fields=["name"])
+        interest.refresh_from_db()
+        assert interest.topic is None
+
+    def test_new_vocabulary_links_existing_interests(self, child_profile):
+        lego = _likes(child_profile, " LEGO  Robots")
+        bricks = _likes(child_profile, "bricks")
+        assert lego.topic is None and bricks.topic is None
+
+        interest = Interest.objects.create(name="lego robots")
+        InterestSynonym.objects.create(interest=interest, name="Bricks")
+        lego.refresh_from_db()
+        bricks.refresh_from_db()
+        assert lego.topic == interest and bricks.topic == interest
+
+        interest.is_active = False
+        interest.save()
+        assert not ChildInterest.objects.filter(topic=interest).exists()
+
+
+@pytest.mark.django_db
+class TestInterestRecommendation:
+
+    def test_single_query_ranked_by_weight(self, robots, child_profile,
+                                           instructor_user,
+                                           django_assert_num_queries):
+        drawing = Interest.objects.create(name="drawing")
+        _likes(child_profile, "robotics")
+        _likes(child_profile, "drawing")
+        lego, design, chess = (_skill(instructor_user, name)
+                               for name in ("lego", "design", "chess"))
+        too_old = _skill(instructor_user, "circuits", min_age=14)
+        ChildProfile.objects.filter(pk=child_profile.pk).update(age=9)
+        child_profile.refresh_from_db()
+        for interest, skill, weight in [(robots, lego, 0.6),
+                                        (robots, design, 0.3),
+                                        (drawing, design, 0.5),
+                                        (robots, too_old, 1.0)]:
+            InterestSkill.objects.create(interest=interest,
+                                         skill=skill,
+                                         weight=weight)
+
+        with django_assert_num_queries(1):
+            ranked = list(InterestRecommendation(child_profile).recommend())
+        assert [skill.name for skill in ranked] == ["design", "lego"]
+        assert ranked[0].score == pytest.approx(0.8)
+        assert chess not in ranked
+
+        # a second name for the same topic counts once
+        _likes(child_profile, "robots")
+        ranked = list(InterestRecommendation(child_profile).recommend())
+        assert ranked[0].score == pytest.approx(0.8)
+
+
+@pytest.mark.django_db
+class TestInterestSkillMap:
+
+    def test_owner_maps_interest(self, instructor_client: APIClient,
+                                 instructor_user, robots):
+        skill = _skill(instructor_user, "lego")
+        path = f"/api/v1/sk/skills/{skill.pk}/interests/"
+        response = instructor_client.post(path, {
+            "interest": "Robotics",
+            "weight": 0.7
+        },
+                                          format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        link = InterestSkill.objects.get(skill=skill)
+        assert link.interest == robots and link.weight == 0.7
+        assert instructor_client.get(path).json()[0][
+            "interest_name"] == "robots"
+
+    def test_other_instructors_cannot(self, instructor_client: APIClient):
+        skill = _skill(UserFactory(user_role="INSTRUCTOR"), "lego")
+        response = instructor_client.post(
+            f"/api/v1/sk/skills/{skill.pk}/interests/", {
+                "interest": "robots",
+                "weight": 0.7
+            },
+            format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_nightly_weights(self, robots, guardian_user, instructor_user,
+                             settings):
+        settings.INTEREST_SKILL_MIN_CHILDREN = 2
+        lego, chess, stale = (_skill(instructor_user, name)
+                              for name in ("lego", "chess", "stale"))
+        InterestSkill.objects.create(interest=robots, skill=chess, weight=0.9)
+        InterestSkill.objects.create(interest=robots,
+                                     skill=stale,
+                                     weight=0.5,
+                                     source=InterestSkill.Source.BATCH)
+        for index in range(4):
+            child = ChildProfileFactory(guardian=guardian_user)
+            _likes(child, "robots")
+            Enrollment.objects.create(child_profile=child, skill=chess)
+            if index % 2:
+                Enrollment.objects.create(child_profile=child, skill=lego)
+
+        assert rebuild_interest_skill_weights() == {"links": 1, "removed": 1}
+        weights = dict(
+            InterestSkill.objects.values_list("skill__name", "weight"))
+        # the instructor's own weight for chess is kept
+        assert weights == {"lego": 0.5, "chess": 0.9}
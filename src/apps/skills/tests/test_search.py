@@ -0,0 +1,135 @@
+from ..models import Skills, SkillCategory
+from ..search.services import search_skills, rebuild_search_index
+
+from django.core.cache import cache
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+
+SEARCH_URL = "/api/v1/sk/skills/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # the search view is cached per url
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tech(admin_user):
+    return SkillCategory.objects.create(user=admin_user, name="TECH")
+
+
+def _skill(owner, name, description="", category=None):
+    return Skills.objects.create(user=owner,
+                                 name=name,
+                                 description=description,
+                                 category=category,
+                                 min_age=5,
+                                 max_age=15)
+
+
+def _names(query):
+    ranked = search_skills(Skills.objects.all(), query)
+    return [skill.name for skill in ranked.order_by("search_rank")]
+
+
+@pytest.mark.django_db
+class TestSkillSearch:
+
+    def test_prefix_matches_ranked_by_field(self, instructor_user):
+        _skill(instructor_user, "Painting", description="robots in colour")
+        _skill(instructor_user, "Robotics for beginners")
+        _skill(instructor_user, "Gardening")
+
+        assert _names("robo") == ["Robotics for beginners", "Painting"]
+        assert _names("ROBOT begin") == ["Robotics for beginners"]
+        assert _names("cooking") == []
+        assert search_skills(Skills.objects.all(), " !? ") is None
+
+    def test_filters_apply_before_the_limit(self, instructor_user, tech,
+                                            settings):
+        settings.SKILL_SEARCH_MAX_RESULTS = 2
+        for index in range(3):
+            _skill(instructor_user, f"Robotics {index}")
+        _skill(instructor_user, "Drawing", description="robots", category=tech)
+
+        ranked = search_skills(Skills.objects.filter(category=tech), "robo")
+        assert [skill.name for skill in ranked] == ["Drawing"]
+
+    def test_index_follows_writes(self, instructor_user, tech):
+        skill = _skill(instructor_user, "Pottery")
+        assert _names("tech") == []
+
+        skill.name = "Woodwork"
+        skill.category = tech
+        skill.save()
+        assert _names("pott") == []
+        assert _names("tech") == ["Woodwork"]
+
+        tech.name = "CRAFT"
+        tech.save()
+        assert _names("tech") == [] and _names("craft") == ["Woodwork"]
+
+        tech.delete()
+        assert _names("craft") == [] and _names("wood") == ["Woodwork"]
+
+        skill.refresh_from_db()
+        skill.is_deleted = True
+        skill.save()
+        assert _names("wood") == []
+        skill.is_deleted = False
+        skill.save()
+        skill.delete()
+        assert _names("wood") == []
+
+    def test_rebuild_after_bulk_writes(self, instructor_user):
+        Skills.objects.bulk_create([
+            Skills(user=instructor_user,
+                   name=f"Chess {index}",
+                   min_age=5,
+                   max_age=15) for index in range(3)
+        ])
+        assert _names("chess") == []
+        assert rebuild_search_index() == 3
+        assert len(_names("chess")) == 3
+
+
+@pytest.mark.django_db
+class TestSkillSearchView:
+
+    def test_ranked_pages(self, instructor_user, settings,
+                          django_assert_num_queries):
+        settings.SKILL_SEARCH_MAX_RESULTS = 6
+        for index in range(8):
+            _skill(instructor_user, f"Coding {index}")
+        _skill(instructor_user, "Drawing", description="coding comics")
+        client = APIClient()
+
+        # the match, the page and its stored documents, whatever the size
+        # of the catalogue
+        with django_assert_num_queries(3):
+            response = client.get(SEARCH_URL, {"search": "cod"})
+        assert response.status_code == status.HTTP_200_OK
+        first = [skill["name"] for skill in response.json()["results"]]
+        assert len(first) == 5 and "Drawing" not in first
+
+        response = client.get(response.json()["next"])
+        assert len(response.json()["results"]) == 1
+        assert response.json()["next"] is None
+
+    def test_no_match(self, instructor_user):
+        _skill(instructor_user, "Coding")
+        response = APIClient().get(SEARCH_URL, {"search": "knitting"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_browse_newest_first(self, instructor_user):
+        _skill(instructor_user, "Coding")
+        _skill(instructor_user, "Drawing")
+        response = APIClient().get(SEARCH_URL)
+        assert [skill["name"] for skill in response.json()["results"]
+                ] == ["Drawing", "Coding"]
@@ -17,10 +17,16 @@ skill_routers.register(r'skills', viewset=views.SkillsViewSet, basename="skills"
 urlpatterns = [
     path("home/skills/", views.skills_home, name="home"),
     path("skills/", views.skill_search, name="skill_search"),
+    path("skills/autocomplete/",
+         views.SkillAutocompleteView.as_view(),
+         name="skill_autocomplete"),
     path("child/<uuid:child_pk>/skills/<uuid:skill_pk>/enroll", 
          views.EnrollmentViewSet.as_view(http_method_names=["post"]), name="enroll"),
     path("child/<uuid:child_pk>/enrollments/", views.EnrollmentViewSet.as_view(http_method_names=["get"]),
          name="enroll_ments"),
+    path("skills/<uuid:skill_pk>/interests/",
+         views.SkillInterestView.as_view(),
+         name="skill_interests"),
     path("", include(routers.urls)),
     path("", include(skill_routers.urls))
 ]
@@ -4,22 +4,28 @@ from rest_framework import viewsets, permissions, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 from rest_framework.generics import ListAPIView, ListCreateAPIView
+from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied
 
 from django.db import transaction
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from django.contrib.auth import get_user_model
 
 from .serializers import (CategorySerializer, SkillCreateSerializer,
                           SkillReadSerializer, EnrollmentSerializer,
-                          EnrollmentReadSerializer)
-from .models import SkillCategory, Skills, ChildProfile, Enrollment
+                          EnrollmentReadSerializer, InterestSkillSerializer)
+from .models import (SkillCategory, Skills, ChildProfile, Enrollment,
+                     InterestSkill)
 from ..users.profiles.permissions import IsInstructor, IsOwner, IsGuardian
 from ..users.helpers import _validate_serializer
-from .paginations import CustomSkillPagination
+from .paginations import CustomSkillPagination, SkillSearchPagination
+from .filters import SkillFilter
+from .documents import documents_response, skill_documents
+from .search.services import search_skills
+from .search.autocomplete import skill_autocomplete
+from .search.facets import get_facets
 
 User = get_user_model()
 
@@ -31,45 +37,68 @@ def skills_home(request):
 
 class SkillSearchView(ListAPIView):
     permission_classes = [permissions.AllowAny]
-    pagination_class = CustomSkillPagination
+    pagination_class = SkillSearchPagination
     serializer_class = SkillReadSerializer
 
     def get_queryset(self):
-        return Skills.objects.select_related("user", "category").filter(
-            is_active=True, is_deleted=False)
+        # rows are emitted from their stored documents, the page only
+        # needs what orders it
+        return Skills.objects.filter(is_active=True,
+                                     is_deleted=False).only(
+                                         "skill_id", "created_at")
 
     @method_decorator(cache_page(60 * 15))
     def get(self, request, *args, **kwargs):
         qs = self.get_queryset()
-        if "search" not in request.query_params:
-            qs = qs.order_by("-created_at")
-        if qs:
-            query = request.query_params.get("search")
-            if isinstance(query, str):
-                qs = qs.filter(
-                    Q(category__name__icontains=query)
-                    | Q(name__icontains=query))
-            page = self.paginate_queryset(qs)
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
-            serializer = self.get_serializer(qs, many=True)
-            return Response({
-                "status": "success",
-                "data": serializer.data
-            },
-                            status=status.HTTP_200_OK)
-        return Response(
+        # the index holds exactly the live skills
+        ranked = search_skills(qs,
+                               request.query_params.get("search"),
+                               narrowed=False)
+        if ranked is not None:
+            qs = ranked
+        page = self.paginate_queryset(qs)
+        if not page and "cursor" not in request.query_params:
+            return Response(
+                {
+                    "status": "success",
+                    "message": "No skills found matching the query"
+                },
+                status=status.HTTP_404_NOT_FOUND)
+        return documents_response(
             {
-                "status": "success",
-                "message": "No skills found matching the query"
-            },
-            status=status.HTTP_404_NOT_FOUND)
+                "next": self.paginator.get_next_link(),
+                "previous": self.paginator.get_previous_link()
+            }, skill_documents([skill.pk for skill in page]))
 
 
 skill_search = SkillSearchView.as_view()
 
 
+class SkillAutocompleteView(APIView):
+    """ Skill names for type-ahead, served from the in-process index """
+    http_method_names = ["get"]
+    permission_classes = [permissions.AllowAny]
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 10
+        limit = min(max(limit, 1), self.max_limit)
+        matches = skill_autocomplete.search(request.query_params.get("q", ""),
+                                            limit)
+        return Response(
+            {
+                "status": "success",
+                "detail": [{
+                    "skill_id": skill_id,
+                    "name": name
+                } for skill_id, name in matches]
+            },
+            status=status.HTTP_200_OK)
+
+
 class CategoryViewSet(viewsets.ModelViewSet):
     http_method_names = ['post', "patch", "get"]
     serializer_class = CategorySerializer
@@ -100,28 +129,32 @@ class SkillsViewSet(viewsets.ModelViewSet):
     serializer_class = SkillCreateSerializer
     queryset = Skills.objects.select_related("user", "category")
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = [
-        "category__name", "min_age", "max_age", "name", "price"
-    ]
+    filterset_class = SkillFilter
     pagination_class = CustomSkillPagination
 
     def get_queryset(self):
-        qs = self.filter_queryset(self.queryset)
+        qs = self.queryset.filter(is_active=True, is_deleted=False)
         category_pk = self.kwargs.get("category_pk")
-        if "query" in self.request.query_params:
-            query = self.request.query_param.get("query")
-            qs = qs.filter(Q(category__name__iexact=query.upper())
-                           | Q(name__icontains=query)
-                           | Q(skill_difficulty__exact=query)
-                           | Q(min_age__gte=query) | Q(max_age__lte=query),
-                           is_active=True,
-                           is_deleted=False)
-            return qs
-        else:
-            qs = qs.filter(category__pk=category_pk,
-                           is_active=True,
-                           is_deleted=False)
-            return qs
+        if category_pk is not None:
+            qs = qs.filter(category_id=category_pk)
+        return qs
+
+    def _filter_state(self) -> dict:
+        params = self.request.query_params
+        state = {
+            field: params.get(field)
+            for field in self.filterset_class.base_filters if field in params
+        }
+        state["category_pk"] = self.kwargs.get("category_pk")
+        return state
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data["facets"] = get_facets(queryset, self._filter_state())
+        return response
 
     def get_permissions(self):
         if self.action in ("create"):
@@ -165,7 +198,8 @@ class SkillsViewSet(viewsets.ModelViewSet):
 
 class EnrollmentViewSet(ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Enrollment.objects.select_related("child_profile", "skill")
+    queryset = Enrollment.objects.select_related("child_profile",
+                                                 "skill__document")
     pagination_class = CustomSkillPagination
 
     def get_queryset(self):
@@ -223,8 +257,7 @@ class EnrollmentViewSet(ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         qs = self.get_queryset()
-        if "search" in request.query_params:
-            query_param = request.query_params.get("search")
+        query_param = request.query_params.get("search")
         if query_param is not None:
             qs = qs.filter(skill__name__icontains=query_param, is_active=True)
         page = self.paginate_queryset(queryset=qs)
@@ -237,3 +270,36 @@ class EnrollmentViewSet(ListCreateAPIView):
             "data": serializer.data
         },
                         status=status.HTTP_200_OK)
+
+
+class SkillInterestView(ListCreateAPIView):
+    """ The interests a skill serves and their weights, set by its owner """
+    permission_classes = [IsInstructor]
+    serializer_class = InterestSkillSerializer
+
+    def get_skill(self):
+        skill = get_object_or_404(Skills,
+                                  pk=self.kwargs.get("skill_pk"),
+                                  is_deleted=False)
+        if skill.user != self.request.user and not self.request.user.is_superuser:
+            raise PermissionDenied("You cannot manage this skill")
+        return skill
+
+    def get_queryset(self):
+        return InterestSkill.objects.select_related("interest").filter(
+            skill=self.get_skill()).order_by("-weight")
+
+    @method_decorator(transaction.atomic)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data,
+                                         context={
+                                             "request": request,
+                                             "skill": self.get_skill()
+                                         })
+        valid_serializer = _validate_serializer(serializer)
+        self.perform_create(valid_serializer)
+        return Response({
+            "status": "success",
+            "detail": valid_serializer.data
+        },
+                        status=status.HTTP_201_CREATED)
@@ -1,14 +1,16 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.utils.translation import gettext_lazy as _
-from django.db import transaction
 
 from .helpers import _validate_email, user_can_authenticate
+from .authentication import add_user_claims, revoke_user_tokens
 
 User = get_user_model()
 
@@ -31,20 +33,32 @@ class CustomObtainPairSerializer(TokenObtainPairSerializer):
                     "status": "Failed",
                     "message": f"account not found for user {valid_email}"
                 })
-        if not user_can_authenticate(user=user):
+        if not user_can_authenticate(user=user) or (
+                user.account_status != User.AccountStatus.ACTIVE):
             raise AuthenticationFailed(code="invalid_request",
                                        detail={
                                            "status": "Failed",
                                            "detail": _("account not verified")
                                        })
+        # Single hash verification for the whole login. check_password
+        # rehashes and saves the password in place when the configured
+        # hasher's work factor has changed, so we deliberately skip
+        # super().validate() which would run authenticate() and hash again.
         if not user.check_password(password):
             raise AuthenticationFailed(code="invalid_credentails",
                                        detail={
                                            "status": "failed",
                                            "detail": _("invalid_credentials")
                                        })
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account")
         self.user = user
-        data = super().validate(attrs)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
         data.update({
             "user_data": {
                 "user_id": user.pk,
@@ -60,7 +74,7 @@ class CustomObtainPairSerializer(TokenObtainPairSerializer):
         token.verify()
         token.set_jti()
         token["email"] = getattr(user, "email", None)
-        return token
+        return add_user_claims(token, user)
 
 
 class CustomLogoutSerializer(serializers.Serializer):
@@ -71,25 +85,23 @@ class CustomLogoutSerializer(serializers.Serializer):
     default_error_messages = {"bad_token": _("Token is invalid or expired")}
 
     def get_user_from_token(self, token: str):
-        token = RefreshToken(token=token)
+        try:
+            token = RefreshToken(token=token)
+        except TokenError:
+            self.fail("bad_token")
         return token.get("user_id")
 
     def validate(self, attrs):
         data = super().validate(attrs)
         request = self.context.get("request")
         user = request.user
-        # if user is None or "Anonymous":
-        #     raise serializers.ValidationError(_("Authentication credentials were not provided"), code="invali_request")
         token = attrs.get("refresh_token")
         user_id = self.get_user_from_token(token)
         if str(user_id) != str(user.pk):
             raise serializers.ValidationError(
                 _("Invalid Request. refresh token is Invalid"),
                 code="refresh_token_invalid")
-
-        outstanding_tokens = OutstandingToken.objects.filter(user=user).all()
-        with transaction.atomic():
-            # black list all outstanding token for this user
-            BlacklistedToken.objects.bulk_create(
-                BlacklistedToken(token=token) for token in outstanding_tokens)
+        # one indexed update moves the user's token epoch forward, every
+        # access and refresh token issued so far stops authenticating
+        revoke_user_tokens(user.pk)
         return attrs
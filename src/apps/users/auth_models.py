@@ -85,6 +85,10 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     verified_at = models.DateTimeField(blank=True, null=True)
     suspended_at = models.DateTimeField(blank=True, null=True)
     deactivated_at = models.DateTimeField(blank=True, null=True)
+    # JWTs issued before this instant are revoked (logout)
+    tokens_valid_after = models.DateTimeField(blank=True,
+                                              null=True,
+                                              db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -7,10 +7,13 @@ from rest_framework import status
 
 from .auth import CustomObtainPairSerializer, CustomLogoutSerializer
 from .helpers import _validate_serializer
+from .throttling import AuthRateThrottle
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomObtainPairSerializer
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "login"
 
 
 token_obtain_view = CustomTokenObtainPairView.as_view()
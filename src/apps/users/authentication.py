@@ -0,0 +1,247 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.db.models import Model
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+
+import functools
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+VERSION_CLAIM = "ver"
+AUTH_TIME_CLAIM = "auth_time"
+# user fields mirrored into access token claims, saving any of them makes
+# previously issued claims stale
+CLAIM_FIELDS = frozenset({
+    "email", "user_role", "active_profile", "active_account", "is_staff",
+    "is_superuser", "is_active", "is_verified", "account_status"
+})
+
+
+def _user_cache_key(user_id) -> str:
+    return f"auth_user:{user_id}"
+
+
+def _version_cache_key(user_id) -> str:
+    return f"auth_user_version:{user_id}"
+
+
+def _epoch_cache_key(user_id) -> str:
+    return f"auth_user_epoch:{user_id}"
+
+
+def _epoch_timeout() -> int:
+    # past the refresh lifetime an epoch can no longer reject anything
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def get_tokens_valid_after(user_id) -> float:
+    """
+    Revocation epoch of ``user_id`` as a timestamp, 0 when never revoked.
+
+    Read from the cache; a miss costs one indexed single-column query.
+    """
+    key = _epoch_cache_key(user_id)
+    epoch = cache.get(key)
+    if epoch is None:
+        valid_after = User.objects.filter(pk=user_id).values_list(
+            "tokens_valid_after", flat=True).first()
+        epoch = valid_after.timestamp() if valid_after else 0
+        cache.set(key, epoch, timeout=_epoch_timeout())
+    return epoch
+
+
+def revoke_user_tokens(user_id):
+    """Invalidate every token issued to ``user_id`` so far, in O(1)."""
+    now = timezone.now()
+    User.objects.filter(pk=user_id).update(tokens_valid_after=now)
+    cache.set(_epoch_cache_key(user_id),
+              now.timestamp(),
+              timeout=_epoch_timeout())
+    return now
+
+
+def is_token_revoked(token, user_id) -> bool:
+    issued_at = token.get(AUTH_TIME_CLAIM, token.get("iat", 0))
+    return issued_at < get_tokens_valid_after(user_id)
+
+
+def get_user_version(user_id) -> str:
+    """
+    Opaque version of the claims for ``user_id``.
+
+    Changes whenever a claim field is saved. A version missing from the
+    cache is recreated, which only costs tokens issued before the eviction
+    their claims fast path.
+    """
+    key = _version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user(user_id, claims_changed: bool = True):
+    cache.delete(_user_cache_key(user_id))
+    if claims_changed:
+        cache.set(_version_cache_key(user_id), uuid.uuid4().hex, timeout=None)
+
+
+def get_cached_user(user_id):
+    """Load a user with its active child account through a short-TTL cache."""
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related("active_account").filter(
+            pk=user_id).first()
+        if user is None:
+            return None
+        cache.set(key, user, timeout=getattr(settings, "AUTH_USER_CACHE_TTL",
+                                             60))
+    return user
+
+
+def add_user_claims(token, user):
+    token["role"] = user.user_role
+    token["active_profile"] = user.active_profile
+    token["active_account"] = (str(user.active_account_id)
+                               if user.active_account_id else None)
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["is_active"] = user.is_active
+    token["is_verified"] = user.is_verified
+    token["account_status"] = user.account_status
+    token[VERSION_CLAIM] = get_user_version(user.pk)
+    # sub-second issue time so a login right after a logout stays valid
+    token[AUTH_TIME_CLAIM] = timezone.now().timestamp()
+    cache.add(_epoch_cache_key(user.pk),
+              (user.tokens_valid_after.timestamp()
+               if user.tokens_valid_after else 0),
+              timeout=_epoch_timeout())
+    return token
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    ``CustomUser`` stand-in built from access token claims.
+
+    Attributes carried in the token are answered without touching the
+    database; anything else loads the real user through
+    ``get_cached_user`` and from then on everything is served by it.
+    Equality, hashing, ``isinstance`` and ORM lookups such as
+    ``filter(guardian=request.user)`` only need the primary key.
+    """
+
+    def __init__(self, claims: dict, loader):
+        self.__dict__["_claims"] = claims
+        super().__init__(loader)
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            claims = self.__dict__["_claims"]
+            if name in claims:
+                return claims[name]
+            if name == "_meta":
+                return User._meta
+            if name != "_state" and not hasattr(User, name):
+                # not something a CustomUser has either, no need to load
+                # it to answer probes such as hasattr(user, "resolve_expression")
+                raise AttributeError(name)
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        return User
+
+    def __bool__(self):
+        return True
+
+    def _is_pk_set(self):
+        if self._wrapped is empty:
+            return True
+        return self._wrapped._is_pk_set()
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return (other._meta.concrete_model is User._meta.concrete_model
+                and other.pk == self.pk)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __repr__(self):
+        if self._wrapped is empty:
+            return f"<ClaimsUser: {self.pk}>"
+        return super().__repr__()
+
+
+def _load_user(user_id):
+    user = get_cached_user(user_id)
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the user claims of a current token.
+
+    Tokens issued by ``CustomObtainPairSerializer`` carry the role, active
+    profile, active child and flags of the user plus a version. While that
+    version matches the one in the cache the request is authenticated
+    without a single query. Older tokens, or tokens issued before the user
+    changed, fall back to the cached user. Tokens issued before the user's
+    ``tokens_valid_after`` epoch are rejected.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+        user_id = User._meta.pk.to_python(user_id)
+        if is_token_revoked(validated_token, user_id):
+            raise AuthenticationFailed(_("Token has been revoked"),
+                                       code="token_revoked")
+
+        version = validated_token.get(VERSION_CLAIM)
+        if version is None or version != get_user_version(user_id):
+            user = _load_user(user_id)
+            if not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"),
+                                           code="user_inactive")
+            return user
+
+        if not validated_token.get("is_active"):
+            raise AuthenticationFailed(_("User is inactive"),
+                                       code="user_inactive")
+        active_account = validated_token.get("active_account")
+        claims = {
+            "pk": user_id,
+            User._meta.pk.attname: user_id,
+            "email": validated_token.get("email"),
+            "user_role": validated_token.get("role"),
+            "active_profile": validated_token.get("active_profile"),
+            "active_account_id": (uuid.UUID(active_account)
+                                  if active_account else None),
+            "is_staff": validated_token.get("is_staff", False),
+            "is_superuser": validated_token.get("is_superuser", False),
+            "is_active": True,
+            "is_verified": validated_token.get("is_verified", False),
+            "account_status": validated_token.get("account_status"),
+            "is_authenticated": True,
+            "is_anonymous": False,
+        }
+        return ClaimsUser(claims, functools.partial(_load_user, user_id))
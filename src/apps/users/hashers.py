@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (PBKDF2PasswordHasher,
+                                         ScryptPasswordHasher)
+
+import copy
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count of ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    Keeps Django's ``pbkdf2_sha256`` algorithm name, so existing hashes
+    still verify and ``must_update`` re-encodes them at the tuned cost the
+    next time the user logs in.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS",
+                       None) or PBKDF2PasswordHasher.iterations
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with the work factor of ``PASSWORD_SCRYPT_WORK_FACTOR``."""
+
+    @property
+    def work_factor(self):
+        return getattr(settings, "PASSWORD_SCRYPT_WORK_FACTOR",
+                       None) or ScryptPasswordHasher.work_factor
+
+    @staticmethod
+    def _maxmem(n, r, p):
+        # OpenSSL refuses anything above 32MiB unless told otherwise
+        return 2 * 128 * r * (n + p)
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        # ``verify`` passes the parameters of the stored hash, the memory
+        # limit follows them and not the current work factor, so hashes
+        # made before a cost reduction still verify. Hashers are shared
+        # between threads, the limit is set on a copy for this call only.
+        hasher = copy.copy(self)
+        hasher.maxmem = self._maxmem(n or self.work_factor,
+                                     r or self.block_size,
+                                     p or self.parallelism)
+        return super(TunedScryptPasswordHasher,
+                     hasher).encode(password, salt, n, r, p)
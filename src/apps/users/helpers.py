@@ -1,5 +1,9 @@
-from .services.tasks import send_email_on_quene, logger
+from .services.tasks import logger, verify_email_deliverability
+from .services.email_batch import queue_email
+from .outbox.relay import enqueue
 from .services.helpers import _hash_otp_code, verify_otp
+from .services.code_store import get_code_store, StoredCode
+from .services import deliverability
 from .models import OneTimePassword, PasswordReset
 
 from django.contrib.auth import get_user_model
@@ -46,7 +50,9 @@ def _send_email_to_user(context: dict):
         raise ValidationError("User dosent exits in our database")
     context.update({"to_email": email})
     try:
-        send_email_on_quene.delay(context)
+        # email contexts may carry codes and links, they are handed to the
+        # mail queue after commit and never written to the outbox table
+        transaction.on_commit(lambda: queue_email(context))
         logger.info(f"Email sent to quene for {email}")
         return {"success": True, "message": "Email sent to quene successfully"}
     except Exception:
@@ -54,17 +60,43 @@ def _send_email_to_user(context: dict):
         raise
 
 
-def _validate_email(email: str) -> dict:
+def _validate_email(email: str,
+                    policy: str = deliverability.SYNTAX_ONLY) -> dict:
+    """
+    Validate and normalize an email address.
+
+    ``policy`` decides how much of the domain is checked:
+    ``SYNTAX_ONLY`` never touches DNS and is what hot paths (login,
+    enrollment) use, ``CACHED`` additionally rejects domains already known
+    to be undeliverable, ``FULL`` resolves the domain through the
+    deliverability cache.
+    """
     if email is None:
         raise ValidationError("Email field is emapty...")
     try:
-        valid_email = email_validator.validate_email(email.strip(),
-                                                     check_deliverability=True)
+        valid_email = email_validator.validate_email(
+            email.strip(), check_deliverability=False)
     except email_validator.EmailNotValidError:
         raise
+    if policy == deliverability.CACHED:
+        deliverable = deliverability.get_cached_deliverability(
+            valid_email.ascii_domain)
+    elif policy == deliverability.FULL:
+        deliverable = deliverability.check_domain_deliverability(
+            valid_email.ascii_domain)
+    else:
+        deliverable = None
+    if deliverable is False:
+        raise email_validator.EmailUndeliverableError(
+            f"The domain name {valid_email.domain} does not accept email.")
     return {"success": True, "valid_email": valid_email.normalized}
 
 
+def _schedule_deliverability_check(email: str):
+    """Resolve the email domain on the worker once the user row commits."""
+    enqueue(verify_email_deliverability, email)
+
+
 def _check_email_already_exists(valid_email: str) -> bool:
     if valid_email is None:
         raise ValidationError("email field is emapty")
@@ -100,29 +132,21 @@ def _get_user_by_email(email: str):
 
 
 def _get_code(code: str, user: str = None):
-    try:
-        if user:
-            one_time_password = OneTimePassword.objects.get(user=user,
-                                                            raw_code=code,
-                                                            is_active=True)
-        else:
-            one_time_password = OneTimePassword.objects.get(raw_code=code,
-                                                            is_active=True)
-        if verify_otp(code, one_time_password.hash_code):
-            return one_time_password
-    except OneTimePassword.DoesNotExist:
+    if not code:
         return None
+    return get_code_store().find_otp(code.strip(), user)
 
 
-def _verify_account(user, code_instance: OneTimePassword) -> dict:
+def _verify_account(user, code_instance: StoredCode) -> dict:
     if not isinstance(user, User):
         raise ValidationError(_("'user is not a valid user instance"))
     try:
         with transaction.atomic():
+            # consuming is atomic in every store, a code redeemed twice
+            # concurrently only verifies once
+            if not get_code_store().consume_otp(code_instance):
+                raise ValidationError(_("code already used or expired"))
             user.verify_account()
-            code_instance.is_used = True
-            code_instance.is_active = False
-            code_instance.save(update_fields=["is_used"])
         return {"success": True, "message": "Account verified successfully"}
     except IntegrityError:
         raise
@@ -131,15 +155,6 @@ def _verify_account(user, code_instance: OneTimePassword) -> dict:
             _("Account verification due to common exception errors"))
 
 
-def _get_reset_token_or_none(token):
-    try:
-        token = PasswordReset.objects.get(reset_token=token.strip(),
-                                          is_active=True)
-        return token
-    except PasswordReset.DoesNotExist:
-        return None
-
-
 def save_user_password(user, password):
     account_status = getattr(user, "account_status")
     if account_status != "ACTIVE":
@@ -149,13 +164,9 @@ def save_user_password(user, password):
 
 
 def _get_reset_code_or_none(code):
-    try:
-        code_instance = PasswordReset.objects.get(raw_code=code,
-                                                  is_active=True)
-        if verify_otp(code, code_instance.reset_code):
-            return code_instance
-    except PasswordReset.DoesNotExist:
+    if not code:
         return None
+    return get_code_store().find_reset(code.strip())
 
 
 def user_can_authenticate(user):
@@ -0,0 +1,87 @@
+from django.core.management import BaseCommand
+from django.template.loader import render_to_string
+from django.test import override_settings
+
+from sendgrid import SendGridAPIClient
+from python_http_client.exceptions import HTTPError
+from sendgrid.helpers.mail import Mail, From, To, Content
+
+from apps.users.services.email_batch import dispatch_batch
+from apps.users.services.email_service import (reset_email_client,
+                                               SENDGRID_SENDER, APP_NAME)
+from apps.users.services.fake_sendgrid import FakeSendGridServer
+from apps.users.services.templates_service import genrate_context_for_otp
+
+import time
+
+
+class Command(BaseCommand):
+    help = ("benchmark per-message against batched email dispatch on a local "
+            "fake SendGrid server")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200)
+        parser.add_argument("--latency-ms", type=float, default=20,
+                            help="simulated provider latency per API call")
+        parser.add_argument("--throttle-every", type=int, default=0,
+                            help="answer every n-th call with a 429")
+
+    def _contexts(self, count):
+        contexts = []
+        for index in range(count):
+            email = f"bench_email_{index}@example.com"
+            context = genrate_context_for_otp(
+                code=f"{index:06d}",
+                verification_url=f"https://example.com/verify/?token={index}",
+                email=email)
+            context.update({"to_email": email, "app_name": APP_NAME})
+            contexts.append(context)
+        return contexts
+
+    def _per_message(self, server, contexts):
+        # the previous path: one render, one client and one call per email
+        for context in contexts:
+            html = render_to_string(context["template_name"], context)
+            client = SendGridAPIClient(api_key="bench", host=server.url)
+            try:
+                client.send(
+                    Mail(from_email=From(email=SENDGRID_SENDER),
+                         to_emails=To(email=context["to_email"]),
+                         subject=context["subject"],
+                         html_content=Content("text/html", html)))
+            except HTTPError:
+                # it never retried, the email is lost
+                pass
+
+    def _batched(self, server, contexts):
+        with override_settings(SENDGRID_API_HOST=server.url):
+            reset_email_client()
+            try:
+                dispatch_batch(contexts)
+            finally:
+                reset_email_client()
+
+    def _measure(self, label, server, send, contexts):
+        server.reset()
+        start = time.perf_counter()
+        send(server, contexts)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<12} {len(contexts) / elapsed:10.1f} msgs/s "
+            f"{server.calls:6} calls {server.connections:6} connections "
+            f"{server.recipients:6} delivered")
+        return elapsed
+
+    def handle(self, *args, **options):
+        contexts = self._contexts(options["messages"])
+        self.stdout.write(
+            self.style.NOTICE(f"Dispatching {len(contexts)} emails..."))
+        with FakeSendGridServer(latency=options["latency_ms"] / 1000,
+                                throttle_every=options["throttle_every"]
+                                ) as server:
+            before = self._measure("per-message", server, self._per_message,
+                                   contexts)
+            after = self._measure("batched", server, self._batched, contexts)
+        self.stdout.write(
+            self.style.SUCCESS(f"Batched dispatch is {before / after:.1f}x "
+                               "faster"))
@@ -0,0 +1,64 @@
+from django.core.management import BaseCommand, CommandError
+from django.template.loader import render_to_string
+
+from apps.users.services.email_render import render_email, clear_render_cache
+from apps.users.services.email_service import APP_NAME
+from apps.users.services.templates_service import (
+    genrate_context_for_otp, generate_context_for_password_reset)
+
+import time
+
+
+class Command(BaseCommand):
+    help = ("benchmark full template rendering against cached layout "
+            "fragments, in messages per second for this worker")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=5000)
+
+    def _contexts(self, count):
+        contexts = []
+        for index in range(count):
+            email = f"bench_render_{index}@example.com"
+            url = f"https://example.com/verify/?token={index}"
+            if index % 2:
+                context = genrate_context_for_otp(code=f"{index:06d}",
+                                                  verification_url=url,
+                                                  email=email)
+            else:
+                context = generate_context_for_password_reset(
+                    code=f"{index:06d}",
+                    verification_url=url,
+                    email=email,
+                    name=f"User {index}")
+            context.update({"to_email": email, "app_name": APP_NAME})
+            contexts.append(context)
+        return contexts
+
+    def _measure(self, label, render, contexts):
+        start = time.perf_counter()
+        for context in contexts:
+            render(context)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<10} {len(contexts) / elapsed:10.1f} msgs/s "
+            f"{elapsed * 1e6 / len(contexts):8.1f} us/msg")
+        return elapsed
+
+    def handle(self, *args, **options):
+        contexts = self._contexts(options["messages"])
+        for context in contexts[:2]:
+            if render_email(context) != render_to_string(
+                    context["template_name"], context):
+                raise CommandError(
+                    f"{context['template_name']} renders differently")
+        clear_render_cache()
+        self.stdout.write(
+            self.style.NOTICE(f"Rendering {len(contexts)} emails..."))
+        before = self._measure(
+            "full", lambda context: render_to_string(
+                context["template_name"], context), contexts)
+        after = self._measure("fragments", render_email, contexts)
+        self.stdout.write(
+            self.style.SUCCESS(f"Fragment rendering is {before / after:.1f}x "
+                               "faster"))
@@ -0,0 +1,79 @@
+from django.core.management import BaseCommand
+from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth.models import update_last_login
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.auth import CustomObtainPairSerializer
+from apps.users.helpers import _validate_email
+
+import time
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "benchmark the per-login cost of the token obtain pipeline"
+    User = get_user_model()
+    password = "bench_password"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20,
+                            help="number of logins to time for each pipeline")
+
+    def _legacy_login(self, email):
+        # Reproduces the previous pipeline: explicit lookup and hash in the
+        # serializer followed by authenticate() doing both again.
+        email = _validate_email(email)["valid_email"]
+        user = self.User.objects.get(email=email)
+        user.check_password(self.password)
+        user = authenticate(email=email, password=self.password)
+        refresh = CustomObtainPairSerializer.get_token(user)
+        update_last_login(None, user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+    def _current_login(self, email):
+        serializer = CustomObtainPairSerializer(data={
+            "email": email,
+            "password": self.password
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def _measure(self, label, login, emails):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for email in emails:
+                login(email)
+            elapsed = time.perf_counter() - start
+        per_login_ms = elapsed * 1000 / len(emails)
+        per_login_queries = len(queries) / len(emails)
+        self.stdout.write(
+            f"{label:<8} {per_login_ms:8.2f} ms/login "
+            f"{per_login_queries:6.1f} queries/login")
+        return per_login_ms
+
+    def handle(self, *args, **options):
+        logins = options["logins"]
+        self.stdout.write(self.style.NOTICE(f"Timing {logins} logins..."))
+        try:
+            with transaction.atomic():
+                emails = []
+                for index in range(logins):
+                    user = self.User.objects.create_user(
+                        email=f"bench_login_{index}@example.com",
+                        password=self.password,
+                        user_role=self.User.UserRoles.GUARDIAN,
+                        is_active=True,
+                        is_verified=True)
+                    emails.append(user.email)
+                before = self._measure("before", self._legacy_login, emails)
+                after = self._measure("after", self._current_login, emails)
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(f"Login cost reduced by {before - after:.2f} ms "
+                               f"({(1 - after / before) * 100:.0f}%)"))
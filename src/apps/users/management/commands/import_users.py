@@ -0,0 +1,46 @@
+from django.core.management import BaseCommand, CommandError
+
+from apps.users.services.importer import (UserImporter, read_rows,
+                                          detect_format, FORMATS)
+
+import time
+
+
+class Command(BaseCommand):
+    help = "bulk import users from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header) or JSONL file")
+        parser.add_argument("--format", choices=FORMATS,
+                            help="defaults to the file extension")
+        parser.add_argument("--workers", type=int,
+                            help="password hashing processes")
+        parser.add_argument("--chunk-size", type=int,
+                            help="rows validated and inserted at a time")
+        parser.add_argument("--verified", action="store_true",
+                            help="create verified, active accounts and "
+                            "send no verification emails")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        importer = UserImporter(workers=options["workers"],
+                                chunk_size=options["chunk_size"],
+                                verified=options["verified"])
+        self.stdout.write(
+            self.style.NOTICE(f"Importing {path} with {importer.workers} "
+                              "hashing workers..."))
+        start = time.perf_counter()
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                result = importer.run(read_rows(stream, fmt))
+        except OSError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - start
+        for error in result.errors:
+            self.stdout.write(
+                self.style.WARNING(f"line {error['line']}: {error['error']}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users, skipped {result.skipped} "
+                f"existing, {len(result.errors)} failed in {elapsed:.2f}s"))
@@ -1,5 +1,8 @@
 from django.core.management import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from apps.users.services.registration import bulk_registration
 
 from faker import Faker
 import random
@@ -13,12 +16,14 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.NOTICE("Starting Tasks..."))
         roles = getattr(self.User.UserRoles, "choices")
-        for _ in range(50):
-            role = random.choice(roles)
-            self.stdout.write(self.style.NOTICE(f"Creating user with role {role[0]}"))
-            self.User.objects.create_user(email=self.faker.email(safe=True),
-                                          first_name=self.faker.file_name(), last_name=self.faker.last_name(),
-                                          password=self.faker.password(length=6), is_active=True, is_verified=True,
-                                          user_role=role[0])
+        # seeded accounts are created verified, no codes or emails needed
+        with transaction.atomic(), bulk_registration(notify=False):
+            for _ in range(50):
+                role = random.choice(roles)
+                self.stdout.write(self.style.NOTICE(f"Creating user with role {role[0]}"))
+                self.User.objects.create_user(email=self.faker.email(safe=True),
+                                              first_name=self.faker.file_name(), last_name=self.faker.last_name(),
+                                              password=self.faker.password(length=6), is_active=True, is_verified=True,
+                                              user_role=role[0])
             
         self.stdout.write(self.style.SUCCESS("SuccessFully Populated user table"))
\ No newline at end of file
@@ -0,0 +1,121 @@
+from django.core.management import BaseCommand, CommandError
+from django.contrib.auth.hashers import (PBKDF2PasswordHasher,
+                                         ScryptPasswordHasher)
+
+from pathlib import Path
+import statistics
+import time
+
+PBKDF2_HASHER = "apps.users.hashers.TunedPBKDF2PasswordHasher"
+SCRYPT_HASHER = "apps.users.hashers.TunedScryptPasswordHasher"
+# kept after the preferred hasher so older hashes still verify
+FALLBACK_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+
+class Command(BaseCommand):
+    help = ("benchmark the password hashers on this machine and recommend "
+            "the cost that fits a target verification latency")
+    password = "tune_password_hashers"
+    salt = "tunepasswordsalt"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=float, default=250,
+                            help="verification latency budget per login")
+        parser.add_argument("--rounds", type=int, default=5,
+                            help="verifications timed per measurement")
+        parser.add_argument("--min-pbkdf2-iterations", type=int,
+                            default=600_000,
+                            help="never recommend fewer PBKDF2 iterations")
+        parser.add_argument("--min-scrypt-work-factor", type=int,
+                            default=2**14,
+                            help="never recommend a smaller scrypt work factor")
+        parser.add_argument("--max-scrypt-work-factor", type=int,
+                            default=2**17,
+                            help="upper bound, scrypt memory grows with it")
+        parser.add_argument("--env-file",
+                            help="write the recommended settings to this "
+                            "env file, replacing existing entries")
+
+    def _verify_ms(self, hasher, rounds):
+        encoded = hasher.encode(self.password, self.salt)
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            hasher.verify(self.password, encoded)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def _tune_pbkdf2(self, target_ms, rounds, floor):
+        hasher = PBKDF2PasswordHasher()
+        hasher.iterations = probe = 100_000
+        per_iteration = self._verify_ms(hasher, rounds) / probe
+        iterations = int(target_ms / per_iteration) // 10_000 * 10_000
+        hasher.iterations = max(iterations, floor)
+        return hasher.iterations, self._verify_ms(hasher, rounds)
+
+    def _tune_scrypt(self, target_ms, rounds, floor, ceiling):
+        hasher = ScryptPasswordHasher()
+        work_factor = floor
+        while True:
+            hasher.work_factor = work_factor
+            hasher.maxmem = 2 * 128 * hasher.block_size * (
+                work_factor + hasher.parallelism)
+            elapsed = self._verify_ms(hasher, rounds)
+            # cost doubles with the work factor
+            if work_factor * 2 > ceiling or elapsed * 2 > target_ms:
+                return work_factor, elapsed
+            work_factor *= 2
+
+    def _write_env(self, path, values):
+        path = Path(path)
+        lines = path.read_text().splitlines() if path.exists() else []
+        lines = [
+            line for line in lines
+            if line.split("=", 1)[0].strip() not in values
+        ]
+        lines.extend(f'{key}="{value}"' for key, value in values.items())
+        path.write_text("\n".join(lines) + "\n")
+
+    def handle(self, *args, **options):
+        target_ms = options["target_ms"]
+        rounds = options["rounds"]
+        if target_ms <= 0 or rounds <= 0:
+            raise CommandError("--target-ms and --rounds must be positive")
+        self.stdout.write(
+            self.style.NOTICE(f"Tuning for {target_ms:.0f} ms per login..."))
+
+        iterations, pbkdf2_ms = self._tune_pbkdf2(
+            target_ms, rounds, options["min_pbkdf2_iterations"])
+        work_factor, scrypt_ms = self._tune_scrypt(
+            target_ms, rounds, options["min_scrypt_work_factor"],
+            options["max_scrypt_work_factor"])
+        self.stdout.write(f"pbkdf2_sha256 {iterations:>10} iterations "
+                          f"{pbkdf2_ms:8.2f} ms/verify")
+        self.stdout.write(f"scrypt        {work_factor:>10} work factor "
+                          f"{scrypt_ms:8.2f} ms/verify")
+
+        # scrypt is memory hard, prefer it whenever its floor fits
+        if scrypt_ms <= target_ms:
+            preferred = [SCRYPT_HASHER, PBKDF2_HASHER]
+        else:
+            preferred = [PBKDF2_HASHER, SCRYPT_HASHER]
+        over_budget = min(pbkdf2_ms, scrypt_ms) > target_ms
+        if over_budget:
+            self.stdout.write(
+                self.style.WARNING("No hasher meets the budget at its "
+                                   "minimum cost, recommending the minimum"))
+        values = {
+            "PASSWORD_HASHERS": ",".join(preferred + FALLBACK_HASHERS),
+            "PASSWORD_PBKDF2_ITERATIONS": iterations,
+            "PASSWORD_SCRYPT_WORK_FACTOR": work_factor,
+        }
+        for key, value in values.items():
+            self.stdout.write(f'{key}="{value}"')
+        if options["env_file"]:
+            self._write_env(options["env_file"], values)
+            self.stdout.write(
+                self.style.SUCCESS(f"Wrote settings to {options['env_file']}"))
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:01
+
+from django.db import migrations, models
+from django.utils.crypto import salted_hmac
+
+
+def _digest(code):
+    # mirrors apps.users.services.helpers._hash_otp_code at the time of writing
+    return salted_hmac("apps.users.otp", code.strip(),
+                       algorithm="sha256").hexdigest()
+
+
+def rehash_codes(apps, schema_editor):
+    OneTimePassword = apps.get_model("users", "OneTimePassword")
+    PasswordReset = apps.get_model("users", "PasswordReset")
+    for otp in OneTimePassword.objects.only("pk", "raw_code").iterator():
+        OneTimePassword.objects.filter(pk=otp.pk).update(
+            hash_code=_digest(otp.raw_code))
+    for reset in PasswordReset.objects.only("pk", "raw_code").iterator():
+        PasswordReset.objects.filter(pk=reset.pk).update(
+            reset_code=_digest(reset.raw_code))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='onetimepassword',
+            name='unique_code_user',
+        ),
+        migrations.RemoveConstraint(
+            model_name='passwordreset',
+            name='unique_reset_code_user',
+        ),
+        migrations.RunPython(rehash_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='onetimepassword',
+            name='raw_code',
+        ),
+        migrations.RemoveField(
+            model_name='passwordreset',
+            name='raw_code',
+        ),
+        migrations.AddField(
+            model_name='onetimepassword',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='onetimepassword',
+            name='hash_code',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='passwordreset',
+            name='reset_code',
+            field=models.CharField(db_index=True, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='onetimepassword',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('hash_code',), name='unique_active_otp_code'),
+        ),
+        migrations.AddConstraint(
+            model_name='passwordreset',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('reset_code',), name='unique_active_reset_code'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_otp_hmac_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='tokens_valid_after',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
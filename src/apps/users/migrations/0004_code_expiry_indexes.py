@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_tokens_valid_after'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='onetimepassword',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='active_otp_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='onetimepassword',
+            index=models.Index(fields=['created_at'], name='otp_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordreset',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='active_reset_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordreset',
+            index=models.Index(fields=['created_at'], name='reset_created_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_code_expiry_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='passwordreset',
+            name='unique_reset_user_user',
+        ),
+        migrations.RemoveField(
+            model_name='passwordreset',
+            name='reset_token',
+        ),
+    ]
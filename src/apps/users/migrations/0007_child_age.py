@@ -0,0 +1,46 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+from apps.users.profiles.ages import age_on, next_birthday
+
+
+def backfill_ages(apps, schema_editor):
+    ChildProfile = apps.get_model("users", "ChildProfile")
+    children = list(
+        ChildProfile.objects.filter(date_of_birth__isnull=False).only(
+            "pk", "date_of_birth"))
+    for child in children:
+        child.age = age_on(child.date_of_birth)
+        child.age_updates_on = next_birthday(child.date_of_birth)
+    ChildProfile.objects.bulk_update(children, ["age", "age_updates_on"],
+                                     batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='childprofile',
+            name='age',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='childprofile',
+            name='age_updates_on',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='childprofile',
+            index=models.Index(fields=['age'], name='child_age_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='childprofile',
+            index=models.Index(fields=['age_updates_on'], name='child_age_updates_idx'),
+        ),
+        migrations.RunPython(backfill_ages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:33
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_child_age'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Interest',
+            fields=[
+                ('interest_id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('label', models.CharField(blank=True, max_length=200)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Interest topic',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='childinterest',
+            name='topic',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='child_interests', to='users.interest'),
+        ),
+        migrations.CreateModel(
+            name='InterestSynonym',
+            fields=[
+                ('synonym_id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('interest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='synonyms', to='users.interest')),
+            ],
+            options={
+                'verbose_name': 'Interest synonym',
+            },
+        ),
+    ]
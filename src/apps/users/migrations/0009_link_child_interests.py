@@ -0,0 +1,46 @@
+# Generated by Django 5.2.11 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+def _normalize(name):
+    # normalize_interest_name as of this migration
+    return " ".join((name or "").casefold().split())
+
+
+def link_child_interests(apps, schema_editor):
+    ChildInterest = apps.get_model("users", "ChildInterest")
+    Interest = apps.get_model("users", "Interest")
+    InterestSynonym = apps.get_model("users", "InterestSynonym")
+    topics = dict(
+        InterestSynonym.objects.filter(
+            interest__is_active=True).values_list("name", "interest_id"))
+    topics.update(
+        Interest.objects.filter(is_active=True).values_list(
+            "name", "interest_id"))
+    batch = []
+    for row in ChildInterest.objects.only("pk", "name").iterator(
+            chunk_size=1000):
+        row.name_key = _normalize(row.name)
+        row.topic_id = topics.get(row.name_key)
+        batch.append(row)
+        if len(batch) == 1000:
+            ChildInterest.objects.bulk_update(batch, ["name_key", "topic"])
+            batch = []
+    ChildInterest.objects.bulk_update(batch, ["name_key", "topic"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_interest_vocabulary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='childinterest',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, max_length=200),
+        ),
+        migrations.RunPython(link_child_interests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+# outbox rows of the removed buffer_email task hold whole email contexts,
+# plaintext codes and signed reset links included
+BUFFER_EMAIL_TASK = "apps.users.services.tasks.buffer_email"
+
+
+def purge_email_contexts(apps, schema_editor):
+    OutboxMessage = apps.get_model("users", "OutboxMessage")
+    OutboxMessage.objects.filter(task=BUFFER_EMAIL_TASK).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_user_import'),
+    ]
+
+    operations = [
+        migrations.RunPython(purge_email_contexts,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-10-18 14:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_purge_email_outbox'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='childprofile',
+            name='child_age_idx',
+        ),
+    ]
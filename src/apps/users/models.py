@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 
 from . import auth_models
+from .outbox import models as outbox_models
 
 import uuid
 
@@ -23,22 +24,29 @@ class OneTimePassword(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
-    raw_code = models.CharField(unique=True, max_length=20)
-    hash_code = models.CharField(max_length=200, unique=True)
+    # keyed HMAC-SHA256 digest of the code, see services.helpers._hash_otp_code
+    hash_code = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
 
     def __str__(self):
         return f"OneTimePassword({self.user.email}, {self.is_active})"
 
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["user", "hash_code"],
-                                    name="unique_code_user")
+            models.UniqueConstraint(fields=["hash_code"],
+                                    condition=models.Q(is_active=True),
+                                    name="unique_active_otp_code")
         ]
 
         indexes = [
             models.Index(fields=["hash_code"], name="hash_cde_idx"),
             models.Index(fields=["is_active", "is_used"],
-                         name='active_used_idx')
+                         name='active_used_idx'),
+            # expiry only ever looks at codes that are still active
+            models.Index(fields=["created_at"],
+                         condition=models.Q(is_active=True),
+                         name="active_otp_created_idx"),
+            models.Index(fields=["created_at"], name="otp_created_idx")
         ]
 
         verbose_name = "OneTimePassword"
@@ -50,12 +58,10 @@ class PasswordReset(models.Model):
                                 max_length=20,
                                 default=uuid.uuid4,
                                 unique=True)
-    reset_code = models.CharField(max_length=200,
+    reset_code = models.CharField(max_length=64,
                                   null=False,
                                   blank=False,
                                   db_index=True)
-    reset_token = models.URLField(null=True, blank=True, db_index=True)
-    raw_code = models.CharField(unique=True, max_length=20, db_index=True)
     user = models.ForeignKey(User,
                              on_delete=models.CASCADE,
                              related_name="reset_codes")
@@ -68,16 +74,62 @@ class PasswordReset(models.Model):
 
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["reset_code", "user"],
-                                    name="unique_reset_code_user"),
-            models.UniqueConstraint(fields=["reset_token", "user"],
-                                    name="unique_reset_user_user")
+            models.UniqueConstraint(fields=["reset_code"],
+                                    condition=models.Q(is_active=True),
+                                    name="unique_active_reset_code")
         ]
 
         indexes = [
             models.Index(fields=["is_active"], name="is_active_idx"),
             models.Index(fields=["is_active", "user", "reset_code"],
-                         name="active_codes_idx")
+                         name="active_codes_idx"),
+            models.Index(fields=["created_at"],
+                         condition=models.Q(is_active=True),
+                         name="active_reset_created_idx"),
+            models.Index(fields=["created_at"], name="reset_created_idx")
         ]
 
         verbose_name = "ResetPassword"
+
+
+class UserImport(models.Model):
+    """
+    A bulk user import uploaded by an admin, run by the ``run_user_import``
+    task. The upload is kept until the import has run.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    import_id = models.UUIDField(primary_key=True,
+                                 max_length=20,
+                                 default=uuid.uuid4,
+                                 unique=True)
+    admin = models.ForeignKey(User,
+                              on_delete=models.SET_NULL,
+                              null=True,
+                              related_name="user_imports")
+    file_name = models.CharField(max_length=255)
+    # services.importer.CSV or JSONL
+    file_format = models.CharField(max_length=10)
+    content = models.TextField(blank=True)
+    verified = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10,
+                              choices=Status.choices,
+                              default=Status.PENDING)
+    # ImportResult.as_dict once done
+    result = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"UserImport({self.file_name}, {self.status})"
+
+    class Meta:
+        verbose_name = "UserImport"
+        ordering = ["-created_at"]
@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task to run once the transaction that wrote it commits.
+
+    Rows are written in the same transaction as the change they belong to
+    and relayed to the broker by ``relay_outbox``, so a rolled back write
+    never sends anything and a slow broker never holds up a request.
+    """
+    # relayed in insertion order
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    # producers that may emit the same event twice set it, the second
+    # message is dropped
+    dedup_key = models.CharField(max_length=200,
+                                 null=True,
+                                 blank=True,
+                                 unique=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+    available_at = models.DateTimeField(default=timezone.now)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"OutboxMessage({self.task}, {self.dispatched_at})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["available_at", "id"],
+                         condition=models.Q(dispatched_at__isnull=True),
+                         name="outbox_pending_idx"),
+            models.Index(fields=["dispatched_at"],
+                         condition=models.Q(dispatched_at__isnull=False),
+                         name="outbox_dispatched_idx")
+        ]
+        verbose_name = "OutboxMessage"
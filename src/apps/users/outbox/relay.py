@@ -0,0 +1,123 @@
+from celery import current_app
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _task_name(task) -> str:
+    return task if isinstance(task, str) else task.name
+
+
+def enqueue(task, *args, dedup_key: str = None, **kwargs):
+    """
+    Record ``task(*args, **kwargs)`` in the outbox.
+
+    Call it inside the transaction of the change the task belongs to; it
+    is one insert and never talks to the broker. A message whose
+    ``dedup_key`` was already recorded is dropped.
+    """
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage(task=_task_name(task),
+                      args=list(args),
+                      kwargs=kwargs,
+                      dedup_key=dedup_key)
+    ],
+                                      ignore_conflicts=True)
+
+
+def _retry_at(attempts: int):
+    base = getattr(settings, "OUTBOX_RETRY_DELAY", 5)
+    return timezone.now() + timezone.timedelta(seconds=min(
+        base * 2**attempts, 60 * 60))
+
+
+def pending_lag() -> float:
+    """Seconds the oldest undispatched message has been waiting."""
+    oldest = OutboxMessage.objects.filter(
+        dispatched_at__isnull=True).aggregate(oldest=Min("created_at"))["oldest"]
+    if oldest is None:
+        return 0
+    return (timezone.now() - oldest).total_seconds()
+
+
+def _purge_dispatched() -> int:
+    retention = getattr(settings, "OUTBOX_RETENTION_HOURS", 24)
+    batch_size = getattr(settings, "OUTBOX_BATCH_SIZE", 500)
+    stale = list(
+        OutboxMessage.objects.filter(
+            dispatched_at__lt=timezone.now() -
+            timezone.timedelta(hours=retention)).values_list(
+                "pk", flat=True)[:batch_size])
+    if not stale:
+        return 0
+    return OutboxMessage.objects.filter(pk__in=stale).delete()[0]
+
+
+def relay_batch(batch_size: int = None) -> dict:
+    """
+    Hand one batch of due messages to Celery.
+
+    Rows are locked with ``SKIP LOCKED`` so several relays can run side by
+    side. A message is marked dispatched only after the broker accepted
+    it, if the relay dies in between it is sent again: delivery is at least
+    once and tasks fed through the outbox must be idempotent. Failed sends
+    are retried later with exponential backoff.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 500)
+    started = time.monotonic()
+    now = timezone.now()
+    dispatched, failed = [], []
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True).filter(
+                dispatched_at__isnull=True,
+                available_at__lte=now).order_by("available_at",
+                                                "id")[:batch_size])
+        for message in messages:
+            try:
+                current_app.signature(message.task,
+                                      args=message.args,
+                                      kwargs=message.kwargs).apply_async()
+            except Exception as exc:
+                logger.warning("Outbox message %s (%s) failed: %s",
+                               message.pk, message.task, exc)
+                message.attempts += 1
+                message.available_at = _retry_at(message.attempts)
+                message.last_error = str(exc)[:1000]
+                failed.append(message)
+            else:
+                dispatched.append(message.pk)
+        OutboxMessage.objects.filter(pk__in=dispatched).update(
+            dispatched_at=timezone.now())
+        OutboxMessage.objects.bulk_update(
+            failed, ["attempts", "available_at", "last_error"])
+    return {
+        "dispatched": len(dispatched),
+        "failed": len(failed),
+        "duration_ms": round((time.monotonic() - started) * 1000, 2),
+    }
+
+
+def relay_pending() -> dict:
+    """Drain everything that is due, then report the remaining lag."""
+    totals = {"dispatched": 0, "failed": 0, "duration_ms": 0}
+    max_batches = getattr(settings, "OUTBOX_MAX_BATCHES", 20)
+    for _ in range(max_batches):
+        stats = relay_batch()
+        for key, value in stats.items():
+            totals[key] += value
+        if stats["dispatched"] + stats["failed"] == 0:
+            break
+    totals["purged"] = _purge_dispatched()
+    totals["lag_seconds"] = round(pending_lag(), 3)
+    logger.info("Outbox relay: %s", totals)
+    return totals
@@ -0,0 +1,30 @@
+from django.utils import timezone
+
+import datetime
+
+
+def _birthday_in(date_of_birth: datetime.date, year: int) -> datetime.date:
+    try:
+        return date_of_birth.replace(year=year)
+    except ValueError:
+        # 29 February, celebrated on 1 March in common years
+        return datetime.date(year, 3, 1)
+
+
+def age_on(date_of_birth: datetime.date, today: datetime.date = None) -> int:
+    """ Completed years on ``today``, to the day """
+    today = today or timezone.localdate()
+    age = today.year - date_of_birth.year
+    if today < _birthday_in(date_of_birth, today.year):
+        age -= 1
+    return age
+
+
+def next_birthday(date_of_birth: datetime.date,
+                  today: datetime.date = None) -> datetime.date:
+    """ The first birthday after ``today`` """
+    today = today or timezone.localdate()
+    birthday = _birthday_in(date_of_birth, today.year)
+    if birthday <= today:
+        birthday = _birthday_in(date_of_birth, today.year + 1)
+    return birthday
@@ -1,6 +1,8 @@
-from .models import Guardian, Instructor, ChildProfile
+from .models import (Guardian, Instructor, ChildProfile, ChildInterest,
+                     Certificates)
 
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch, Q
 from django.utils.translation import gettext_lazy as _
 from django.db import transaction
 
@@ -37,3 +39,38 @@ def child_in_guardian_account(user: User,
     if child_profile in children.all():
         return True, child_profile
     return False, child_profile
+
+
+def _profile_prefetches():
+    """ Children with their interests and certificates, active ones only """
+    interests = ChildInterest.objects.filter(is_active=True,
+                                             is_deleted=False)
+    children = ChildProfile.objects.filter(
+        is_active=True, is_deleted=False).prefetch_related(
+            Prefetch("interest", queryset=interests))
+    certificates = Certificates.objects.filter(is_active=True)
+    return (Prefetch("children", queryset=children),
+            Prefetch("profile__certificates", queryset=certificates))
+
+
+def profile_users():
+    """ Users joined to both profile tables, ready to be serialized """
+    return User.objects.select_related(
+        "guardian", "profile").prefetch_related(*_profile_prefetches())
+
+
+ACTIVE_GUARDIAN = Q(guardian__is_active=True, guardian__is_deleted=False)
+ACTIVE_INSTRUCTOR = Q(profile__is_active=True)
+
+
+def directory_queryset():
+    """
+    Active guardians and instructors as one stream of users.
+
+    Profiles come in through the join and children, their interests and
+    certificates through one prefetch each, so a page costs the same
+    number of queries whatever its size.
+    """
+    return profile_users().filter(
+        Q(ACTIVE_GUARDIAN, user_role=User.UserRoles.GUARDIAN)
+        | Q(ACTIVE_INSTRUCTOR, user_role=User.UserRoles.INSTRUCTOR))
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
+from .ages import age_on, next_birthday
+
 import uuid
 
 User = get_user_model()
@@ -59,6 +61,10 @@ class ChildProfile(models.Model):
                               default=None,
                               blank=True)
     date_of_birth = models.DateField(null=False, blank=True)
+    # derived from date_of_birth, kept current by refresh_child_ages on the
+    # day in age_updates_on so age gates are plain indexed comparisons
+    age = models.PositiveSmallIntegerField(null=True, blank=True)
+    age_updates_on = models.DateField(null=True, blank=True)
 
     first_name = models.CharField(max_length=200, blank=True)
     last_name = models.CharField(max_length=200, blank=True)
@@ -73,6 +79,25 @@ class ChildProfile(models.Model):
     def __str__(self):
         return f" ChildProfile({self.child_id}, {self.guardian.pk})"
 
+    def refresh_age(self, today=None):
+        date_of_birth = self._meta.get_field("date_of_birth").to_python(
+            self.date_of_birth)
+        if date_of_birth is None:
+            self.age = self.age_updates_on = None
+            return
+        self.age = age_on(date_of_birth, today)
+        self.age_updates_on = next_birthday(date_of_birth, today)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "date_of_birth" in update_fields:
+            self.refresh_age()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields, "age", "age_updates_on"
+                }
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Profile")
         verbose_name_plural = _("Profiles")
@@ -83,12 +108,97 @@ class ChildProfile(models.Model):
         ]
         indexes = [
             models.Index(fields=["child_id"], name="id_idx"),
-            models.Index(fields=["is_active", "is_deleted"], name="active_idx")
+            models.Index(fields=["is_active", "is_deleted"], name="active_idx"),
+            models.Index(fields=["age_updates_on"], name="child_age_updates_idx")
         ]
 
         ordering = ("-created_at", )
 
 
+def normalize_interest_name(name: str) -> str:
+    """ The lookup form of an interest: case folded, single spaced """
+    return " ".join((name or "").casefold().split())
+
+
+class InterestQuerySet(models.QuerySet):
+
+    def resolve(self, name: str):
+        """ The active interest called ``name`` or one of its synonyms """
+        name = normalize_interest_name(name)
+        if not name:
+            return None
+        return self.filter(
+            models.Q(name=name) | models.Q(synonyms__name=name),
+            is_active=True).first()
+
+
+class Interest(models.Model):
+    """ An entry of the interest vocabulary children pick from """
+    interest_id = models.UUIDField(primary_key=True,
+                                   unique=True,
+                                   max_length=20,
+                                   default=uuid.uuid4)
+    # normalized, see normalize_interest_name
+    name = models.CharField(max_length=200, unique=True)
+    label = models.CharField(max_length=200, blank=True)
+
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = InterestQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Interest({self.name})"
+
+    def save(self, *args, **kwargs):
+        self.label = self.label or self.name.strip()
+        self.name = normalize_interest_name(self.name)
+        super().save(*args, **kwargs)
+        self.link_child_interests()
+
+    def link_child_interests(self, names=None) -> int:
+        """
+        Point the child interests called ``names``, by default this
+        interest's name and synonyms, at it. While it is inactive the
+        child interests it holds are unlinked instead.
+        """
+        if not self.is_active:
+            return ChildInterest.objects.filter(topic=self).update(topic=None)
+        if names is None:
+            names = [self.name, *self.synonyms.values_list("name", flat=True)]
+        return ChildInterest.objects.filter(name_key__in=names).exclude(
+            topic=self).update(topic=self)
+
+    class Meta:
+        verbose_name = _("Interest topic")
+        ordering = ("name", )
+
+
+class InterestSynonym(models.Model):
+    synonym_id = models.UUIDField(primary_key=True,
+                                  unique=True,
+                                  max_length=20,
+                                  default=uuid.uuid4)
+    interest = models.ForeignKey(Interest,
+                                 on_delete=models.CASCADE,
+                                 related_name="synonyms")
+    # normalized, see normalize_interest_name
+    name = models.CharField(max_length=200, unique=True)
+
+    def __str__(self):
+        return f"InterestSynonym({self.name} -> {self.interest.name})"
+
+    def save(self, *args, **kwargs):
+        self.name = normalize_interest_name(self.name)
+        super().save(*args, **kwargs)
+        self.interest.link_child_interests([self.name])
+
+    class Meta:
+        verbose_name = _("Interest synonym")
+
+
 class ChildInterest(models.Model):
     interest_id = models.UUIDField(max_length=20,
                                    unique=True,
@@ -100,7 +210,15 @@ class ChildInterest(models.Model):
                               related_name="interest")
 
     name = models.CharField(max_length=200)
+    # ``name`` normalized, what a new vocabulary entry is matched on
+    name_key = models.CharField(max_length=200, blank=True, db_index=True)
     description = models.TextField(max_length=1000)
+    # the vocabulary entry ``name`` resolves to, if any
+    topic = models.ForeignKey(Interest,
+                              on_delete=models.SET_NULL,
+                              null=True,
+                              blank=True,
+                              related_name="child_interests")
 
     is_active = models.BooleanField(default=True, db_index=True)
     is_deleted = models.BooleanField(default=False, db_index=True)
@@ -111,6 +229,15 @@ class ChildInterest(models.Model):
     def __str__(self):
         return f"ChildInterest({self.child.pk})"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "name" in update_fields:
+            self.name_key = normalize_interest_name(self.name)
+            self.topic = Interest.objects.resolve(self.name)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "name_key", "topic"}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Interest")
         indexes = [
@@ -1,4 +1,5 @@
 from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
 
 
 class CustomProfilePagination(CursorPagination):
@@ -6,3 +7,19 @@ class CustomProfilePagination(CursorPagination):
     max_page_size = 5
     page_size_query_param: str = "page_size"
     ordering: str = "-created_at"
+
+
+class ProfileDirectoryPagination(CursorPagination):
+    """ Keyset pages over the profile directory, newest accounts first """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param: str = "page_size"
+    ordering = ("-created_at", "-user_id")
+
+    def get_paginated_response(self, data):
+        return Response({
+            "status": "success",
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "detail": data
+        })
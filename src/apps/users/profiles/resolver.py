@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from .helpers import profile_users, ACTIVE_GUARDIAN, ACTIVE_INSTRUCTOR
+from .models import Guardian, Instructor
+
+from typing import Optional, Union
+from uuid import UUID
+
+User = get_user_model()
+
+Profile = Union[Guardian, Instructor]
+
+
+def _active_profile(user, role) -> Optional[Profile]:
+    if role == User.UserRoles.GUARDIAN:
+        profile = getattr(user, "guardian", None)
+        if profile is not None and profile.is_active and not profile.is_deleted:
+            return profile
+    elif role == User.UserRoles.INSTRUCTOR:
+        profile = getattr(user, "profile", None)
+        if profile is not None and profile.is_active:
+            return profile
+    return None
+
+
+def resolve_profile(pk: Union[UUID, str]) -> Optional[Profile]:
+    """
+    The active guardian or instructor profile with primary key ``pk``.
+
+    Both profile tables are LEFT JOINed to their user, so the type and
+    the row come back from one query whichever table holds ``pk``; the
+    children or certificates the serializers need follow as prefetches.
+    """
+    user = profile_users().filter(
+        Q(ACTIVE_GUARDIAN, guardian__pk=pk)
+        | Q(ACTIVE_INSTRUCTOR, profile__pk=pk)).first()
+    if user is None:
+        return None
+    guardian = _active_profile(user, User.UserRoles.GUARDIAN)
+    if guardian is not None and str(guardian.pk) == str(pk):
+        return guardian
+    return _active_profile(user, User.UserRoles.INSTRUCTOR)
+
+
+def resolve_user_profile(user) -> Optional[Profile]:
+    """ The active profile matching ``user.user_role``, if any """
+    role = getattr(user, "user_role", None)
+    if role not in (User.UserRoles.GUARDIAN, User.UserRoles.INSTRUCTOR):
+        return None
+    resolved = profile_users().filter(pk=user.pk).first()
+    if resolved is None:
+        return None
+    return _active_profile(resolved, role)
@@ -171,7 +171,9 @@ class ChildProfileCreateSerializer(serializers.ModelSerializer):
 
 
 class ChildReadSerializer(serializers.ModelSerializer):
-    interests = InterestSerializer(many=True, read_only=True)
+    interests = InterestSerializer(source="interest",
+                                   many=True,
+                                   read_only=True)
     guardian = UserReadSerializer()
 
     class Meta:
@@ -292,6 +294,20 @@ class InstructorSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ProfileDirectorySerializer(serializers.ModelSerializer):
+    """ A directory entry, the user with their guardian or instructor profile """
+    profile = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["user_id", "user_role", "created_at", "profile"]
+
+    def get_profile(self, obj):
+        if obj.user_role == User.UserRoles.GUARDIAN:
+            return GuardianProfileSerializer(obj.guardian).data
+        return InstructorSerializer(obj.profile).data
+
+
 class RoleSwitchSerializer(serializers.Serializer):
     allowed_roles = getattr(User, "ActiveProfile")
     role = serializers.ChoiceField(choices=allowed_roles, write_only=True)
@@ -1,8 +1,7 @@
-from typing import NoReturn
-
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework.exceptions import (ValidationError, PermissionDenied,
+                                       NotFound)
 from rest_framework.serializers import ListSerializer
 from rest_framework.response import Response
 from rest_framework.generics import RetrieveUpdateAPIView
@@ -17,44 +16,34 @@ from django.contrib.auth import get_user_model
 from .serializers import (OnboardSerializer, ChildProfileCreateSerializer,
                           GuardianProfileSerializer, InstructorSerializer,
                           ChildReadSerializer, InterestSerializer,
-                          CertificateSerializer, RoleSwitchSerializer)
+                          CertificateSerializer, RoleSwitchSerializer,
+                          ProfileDirectorySerializer)
 from ..helpers import _validate_serializer
 from .permissions import (IsGuardian, IsAdminOrInstructor, IsOwner,
                           ChildProfileOwner, ChildRole, IsInterestOwner,
                           IsInstructor)
 from .models import Guardian, Instructor, ChildProfile, ChildInterest, Certificates
-from .paginate_profiles import CustomProfilePagination
-from .helpers import child_in_guardian_account
+from .paginate_profiles import (CustomProfilePagination,
+                                ProfileDirectoryPagination)
+from .helpers import child_in_guardian_account, directory_queryset
+from .resolver import resolve_profile, resolve_user_profile
 
 User = get_user_model()
 
 
+def _profile_serializer_class(profile):
+    if isinstance(profile, Instructor):
+        return InstructorSerializer
+    return GuardianProfileSerializer
+
+
 class ProfileManagementViewsets(viewsets.ModelViewSet):
     http_method_names: list[str] = ["patch", "get", "post"]
     pagination_class = CustomProfilePagination
 
     def get_queryset(self):
-        pk = self.kwargs.get("pk")
-        queryset = None
-        if pk:
-            guardian_queryset = Guardian.objects.select_for_update("user")\
-                .filter(pk=pk, is_active=True, is_deleted=False)
-            if guardian_queryset:
-                return guardian_queryset
-
-            else:
-                instructor_queryset = Instructor.objects.select_related("user")\
-                            .prefetch_related("certificates")\
-                            .filter(pk=pk, is_active=True)
-                if instructor_queryset:
-                    return instructor_queryset
-
-            if instructor_queryset is None or guardian_queryset is None:
-                return Response({"status": "failed", "detail": "No profile is associated to this account"}, \
-                                status=status.HTTP_404_NOT_FOUND)
-
         super_user = getattr(self.request.user, "is_superuser")
-        if super_user or self.reqeust.user.user_role == User.UserRoles.INSTRUCTOR:
+        if super_user or self.request.user.user_role == User.UserRoles.INSTRUCTOR:
             guardian = Guardian.objects.select_related("user").filter(
                 is_active=True)
             instructor = Instructor.objects.select_related("user") \
@@ -101,42 +90,45 @@ class ProfileManagementViewsets(viewsets.ModelViewSet):
                              "instructor_data": instructor_serialzer.data}, \
                                 status=status.HTTP_200_OK)
 
-    def retrieve(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        profile = queryset.first()
+    def get_object(self):
+        profile = resolve_profile(self.kwargs.get("pk"))
         if profile is None:
+            raise NotFound("No profile is associated to this account")
+        self.check_object_permissions(self.request, profile)
+        return profile
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            profile = self.get_object()
+        except NotFound:
             return Response({"status": "failed", "detail": "No query found"},\
                             status=status.HTTP_404_NOT_FOUND)
-        user_role = getattr(profile.user, "user_role")
-        if user_role == User.UserRoles.GUARDIAN:
-            serializer = GuardianProfileSerializer(profile)
-            return Response({
-                "status": "success",
-                "detail": serializer.data
-            },
-                            status=status.HTTP_200_OK)
-        elif user_role == User.UserRoles.INSTRUCTOR:
-            serializer = InstructorSerializer(profile)
-            return Response({
-                "status": "success",
-                "detail": serializer.data
-            },
-                            status=status.HTTP_200_OK)
+        serializer = _profile_serializer_class(profile)(profile)
         return Response({
-            "status": "failed",
-            "messagae": "invalid profile"
+            "status": "success",
+            "detail": serializer.data
         },
-                        status=status.HTTP_400_BAD_REQUEST)
+                        status=status.HTTP_200_OK)
 
     def get_permissions(self):
         if self.action in ("put", "patch"):
             return [IsOwner()]
         if self.action in ("child_onboard", "role_switch"):
             return [IsGuardian()]
-        if self.action == "list":
+        if self.action in ("list", "directory"):
             return [IsAdminOrInstructor()]
         return [permissions.IsAuthenticated()]
 
+    @action(methods=["get"],
+            detail=False,
+            url_path="directory",
+            pagination_class=ProfileDirectoryPagination)
+    def directory(self, request, *args, **kwargs) -> Response:
+        """ Guardians and instructors in one keyset paginated listing """
+        page = self.paginate_queryset(directory_queryset())
+        serializer = ProfileDirectorySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @method_decorator(transaction.atomic)
     @action(methods=["post"], detail=False, url_path="onboard")
     def onboard(self, request, *args, **kwargs) -> Response:
@@ -188,37 +180,10 @@ class ProfileRetrieveAPIView(RetrieveUpdateAPIView):
     permission_classes = [IsOwner]
 
     def get_object(self):
-        user = self.request.user
-        user_role = getattr(user, "user_role", None)
-        if user_role == User.UserRoles.GUARDIAN:
-            try:
-                obj = Guardian.objects.get(user=user, is_active=True)
-                self.check_object_permissions(self.request, obj=obj)
-            except Guardian.DoesNotExist:
-                return None
-            return obj
-        elif user_role == User.UserRoles.INSTRUCTOR:
-            try:
-                obj = Instructor.objects.get(user=user, is_active=True)
-                self.check_object_permissions(self.request, obj)
-            except Instructor.DoesNotExist:
-                return None
-            return obj
-        return None
-
-    def get_queryset(self):
-        user = self.request.user
-        user_role = getattr(user, "user_role", None)
-        if user_role == User.UserRoles.INSTRUCTOR:
-            return Instructor.objects.select_related("user")\
-                .prefetch_related("certificates")\
-                .filter(user=user, is_active=True)
-
-        elif user_role == User.UserRoles.GUARDIAN:
-            return Guardian.objects.select_related("user")\
-                .filter(user=user, is_active=True, is_deleted=False)
-
-        return Instructor.objects.none()
+        profile = resolve_user_profile(self.request.user)
+        if profile is not None:
+            self.check_object_permissions(self.request, profile)
+        return profile
 
     def get_serializer_class(self):
         user_role = getattr(self.request.user, "user_role", None)
@@ -231,16 +196,15 @@ class ProfileRetrieveAPIView(RetrieveUpdateAPIView):
         return None
 
     def retrieve(self, request, *args, **kwargs) -> Response:
-        queryset = self.filter_queryset(self.get_queryset())
-        if queryset is None:
+        profile = self.get_object()
+        if profile is None:
             return Response(
                 {
                     "status": "error",
                     "detail": "No user profile found"
                 },
                 status=status.HTTP_404_NOT_FOUND)
-        profile = queryset.first()
-        serializer: NoReturn = self.get_serializer(profile)
+        serializer = _profile_serializer_class(profile)(profile)
         return Response({
             "status": "success",
             "detail": serializer.data
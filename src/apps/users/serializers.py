@@ -6,7 +6,9 @@ from django.db import transaction
 
 from .helpers import (_validate_email, _check_email_already_exists,
                       _normalize_and_validate_password, _get_user_by_email,
-                      _get_code, _get_reset_code_or_none)
+                      _get_code, _get_reset_code_or_none,
+                      _schedule_deliverability_check)
+from .services import deliverability
 from .services.helpers import _hash_otp_code
 
 import email_validator
@@ -45,7 +47,11 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value: str):
         email = value.strip()
-        valid_email = _validate_email(email)
+        try:
+            valid_email = _validate_email(email,
+                                          policy=deliverability.CACHED)
+        except email_validator.EmailNotValidError as exc:
+            raise serializers.ValidationError(str(exc))
         if not valid_email.get("success"):
             raise email_validator.EmailNotValidError()
         user = _check_email_already_exists(valid_email.get("valid_email"))
@@ -67,6 +73,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         try:
             with transaction.atomic():
                 user = User.objects.create_user(**validated_data)
+                _schedule_deliverability_check(user.email)
             logger.info("A new user instance is created %s", user.email)
             return user
         except Exception:
@@ -103,11 +110,7 @@ class UserVerificationSerializer(serializers.Serializer):
         one_time_password = _get_code(code, user)
         if user is None or one_time_password is None:
             raise serializers.ValidationError(
-                _("Invalid code or email provided"))
-
-        if not one_time_password.is_active or one_time_password.is_used:
-            raise serializers.ValidationError(
-                "Password already expired or used. Request another one")
+                _("Invalid, expired or used code provided"))
         return attrs
 
 
@@ -204,3 +207,14 @@ class UserReadSerializer(serializers.ModelSerializer):
             "is_active",
             "account_status",
         ]
+
+
+class UserImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    verified = serializers.BooleanField(default=False)
+
+    def validate_file(self, value):
+        if not value.name.lower().endswith((".csv", ".jsonl", ".ndjson")):
+            raise serializers.ValidationError(
+                _("upload a .csv or .jsonl file"))
+        return value
@@ -0,0 +1,311 @@
+from rest_framework.exceptions import ValidationError
+
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth import get_user_model
+from django.db import transaction, IntegrityError
+from django.db.models import F, Case, When
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+
+from .helpers import (_hash_otp_code, _generate_code, _generate_unique_otp,
+                      verify_otp)
+from ..models import OneTimePassword, PasswordReset
+
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+DEFAULT_CODE_STORE = "apps.users.services.code_store.DatabaseCodeStore"
+OTP = "otp"
+RESET = "reset"
+
+
+def _code_life_seconds() -> int:
+    return int(getattr(settings, "OTP_LIFE", 10)) * 60
+
+
+def _max_attempts() -> int:
+    return getattr(settings, "OTP_MAX_ATTEMPTS", 5)
+
+
+class StoredCode:
+    """
+    A live verification or reset code as returned by a code store.
+
+    Stores only hand these out for codes that are still active and unused,
+    ``user`` is loaded on first access when the backend only knows the id.
+    """
+
+    def __init__(self, kind, digest, user_id, pk=None, user=None):
+        self.kind = kind
+        self.digest = digest
+        self.user_id = User._meta.pk.to_python(user_id)
+        self.pk = pk
+        self._user = user
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = User.objects.filter(pk=self.user_id).first()
+        return self._user
+
+    def __repr__(self):
+        return f"StoredCode({self.kind}, {self.user_id})"
+
+
+class BaseCodeStore:
+    # whether expired codes linger until the beat tasks deactivate them
+    requires_sweep = False
+
+    def issue_otp(self, user) -> str:
+        raise NotImplementedError
+
+    def find_otp(self, code: str, user=None) -> Optional[StoredCode]:
+        raise NotImplementedError
+
+    def consume_otp(self, stored: StoredCode) -> bool:
+        raise NotImplementedError
+
+    def revoke_otp(self, user):
+        """Deactivate the code ``user`` may still hold, used or not."""
+        raise NotImplementedError
+
+    def issue_reset(self, user) -> str:
+        raise NotImplementedError
+
+    def find_reset(self, code: str) -> Optional[StoredCode]:
+        raise NotImplementedError
+
+    def consume_reset(self, stored: StoredCode) -> bool:
+        raise NotImplementedError
+
+    def revoke_reset(self, user):
+        raise NotImplementedError
+
+
+class DatabaseCodeStore(BaseCodeStore):
+    """Codes kept in OneTimePassword/PasswordReset rows, expired by beat."""
+
+    requires_sweep = True
+
+    def _otp(self, row):
+        return StoredCode(OTP, row.hash_code, row.user_id, pk=row.pk,
+                          user=row.user)
+
+    def _reset(self, row):
+        return StoredCode(RESET, row.reset_code, row.user_id, pk=row.pk,
+                          user=row.user)
+
+    def issue_otp(self, user) -> str:
+        code, hash_code = _generate_unique_otp()
+        try:
+            with transaction.atomic():
+                # a freshly issued code supersedes any code still outstanding
+                OneTimePassword.objects.filter(
+                    user=user, is_active=True).update(is_active=False)
+                OneTimePassword.objects.create(user=user, hash_code=hash_code)
+        except IntegrityError as exc:
+            logger.error("Database error while creating OTP for user %s",
+                         user.pk,
+                         exc_info=True)
+            raise ValidationError(
+                "Database error while creating OTP.") from exc
+        return code
+
+    def find_otp(self, code: str, user=None) -> Optional[StoredCode]:
+        if user is None:
+            row = OneTimePassword.objects.select_related("user").filter(
+                hash_code=_hash_otp_code(code), is_active=True).first()
+            return self._otp(row) if row else None
+        row = OneTimePassword.objects.filter(user=user,
+                                             is_active=True).first()
+        if row is None:
+            return None
+        if verify_otp(code, row.hash_code):
+            row.user = user
+            return self._otp(row)
+        OneTimePassword.objects.filter(pk=row.pk).update(
+            attempts=F("attempts") + 1,
+            is_active=Case(When(attempts__gte=_max_attempts() - 1,
+                                then=False),
+                           default=F("is_active")))
+        return None
+
+    def consume_otp(self, stored: StoredCode) -> bool:
+        return OneTimePassword.objects.filter(
+            pk=stored.pk, is_active=True).update(is_active=False,
+                                                 is_used=True) == 1
+
+    def revoke_otp(self, user):
+        OneTimePassword.objects.filter(user=user,
+                                       is_active=True).update(is_active=False)
+
+    def issue_reset(self, user) -> str:
+        code, hash_code = _generate_unique_otp()
+        with transaction.atomic():
+            PasswordReset.objects.filter(user=user, is_active=True).update(
+                is_active=False)
+            PasswordReset.objects.create(user=user, reset_code=hash_code)
+        return code
+
+    def find_reset(self, code: str) -> Optional[StoredCode]:
+        row = PasswordReset.objects.select_related("user").filter(
+            reset_code=_hash_otp_code(code), is_active=True).first()
+        return self._reset(row) if row else None
+
+    def consume_reset(self, stored: StoredCode) -> bool:
+        return PasswordReset.objects.filter(
+            pk=stored.pk, is_active=True).update(is_active=False) == 1
+
+    def revoke_reset(self, user):
+        PasswordReset.objects.filter(user=user,
+                                     is_active=True).update(is_active=False)
+
+
+class RedisCodeStore(BaseCodeStore):
+    """
+    Codes kept as cache keys that expire on their own after ``OTP_LIFE``.
+
+    Uniqueness relies on ``cache.add`` (SET NX) and consuming a code on
+    ``cache.delete`` reporting whether the key existed, so a code can only
+    ever be redeemed once. Meant for the Redis cache configured in
+    ``USER_CODE_STORE_CACHE``; no database rows and no beat sweep.
+    """
+
+    prefix = "codes"
+
+    @property
+    def cache(self):
+        # resolved per call, cache connections are thread local
+        return caches[getattr(settings, "USER_CODE_STORE_CACHE", "default")]
+
+    def _key(self, *parts) -> str:
+        return ":".join((self.prefix, ) + tuple(str(part) for part in parts))
+
+    def _generate_unique(self, user, kind=OTP) -> tuple:
+        other = RESET if kind == OTP else OTP
+        for attempt in range(getattr(settings, "MAX_RETRY", 4)):
+            code = _generate_code()
+            digest = _hash_otp_code(code)
+            if self.cache.get(self._key(other, "code", digest)) is not None:
+                continue
+            if self.cache.add(self._key(kind, "code", digest),
+                              str(user.pk),
+                              timeout=_code_life_seconds()):
+                return code, digest
+        logger.warning(_("OTP Already Exists!"))
+        raise ValidationError(_("Failed. OTP already exists"))
+
+    def issue_otp(self, user) -> str:
+        code, digest = self._generate_unique(user)
+        user_key = self._key(OTP, "user", user.pk)
+        previous = self.cache.get(user_key)
+        if previous is not None:
+            self.cache.delete_many([
+                self._key(OTP, "code", previous),
+                self._key(OTP, "attempts", previous)
+            ])
+        self.cache.set(user_key, digest, timeout=_code_life_seconds())
+        return code
+
+    def find_otp(self, code: str, user=None) -> Optional[StoredCode]:
+        if user is None:
+            digest = _hash_otp_code(code)
+            user_id = self.cache.get(self._key(OTP, "code", digest))
+            if user_id is None:
+                return None
+            return StoredCode(OTP, digest, user_id)
+        digest = self.cache.get(self._key(OTP, "user", user.pk))
+        if digest is None:
+            return None
+        if verify_otp(code, digest):
+            if self.cache.get(self._key(OTP, "code", digest)) is None:
+                return None
+            return StoredCode(OTP, digest, user.pk, user=user)
+        self._register_failed_attempt(user, digest)
+        return None
+
+    def _register_failed_attempt(self, user, digest: str):
+        attempts_key = self._key(OTP, "attempts", digest)
+        self.cache.add(attempts_key, 0, timeout=_code_life_seconds())
+        try:
+            attempts = self.cache.incr(attempts_key)
+        except ValueError:
+            # the key expired between add and incr, so did the code
+            return
+        if attempts >= _max_attempts():
+            self.cache.delete_many([
+                self._key(OTP, "code", digest),
+                self._key(OTP, "user", user.pk), attempts_key
+            ])
+
+    def consume_otp(self, stored: StoredCode) -> bool:
+        if not self.cache.delete(self._key(OTP, "code", stored.digest)):
+            return False
+        self.cache.delete_many([
+            self._key(OTP, "user", stored.user_id),
+            self._key(OTP, "attempts", stored.digest)
+        ])
+        return True
+
+    def revoke_otp(self, user):
+        digest = self.cache.get(self._key(OTP, "user", user.pk))
+        if digest is not None:
+            self.consume_otp(StoredCode(OTP, digest, user.pk))
+
+    def issue_reset(self, user) -> str:
+        user_key = self._key(RESET, "user", user.pk)
+        previous = self.cache.get(user_key)
+        if previous is not None:
+            self.consume_reset(StoredCode(RESET, previous, user.pk))
+        code, digest = self._generate_unique(user, kind=RESET)
+        self.cache.set(user_key, digest, timeout=_code_life_seconds())
+        return code
+
+    def find_reset(self, code: str) -> Optional[StoredCode]:
+        digest = _hash_otp_code(code)
+        user_id = self.cache.get(self._key(RESET, "code", digest))
+        if user_id is None:
+            return None
+        return StoredCode(RESET, digest, user_id)
+
+    def consume_reset(self, stored: StoredCode) -> bool:
+        consumed = self.cache.delete(self._key(RESET, "code", stored.digest))
+        self.cache.delete(self._key(RESET, "user", stored.user_id))
+        return consumed
+
+    def revoke_reset(self, user):
+        digest = self.cache.get(self._key(RESET, "user", user.pk))
+        if digest is not None:
+            self.consume_reset(StoredCode(RESET, digest, user.pk))
+
+
+_stores = {}
+
+
+def get_code_store() -> BaseCodeStore:
+    path = getattr(settings, "USER_CODE_STORE", DEFAULT_CODE_STORE)
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = import_string(path)()
+    return store
+
+
+def create_otp_for_user(user):
+    if not isinstance(user, User):
+        raise ValidationError(_("'user' is not a valid 'User' Instance"))
+    code = get_code_store().issue_otp(user)
+    logger.info("successfully created and saved OTP for user %s", user.pk)
+    return code
+
+
+def create_password_reset_for_user(user: User):
+    """Issue a fresh password reset code for ``user`` and return it."""
+    if user is None:
+        return
+    code = get_code_store().issue_reset(user)
+    logger.debug("Successfully Created And Password Reset for User")
+    return code
@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from email_validator.deliverability import validate_email_deliverability
+from email_validator import EmailUndeliverableError
+
+from collections import OrderedDict
+from typing import Optional
+import dns.resolver
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+SYNTAX_ONLY = "syntax"
+CACHED = "cached"
+FULL = "full"
+
+_CACHE_PREFIX = "email_domain"
+_local_cache: "OrderedDict[str, tuple[bool, float]]" = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _cache_key(domain: str) -> str:
+    return f"{_CACHE_PREFIX}:{domain}"
+
+
+def _positive_ttl() -> int:
+    return getattr(settings, "EMAIL_DOMAIN_CACHE_TTL", 60 * 60 * 24)
+
+
+def _negative_ttl() -> int:
+    return getattr(settings, "EMAIL_DOMAIN_NEGATIVE_TTL", 60 * 60)
+
+
+def _local_get(domain: str) -> Optional[bool]:
+    with _local_lock:
+        entry = _local_cache.get(domain)
+        if entry is None:
+            return None
+        deliverable, expires_at = entry
+        if expires_at <= time.monotonic():
+            del _local_cache[domain]
+            return None
+        _local_cache.move_to_end(domain)
+        return deliverable
+
+
+def _local_set(domain: str, deliverable: bool, ttl: int):
+    max_size = getattr(settings, "EMAIL_DOMAIN_LOCAL_CACHE_SIZE", 1024)
+    with _local_lock:
+        _local_cache[domain] = (deliverable, time.monotonic() + ttl)
+        _local_cache.move_to_end(domain)
+        while len(_local_cache) > max_size:
+            _local_cache.popitem(last=False)
+
+
+def _remember(domain: str, deliverable: bool):
+    ttl = _positive_ttl() if deliverable else _negative_ttl()
+    _local_set(domain, deliverable, ttl)
+    try:
+        cache.set(_cache_key(domain), deliverable, timeout=ttl)
+    except Exception:
+        logger.warning("Could not store deliverability of %s in the cache",
+                       domain)
+
+
+def _is_definitive(exc: EmailUndeliverableError) -> bool:
+    # email_validator raises the same error for a domain that does not
+    # exist or has no mail records as for any resolver failure it did not
+    # expect, only the first is an answer about the domain
+    return exc.__cause__ is None or isinstance(
+        exc.__cause__, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer))
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local_cache.clear()
+
+
+def get_cached_deliverability(domain: str) -> Optional[bool]:
+    """
+    Return the cached deliverability of ``domain`` without touching DNS.
+
+    ``True``/``False`` when the domain was checked within its TTL, ``None``
+    when nothing is known about it yet.
+    """
+    domain = domain.lower()
+    deliverable = _local_get(domain)
+    if deliverable is not None:
+        return deliverable
+    try:
+        deliverable = cache.get(_cache_key(domain))
+    except Exception:
+        logger.warning("Could not read deliverability of %s from the cache",
+                       domain)
+        return None
+    if deliverable is not None:
+        # the shared cache does not expose the remaining TTL, keep the
+        # process copy for the shorter of the two lifetimes
+        _local_set(domain, deliverable, _negative_ttl())
+    return deliverable
+
+
+def check_domain_deliverability(domain: str) -> Optional[bool]:
+    """
+    Resolve the MX records of ``domain`` and cache the outcome.
+
+    Undeliverable domains, that do not exist or take no mail, are cached
+    for ``EMAIL_DOMAIN_NEGATIVE_TTL``. Resolver timeouts and any other
+    resolver failure return ``None`` and are not cached so a flaky
+    resolver never blacklists a real domain.
+    """
+    domain = domain.lower()
+    cached = get_cached_deliverability(domain)
+    if cached is not None:
+        return cached
+    try:
+        info = validate_email_deliverability(
+            domain,
+            domain,
+            timeout=getattr(settings, "EMAIL_DNS_TIMEOUT", 5))
+    except EmailUndeliverableError as exc:
+        if not _is_definitive(exc):
+            logger.warning("Deliverability of %s unknown: %s", domain, exc)
+            return None
+        logger.info("Email domain %s is not deliverable", domain)
+        _remember(domain, False)
+        return False
+    if info.get("unknown-deliverability"):
+        logger.warning("Deliverability of %s unknown: %s", domain,
+                       info["unknown-deliverability"])
+        return None
+    _remember(domain, True)
+    return True
@@ -0,0 +1,213 @@
+from sendgrid.helpers.mail import (Mail, From, To, Content, Personalization,
+                                   Substitution)
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils.html import escape
+
+from .email_service import get_email_client, SENDGRID_SENDER, APP_NAME
+from .email_render import render_email
+
+from collections import defaultdict
+from contextlib import suppress
+import logging
+import json
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "email_batch:buffer"
+SCHEDULED_KEY = "email_batch:scheduled"
+# SendGrid accepts at most 1000 personalizations per request
+MAX_PERSONALIZATIONS = 1000
+# context keys that never vary per recipient or are not rendered
+_ENVELOPE_KEYS = frozenset({"to_email", "template_name"})
+
+
+def _cache():
+    return caches[getattr(settings, "EMAIL_BATCH_CACHE", "default")]
+
+
+class RedisEmailBuffer:
+    """Messages kept in a Redis list shared by every web and worker process."""
+
+    def _client(self):
+        cache = _cache()
+        key = cache.make_and_validate_key(BUFFER_KEY)
+        return cache._cache.get_client(key, write=True), key
+
+    def push(self, context: dict):
+        client, key = self._client()
+        client.rpush(key, json.dumps(context))
+
+    def pop_batch(self, size: int) -> list:
+        client, key = self._client()
+        return [json.loads(raw) for raw in client.lpop(key, size) or []]
+
+    def __len__(self):
+        client, key = self._client()
+        return client.llen(key)
+
+
+def get_email_buffer():
+    """
+    The shared buffer, ``None`` when the batching cache is not Redis.
+
+    A buffer in any other cache would live in one process's memory, out of
+    reach of the worker that flushes it.
+    """
+    if isinstance(_cache(), RedisCache):
+        return RedisEmailBuffer()
+    return None
+
+
+def _window() -> float:
+    return getattr(settings, "EMAIL_BATCH_WINDOW", 2)
+
+
+def schedule_flush():
+    # tasks imports this module
+    from .tasks import flush_email_batch
+    cache = _cache()
+    try:
+        # only the first message of a window schedules the flush
+        if cache.add(SCHEDULED_KEY, 1, timeout=max(1, int(_window()) * 2)):
+            flush_email_batch.apply_async(countdown=_window())
+    except Exception:
+        # the message is buffered already, the next one schedules again and
+        # the beat flush sends it meanwhile
+        logger.exception("Could not schedule the email batch flush")
+        with suppress(Exception):
+            cache.delete(SCHEDULED_KEY)
+
+
+def _send_individually(contexts: list):
+    # tasks imports this module
+    from .tasks import send_email_on_quene
+    for context in contexts:
+        send_email_on_quene.delay(context)
+
+
+def queue_email(context: dict):
+    """
+    Buffer an email for the next batched dispatch.
+
+    Messages queued within ``EMAIL_BATCH_WINDOW`` seconds are sent
+    together by ``flush_email_batch``. Without a shared buffer, or if it
+    cannot be reached, the email goes out on its own task.
+    """
+    context = dict(context)
+    buffer = get_email_buffer()
+    if buffer is None:
+        _send_individually([context])
+        return
+    try:
+        buffer.push(context)
+    except Exception:
+        logger.exception("Email buffer unavailable, sending %s on its own",
+                         context.get("to_email"))
+        _send_individually([context])
+        return
+    schedule_flush()
+
+
+def _marker(key: str) -> str:
+    return f"%{key}%"
+
+
+def _group_key(context: dict) -> tuple:
+    # messages share a request when they render the same template and only
+    # differ in values that are equally truthy, so `default`/`if` in the
+    # template take the same branch for all of them
+    return (context.get("template_name"),
+            tuple(sorted((key, bool(value)) for key, value in context.items()
+                         if key not in _ENVELOPE_KEYS)))
+
+
+def _varying_keys(contexts: list) -> set:
+    first = contexts[0]
+    return {
+        key
+        for key in first
+        if key not in _ENVELOPE_KEYS and any(
+            context.get(key) != first[key] for context in contexts[1:])
+    }
+
+
+def build_batch_payloads(contexts: list) -> list:
+    """
+    Group rendered emails into multi-recipient ``mail/send`` payloads.
+
+    Each group's template is rendered once with a marker in place of every
+    per-recipient value; the personalizations carry the escaped values as
+    substitutions. Returns ``(payload, contexts)`` pairs.
+    """
+    groups = defaultdict(list)
+    for context in contexts:
+        context.setdefault("app_name", APP_NAME)
+        groups[_group_key(context)].append(context)
+    payloads = []
+    for members in groups.values():
+        for start in range(0, len(members), MAX_PERSONALIZATIONS):
+            chunk = members[start:start + MAX_PERSONALIZATIONS]
+            varying = _varying_keys(chunk)
+            template_context = dict(chunk[0])
+            template_context.update({key: _marker(key) for key in varying})
+            html = render_email(template_context)
+            message = Mail()
+            message.from_email = From(email=SENDGRID_SENDER)
+            message.subject = template_context.get("subject")
+            message.add_content(Content("text/html", html))
+            for context in chunk:
+                personalization = Personalization()
+                personalization.add_to(To(email=context["to_email"]))
+                for key in varying:
+                    value = context.get(key)
+                    personalization.add_substitution(
+                        Substitution(
+                            _marker(key),
+                            escape("" if value is None else str(value))))
+                message.add_personalization(personalization)
+            payloads.append((message.get(), chunk))
+    return payloads
+
+
+def dispatch_batch(contexts: list) -> dict:
+    """
+    Send ``contexts`` in as few API calls as possible.
+
+    The buffer no longer holds them, so the members of a request that still
+    fails after the client's retries are handed to the per-message task.
+    """
+    sent = failed = calls = 0
+    client = get_email_client()
+    for payload, members in build_batch_payloads(contexts):
+        calls += 1
+        try:
+            client.send(payload)
+            sent += len(members)
+        except Exception:
+            failed += len(members)
+            logger.exception(
+                "Batched email to %s recipients failed, sending them one "
+                "by one", len(members))
+            _send_individually(members)
+    return {"sent": sent, "failed": failed, "calls": calls}
+
+
+def flush_buffer() -> dict:
+    """Drain the buffer, a bounded batch at a time."""
+    _cache().delete(SCHEDULED_KEY)
+    buffer = get_email_buffer()
+    totals = {"sent": 0, "failed": 0, "calls": 0}
+    if buffer is None:
+        return totals
+    batch_size = getattr(settings, "EMAIL_BATCH_MAX", 500)
+    while True:
+        contexts = buffer.pop_batch(batch_size)
+        if not contexts:
+            break
+        for key, value in dispatch_batch(contexts).items():
+            totals[key] += value
+    logger.info("Email batch flushed: %s", totals)
+    return totals
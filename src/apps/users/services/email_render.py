@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.template.loader import get_template
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+
+import threading
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# context keys that shape the layout and are the same for a whole burst,
+# they are baked into the cached fragments
+LAYOUT_KEYS = frozenset({"app_name", "year", "subject", "preheader"})
+# context keys that are never rendered
+_ENVELOPE_KEYS = frozenset({"to_email", "template_name"})
+# a marker that survives autoescaping and never shows up in real values
+_MARKER = "\x1e{}\x1e"
+
+
+def _render_value(value) -> str:
+    # what `{{ value }}` would output with autoescape on
+    return str(conditional_escape(localize(value)))
+
+
+class CompiledEmail:
+    """
+    An email template rendered once, split into static fragments.
+
+    The template is rendered with a marker in place of each per-message
+    value and cut at the markers, so rendering a message is a join of the
+    fragments with the escaped values. ``parts`` alternates fragments and
+    context keys: ``[html, key, html, key, ..., html]``.
+    """
+
+    def __init__(self, template_name: str, parts: list):
+        self.template_name = template_name
+        self.parts = parts
+
+    @classmethod
+    def compile(cls, template_name: str, context: dict, variables: list):
+        template = get_template(template_name)
+        marked = dict(context)
+        marked.update({key: _MARKER.format(key) for key in variables})
+        html = template.render(marked)
+        parts = html.split("\x1e")
+        # odd positions are the keys, anything else means a filter changed
+        # a marker and the output cannot be reassembled
+        if len(parts) % 2 == 0 or any(parts[index] not in variables
+                                      for index in range(1, len(parts), 2)):
+            return None
+        return cls(template_name, parts)
+
+    def render(self, context: dict) -> str:
+        parts = self.parts
+        output = [parts[0]]
+        for index in range(1, len(parts), 2):
+            output.append(_render_value(context.get(parts[index])))
+            output.append(parts[index + 1])
+        return "".join(output)
+
+
+_compiled = {}
+_compiled_pid = None
+_compiled_lock = threading.Lock()
+
+
+def clear_render_cache():
+    with _compiled_lock:
+        _compiled.clear()
+
+
+def _variables(context: dict) -> list:
+    return sorted(key for key in context
+                  if key not in LAYOUT_KEYS and key not in _ENVELOPE_KEYS)
+
+
+def _cache_key(context: dict, variables: list) -> tuple:
+    # `default`, `if` and friends branch on truthiness, so a value that
+    # flips it gets its own layout
+    return (context["template_name"],
+            tuple((key, str(context.get(key)))
+                  for key in sorted(LAYOUT_KEYS)),
+            tuple((key, bool(context[key])) for key in variables))
+
+
+def _get_compiled(context: dict):
+    global _compiled_pid
+    variables = _variables(context)
+    key = _cache_key(context, variables)
+    with _compiled_lock:
+        if _compiled_pid != os.getpid():
+            _compiled.clear()
+            _compiled_pid = os.getpid()
+        if key in _compiled:
+            return _compiled[key]
+    compiled = CompiledEmail.compile(context["template_name"], context,
+                                     variables)
+    if compiled is not None and compiled.render(context) != get_template(
+            context["template_name"]).render(context):
+        compiled = None
+    if compiled is None:
+        logger.warning("%s cannot be split into fragments, rendering it "
+                       "in full", context["template_name"])
+    with _compiled_lock:
+        if len(_compiled) >= getattr(settings, "EMAIL_RENDER_CACHE_SIZE",
+                                     256):
+            _compiled.clear()
+        _compiled[key] = compiled
+    return compiled
+
+
+def render_email(context: dict) -> str:
+    """
+    Render ``context["template_name"]`` for one message.
+
+    The first message of each layout compiles the template and checks
+    the fragments against a full render; later messages only fill in
+    their own values. Templates that cannot be split are rendered in full.
+    """
+    compiled = _get_compiled(context)
+    if compiled is None:
+        return get_template(context["template_name"]).render(context)
+    return compiled.render(context)
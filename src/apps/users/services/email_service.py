@@ -1,12 +1,17 @@
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, From, To, Content
 
-from django.template.loader import render_to_string
 from django.conf import settings
 
 from rest_framework.exceptions import ValidationError
 
+from .email_render import render_email
+
+from requests.adapters import HTTPAdapter
+import requests
+import threading
 import logging
+import random
+import time
 import os
 
 logger = logging.getLogger(__name__)
@@ -16,6 +21,98 @@ SENDGRID_SENDER = getattr(settings, "SENDGRID_SENDER", None)
 APP_NAME = getattr(settings, "APP_NAME", "SkillSpeed")
 
 
+class EmailSendError(Exception):
+
+    def __init__(self, status_code, body=""):
+        super().__init__(f"Email failed with status: {status_code}")
+        self.status_code = status_code
+        self.body = body
+
+
+def _backoff(attempt: int) -> float:
+    # full jitter keeps retrying workers from hitting the provider in step
+    base = getattr(settings, "EMAIL_RETRY_BASE_DELAY", 0.5)
+    cap = getattr(settings, "EMAIL_RETRY_MAX_DELAY", 8)
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class EmailClient:
+    """
+    SendGrid v3 ``mail/send`` over one pooled keep-alive session.
+
+    ``SendGridAPIClient`` opens a new connection for every message; this
+    keeps them open for the life of the worker and retries throttled (429)
+    and failed (5xx, connection) calls with jittered exponential backoff.
+    """
+
+    def __init__(self, api_key=None, host=None):
+        host = host or getattr(settings, "SENDGRID_API_HOST",
+                               "https://api.sendgrid.com")
+        self.url = host.rstrip("/") + "/v3/mail/send"
+        self.timeout = getattr(settings, "EMAIL_SEND_TIMEOUT", 10)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=getattr(settings,
+                                                   "EMAIL_POOL_SIZE", 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key or SENDGRID_API_KEY}",
+            "Content-Type": "application/json",
+        })
+
+    def send(self, payload: dict):
+        retries = getattr(settings, "EMAIL_SEND_RETRIES", 3)
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.post(self.url,
+                                             json=payload,
+                                             timeout=self.timeout)
+            except requests.RequestException:
+                if attempt == retries:
+                    raise
+                delay = _backoff(attempt)
+            else:
+                if response.status_code < 400:
+                    return response
+                retryable = (response.status_code == 429
+                             or response.status_code >= 500)
+                if not retryable or attempt == retries:
+                    raise EmailSendError(response.status_code, response.text)
+                retry_after = response.headers.get("Retry-After", "")
+                delay = (float(retry_after) if retry_after.isdigit() else
+                         _backoff(attempt))
+            logger.warning("SendGrid call failed, retry %s in %.2fs",
+                           attempt + 1, delay)
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_email_client() -> EmailClient:
+    """The worker's shared client, recreated after a fork."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = EmailClient()
+            _client_pid = os.getpid()
+        return _client
+
+
+def reset_email_client():
+    global _client
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+
+
 def _send_mail_base(context: dict) -> bool:
     """
     Docstring for _send_mail_base
@@ -39,18 +136,16 @@ def _send_mail_base(context: dict) -> bool:
 
     context.update({"app_name": APP_NAME})
     try:
-        html_content = render_to_string(context.get("template_name"), context)
-        client = SendGridAPIClient(api_key=SENDGRID_API_KEY)
+        html_content = render_email(context)
         message = Mail(from_email=From(email=SENDGRID_SENDER),
                        to_emails=To(email=context.get("to_email")),
                        subject=context.get("subject"),
                        html_content=Content("text/html", html_content))
-
-        response = client.send(message=message)
-        if response.status_code != 202:
-            logger.error(f"SendGrid failed: {response.body}")
-            raise ValidationError(
-                f"Email failed with status: {response.status_code}")
+        try:
+            get_email_client().send(message.get())
+        except EmailSendError as exc:
+            logger.error(f"SendGrid failed: {exc.body}")
+            raise ValidationError(str(exc))
     except KeyError:
         logger.exception("Missing keys in email context")
         raise
@@ -0,0 +1,89 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import threading
+import json
+import time
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            server.calls += 1
+            throttled = (server.throttle_every
+                         and server.calls % server.throttle_every == 0)
+            if not throttled:
+                payload = json.loads(body or b"{}")
+                server.recipients += sum(
+                    len(personalization.get("to", []))
+                    for personalization in payload.get("personalizations", []))
+                server.payloads.append(payload)
+        if throttled:
+            self._reply(429, b'{"errors": [{"message": "rate limited"}]}',
+                        {"Retry-After": "0"})
+        else:
+            self._reply(202, b"")
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSendGridServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the SendGrid v3 API to benchmark email dispatch.
+
+    Accepts ``POST /v3/mail/send`` with a configurable ``latency`` per call
+    and answers every ``throttle_every``-th call with a 429, counting calls,
+    recipients and new connections.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0, throttle_every: int = 0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.recipients = 0
+        self.connections = 0
+        self.payloads = []
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def reset(self):
+        with self.lock:
+            self.calls = self.recipients = self.connections = 0
+            self.payloads = []
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -3,9 +3,7 @@ from rest_framework.exceptions import ValidationError
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
-from django.db import transaction, IntegrityError
-from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.contrib.auth.hashers import make_password, check_password
+from django.utils.crypto import salted_hmac, constant_time_compare
 
 from ..exceptions import retry_on_failure
 from ..models import OneTimePassword, PasswordReset
@@ -16,24 +14,32 @@ import string
 import random
 
 max_retries = getattr(settings, "MAX_RETRY", 4)
+OTP_KEY_SALT = "apps.users.otp"
 BASE_URL = getattr(settings, "BASE_URL", None)
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
 def _hash_otp_code(code: str):
+    """
+    Keyed HMAC-SHA256 digest of a short code.
+
+    Codes are short lived and only a few digits long, so a slow salted
+    password hash buys nothing; keying the digest with SECRET_KEY keeps the
+    stored value useless without the key while letting us look the row up
+    directly by its digest.
+    """
     if code is None:
         raise ValidationError("Code cannot be empty")
-    hash_code = make_password(code)
+    hash_code = salted_hmac(OTP_KEY_SALT, code.strip(),
+                            algorithm="sha256").hexdigest()
     return hash_code
 
 
 def verify_otp(code: str, hashed_code: str) -> bool:
     if code is None or hashed_code is None:
         raise ValidationError("Code cannot be empty")
-    if check_password(code, hashed_code):
-        return True
-    return False
+    return constant_time_compare(_hash_otp_code(code), hashed_code)
 
 
 def _generate_code():
@@ -54,59 +60,27 @@ def _generate_code():
 def _generate_unique_otp():
     code = _generate_code()
     hash_code = _hash_otp_code(code)
-    if OneTimePassword.objects.filter(hash_code=hash_code).exists():
+    # codes are looked up by digest alone, so they must be unique among the
+    # active ones. The reset flow stores the same digest on PasswordReset.
+    if (OneTimePassword.objects.filter(hash_code=hash_code,
+                                       is_active=True).exists()
+            or PasswordReset.objects.filter(reset_code=hash_code,
+                                            is_active=True).exists()):
         logger.warning(_("OTP Already Exists!"))
         raise ValidationError(_("Failed. OTP already exists"))
     return code, hash_code
 
 
-def create_otp_for_user(user):
-    if not isinstance(user, User):
-        raise ValidationError(_("%s is not a valid 'User' Instance", user))
-    code, hash_code = _generate_unique_otp()
-    try:
-        with transaction.atomic():
-            OneTimePassword.objects.create(user=user,
-                                           hash_code=hash_code,
-                                           raw_code=code)
-        logger.info(_("successfully created and saved OTP for user %s", user))
-    except IntegrityError as exc:
-        logger.error("Database error while creating OTP for user %s",
-                     user.id,
-                     exc_info=True)
-        raise ValidationError("Database error while creating OTP.") from exc
-    except ValueError as exc:
-        logger.error("Invalid OTP value generated for user %s",
-                     user.id,
-                     exc_info=True)
-        raise ValidationError("Error validating OTP code.") from exc
-    return code
-
-
-def _genrate_url_for_account_verification(code):
+def _genrate_url_for_account_verification(token):
+    """Link to the verification endpoint carrying a signed ``token``."""
     if BASE_URL is None:
         return
-    verification_url = BASE_URL + f"api/v1/auth/verify/?code={code}"
+    verification_url = BASE_URL + f"api/v1/auth/verify/?token={token}"
     return verification_url
 
 
-def _generate_url_for_password_reset(code):
+def _generate_url_for_password_reset(token):
     if BASE_URL is None:
         return
-    verification_url = BASE_URL + f"api/v1/auth/password/reset/confirm/?token={code}"
+    verification_url = BASE_URL + f"api/v1/auth/password/reset/confirm/?token={token}"
     return verification_url or None
-
-
-def create_password_reset_for_user(user: User, code: str):
-    if user is None:
-        return
-    default_token_generator = PasswordResetTokenGenerator()
-    token = default_token_generator.make_token(user=user)
-    if token:
-        with transaction.atomic():
-            PasswordReset.objects.create(user=user,
-                                         reset_code=_hash_otp_code(code),
-                                         reset_token=token.strip(),
-                                         raw_code=code)
-        logger.debug("Successfully Created And Password Reset for User")
-    return None
@@ -0,0 +1,204 @@
+from .registration import bulk_registration, queue_verification
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import email_validator
+import django
+import json
+import csv
+import io
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
+
+
+def detect_format(filename: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension in ("jsonl", "ndjson"):
+        return JSONL
+    return CSV
+
+
+def read_rows(stream, fmt: str = CSV):
+    """
+    Yield ``(line, row)`` from a CSV (with a header) or JSONL text stream
+    without reading the whole file into memory.
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    if fmt == JSONL:
+        for line, raw in enumerate(stream, start=1):
+            if not raw.strip():
+                continue
+            try:
+                yield line, json.loads(raw)
+            except ValueError:
+                yield line, None
+        return
+    # the header is line 1
+    for line, row in enumerate(csv.DictReader(stream), start=2):
+        yield line, row
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _init_worker():
+    django.setup()
+
+
+def _hash_password(password):
+    # make_password(None) gives an unusable password, reset before login
+    return make_password(password or None)
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+class UserImporter:
+    """
+    Create users in bulk from CSV or JSONL rows.
+
+    Rows need ``email``, ``first_name`` and ``last_name``; ``password`` and
+    ``user_role`` are optional. Each chunk is validated against the
+    database in one query, its passwords are hashed across a process pool
+    and the users are written with a single ``bulk_create``, which also
+    means the per-row registration signal never fires. New accounts get
+    their codes through ``bulk_registration``'s batched jobs, or none at
+    all when imported as ``verified``.
+    """
+
+    def __init__(self, workers=None, chunk_size=None, verified=False):
+        self.workers = (workers
+                        or getattr(settings, "USER_IMPORT_WORKERS", None)
+                        or os.cpu_count() or 1)
+        self.chunk_size = chunk_size or getattr(
+            settings, "USER_IMPORT_CHUNK_SIZE", 1000)
+        self.verified = verified
+
+    def _clean(self, line, row, seen, result):
+        if not isinstance(row, dict):
+            result.error(line, "malformed row")
+            return None
+        row = {key.strip(): value for key, value in row.items() if key}
+        try:
+            email = email_validator.validate_email(
+                (row.get("email") or "").strip(),
+                check_deliverability=False).normalized
+        except email_validator.EmailNotValidError as exc:
+            result.error(line, str(exc))
+            return None
+        first_name = (row.get("first_name") or "").strip()
+        last_name = (row.get("last_name") or "").strip()
+        if not first_name or not last_name:
+            result.error(line, "first_name and last_name are required")
+            return None
+        role = (row.get("user_role") or "").strip().upper() or None
+        if role is not None and role not in User.UserRoles.values:
+            result.error(line, f"unknown user_role {role}")
+            return None
+        if email in seen:
+            result.skipped += 1
+            return None
+        seen.add(email)
+        return {
+            "email": email,
+            "first_name": first_name.title(),
+            "last_name": last_name.title(),
+            "user_role": role,
+            "password": row.get("password") or None,
+        }
+
+    def _build(self, rows, hashes):
+        now = timezone.now()
+        return [
+            User(email=row["email"],
+                 first_name=row["first_name"],
+                 last_name=row["last_name"],
+                 user_role=row["user_role"],
+                 password=hashed,
+                 is_active=self.verified,
+                 is_verified=self.verified,
+                 verified_at=now if self.verified else None)
+            for row, hashed in zip(rows, hashes)
+        ]
+
+    def _import_chunk(self, chunk, pool, seen, result):
+        rows = [
+            row for row in (self._clean(line, raw, seen, result)
+                            for line, raw in chunk) if row is not None
+        ]
+        existing = set(
+            User.objects.filter(email__in=[row["email"] for row in rows
+                                           ]).values_list("email", flat=True))
+        result.skipped += len(existing)
+        rows = [row for row in rows if row["email"] not in existing]
+        if not rows:
+            return
+        passwords = [row["password"] for row in rows]
+        if pool is None:
+            hashes = list(map(_hash_password, passwords))
+        else:
+            hashes = list(
+                pool.map(_hash_password,
+                         passwords,
+                         chunksize=max(1, len(passwords) // (self.workers * 4))))
+        with transaction.atomic():
+            users = User.objects.bulk_create(self._build(rows, hashes))
+            if not self.verified:
+                for user in users:
+                    queue_verification(user)
+        result.created += len(users)
+        logger.info("Imported %s users, %s so far", len(users), result.created)
+
+    def run(self, rows) -> ImportResult:
+        """Import ``rows`` as yielded by ``read_rows``."""
+        result = ImportResult()
+        seen = set()
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers,
+                                       initializer=_init_worker)
+        try:
+            with bulk_registration(notify=not self.verified):
+                for chunk in _chunks(rows, self.chunk_size):
+                    self._import_chunk(chunk, pool, seen, result)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return result
+
+
+def import_users(stream, fmt: str = CSV, **options) -> dict:
+    return UserImporter(**options).run(read_rows(stream, fmt)).as_dict()
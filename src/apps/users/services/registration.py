@@ -0,0 +1,62 @@
+from .tasks import (send_registration_verification,
+                    send_registration_verifications)
+
+from ..outbox.relay import enqueue
+
+from django.conf import settings
+
+from contextlib import contextmanager
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_bulk_state = threading.local()
+
+
+def _bulk_batch():
+    return getattr(_bulk_state, "user_ids", None)
+
+
+def queue_verification(user):
+    """
+    Send the verification code to ``user`` once the surrounding
+    transaction commits, through the outbox.
+
+    Inside ``bulk_registration`` the user is only remembered and the whole
+    batch is dispatched when the block exits.
+    """
+    batch = _bulk_batch()
+    if batch is not None:
+        batch.append(str(user.pk))
+        return
+    enqueue(send_registration_verification,
+            str(user.pk),
+            dedup_key=f"registration:{user.pk}")
+
+
+@contextmanager
+def bulk_registration(notify: bool = True):
+    """
+    Create many users without one verification pipeline per row.
+
+    With ``notify`` the collected users get their codes through batched
+    ``send_registration_verifications`` outbox messages, without it
+    (seeding, imports of already verified accounts) nothing is sent.
+    """
+    if _bulk_batch() is not None:
+        # nested blocks join the outermost batch
+        yield
+        return
+    _bulk_state.user_ids = []
+    try:
+        yield
+        user_ids = _bulk_state.user_ids
+    finally:
+        _bulk_state.user_ids = None
+    if not notify or not user_ids:
+        return
+    batch_size = getattr(settings, "REGISTRATION_BATCH_SIZE", 500)
+    for start in range(0, len(user_ids), batch_size):
+        enqueue(send_registration_verifications,
+                user_ids[start:start + batch_size])
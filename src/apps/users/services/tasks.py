@@ -5,21 +5,40 @@ from rest_framework.exceptions import ValidationError
 from celery import shared_task
 
 from .email_service import _send_mail_base
-from ..models import OneTimePassword, PasswordReset
+from .email_batch import flush_buffer, queue_email
+from .deliverability import check_domain_deliverability
+from .code_store import (get_code_store, create_otp_for_user,
+                         create_password_reset_for_user)
+from .helpers import (_genrate_url_for_account_verification,
+                      _generate_url_for_password_reset)
+from .signed_links import make_verification_token, make_reset_token
+from .templates_service import (genrate_context_for_otp,
+                                generate_context_for_password_reset)
+from ..models import OneTimePassword, PasswordReset, UserImport
+from ..outbox.relay import relay_pending
+from ..profiles.models import ChildProfile
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
-from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 
 import logging
+import time
+import io
 
 logger = logging.getLogger(__name__)
 OTP_life_span = getattr(settings, "OTP_LIFE")
+User = get_user_model()
 
 
-@shared_task
+@shared_task(autoretry_for=(Exception, ),
+             retry_backoff=True,
+             max_retries=3)
 def send_email_on_quene(content: dict):
     """
     Docstring for send_email_on_quene
@@ -35,19 +54,266 @@ def send_email_on_quene(content: dict):
         logger.error("Failed to quene email message")
 
 
+@shared_task
+def flush_email_batch():
+    """
+    Send every buffered email in grouped multi-recipient API calls.
+
+    Scheduled by ``email_batch.queue_email`` at the end of each batching
+    window, and by beat for a flush that was lost or never scheduled.
+    """
+    return flush_buffer()
+
+
+def _send_verification_code(user):
+    code = create_otp_for_user(user)
+    url = _genrate_url_for_account_verification(make_verification_token(user))
+    context = genrate_context_for_otp(code, url, user.email)
+    context.update({"to_email": user.email})
+    queue_email(context)
+
+
+def _pending_verification(user_ids):
+    return User.objects.filter(pk__in=user_ids,
+                               is_verified=False,
+                               account_status=User.AccountStatus.ACTIVE)
+
+
+@shared_task(autoretry_for=(Exception, ),
+             retry_backoff=True,
+             max_retries=3)
+def send_registration_verification(user_id: str):
+    """
+    Issue the verification code for a new account and email it.
+
+    Queued on commit of the registration so the request never waits on
+    code generation, template rendering or the mail provider.
+    """
+    user = _pending_verification([user_id]).first()
+    if user is None:
+        logger.info("No pending verification for user %s", user_id)
+        return
+    _send_verification_code(user)
+    logger.info("Verification code sent to %s", user.email)
+
+
+@shared_task
+def send_registration_verifications(user_ids: list):
+    """Batched variant of ``send_registration_verification`` for bulk mode."""
+    sent = failed = 0
+    for user in _pending_verification(user_ids).iterator():
+        try:
+            _send_verification_code(user)
+            sent += 1
+        except Exception:
+            failed += 1
+            logger.exception("Verification email failed for %s", user.email)
+    logger.info("Bulk verification batch: %s sent, %s failed", sent, failed)
+    return {"sent": sent, "failed": failed}
+
+
+@shared_task(autoretry_for=(Exception, ),
+             retry_backoff=True,
+             max_retries=3)
+def send_password_reset(user_id: str):
+    """
+    Issue a password reset code and signed link for a user and email them.
+
+    The request only records the user id in the outbox, the code and the
+    link exist in plaintext nowhere but in the email.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        logger.info("No user %s to send a password reset to", user_id)
+        return
+    code = create_password_reset_for_user(user)
+    url = _generate_url_for_password_reset(make_reset_token(user))
+    context = generate_context_for_password_reset(
+        code=code,
+        verification_url=url,
+        email=user.email,
+        name=user.get_full_name_or_none())
+    context.update({"to_email": user.email})
+    queue_email(context)
+    logger.info("Password reset code sent to %s", user.email)
+
+
+@shared_task
+def verify_email_deliverability(email: str):
+    """
+    Full DNS deliverability check for a freshly registered address.
+
+    Runs off the request path so registration never waits on the resolver;
+    the outcome lands in the domain cache used by ``_validate_email``.
+    """
+    domain = email.rsplit("@", 1)[-1]
+    deliverable = check_domain_deliverability(domain)
+    if deliverable is False:
+        logger.warning("Registered email %s has an undeliverable domain",
+                       email)
+    return deliverable
+
+
+def _in_batches(queryset, action) -> int:
+    """
+    Apply ``action`` to the rows of ``queryset`` a bounded pk batch at a
+    time, each batch in its own transaction. ``action`` must take the rows
+    out of ``queryset`` or the loop never ends.
+    """
+    batch_size = getattr(settings, "CODE_EXPIRY_BATCH_SIZE", 1000)
+    touched = 0
+    while True:
+        batch = list(
+            queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return touched
+        with transaction.atomic():
+            action(queryset.model.objects.filter(pk__in=batch))
+        touched += len(batch)
+
+
+def _sweep_codes(model) -> dict:
+    """
+    Deactivate the still active codes of ``model`` older than ``OTP_LIFE``
+    and delete any code past ``CODE_RETENTION_DAYS``.
+
+    Both walks go through ``created_at`` indexes, the expiry one through the
+    partial index over active rows, so a run only costs what it changes.
+    """
+    started = time.monotonic()
+    now = timezone.now()
+    expired = _in_batches(
+        model.objects.filter(is_active=True,
+                             created_at__lt=now -
+                             timezone.timedelta(minutes=OTP_life_span)),
+        lambda rows: rows.update(is_active=False))
+    retention = getattr(settings, "CODE_RETENTION_DAYS", 30)
+    deleted = _in_batches(
+        model.objects.filter(created_at__lt=now -
+                             timezone.timedelta(days=retention)),
+        lambda rows: rows.delete())
+    stats = {
+        "expired": expired,
+        "deleted": deleted,
+        "duration_ms": round((time.monotonic() - started) * 1000, 2)
+    }
+    logger.info("%s sweep: %s", model._meta.verbose_name, stats)
+    return stats
+
+
 @shared_task
 def auto_expire_otp():
-    with transaction.atomic():
-        expired_otps = OneTimePassword.objects.filter(
-            created_at__lt=timezone.now() -
-            timezone.timedelta(minutes=OTP_life_span)).update(
-                is_active=False)
+    if not get_code_store().requires_sweep:
+        # the configured store expires codes on its own
+        return
+    return _sweep_codes(OneTimePassword)
 
 
 @shared_task
 def auto_deactivate_reset_code():
-    with transaction.atomic():
-        PasswordReset.objects.filter(
-            created_at__lt=timezone.now() -
-            timezone.timedelta(minutes=OTP_life_span)).update(
-                is_active=False)
+    if not get_code_store().requires_sweep:
+        return
+    return _sweep_codes(PasswordReset)
+
+
+@shared_task
+def purge_expired_tokens():
+    """
+    Delete expired outstanding tokens, and with them their blacklist rows,
+    in bounded batches so the token tables stay small without one long
+    delete locking them.
+    """
+    batch_size = getattr(settings, "TOKEN_PURGE_BATCH_SIZE", 1000)
+    now = timezone.now()
+    purged = 0
+    while True:
+        batch = list(
+            OutstandingToken.objects.filter(expires_at__lte=now).values_list(
+                "pk", flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            # BlacklistedToken rows cascade with their outstanding token
+            OutstandingToken.objects.filter(pk__in=batch).delete()
+        purged += len(batch)
+    logger.info("Purged %s expired outstanding tokens", purged)
+    return purged
+
+
+@shared_task
+def relay_outbox():
+    """
+    Dispatch committed outbox messages to their Celery tasks.
+
+    Runs every ``OUTBOX_RELAY_INTERVAL`` seconds; returns the counts and
+    the lag of the oldest message still waiting.
+    """
+    return relay_pending()
+
+
+def _refresh_ages(children):
+    today = timezone.localdate()
+    rows = list(children.only("pk", "date_of_birth"))
+    for child in rows:
+        child.refresh_age(today)
+    ChildProfile.objects.bulk_update(rows, ["age", "age_updates_on"])
+
+
+@shared_task
+def refresh_child_ages():
+    """
+    Move every child whose birthday has come up to their new age.
+
+    ``age_updates_on`` holds each child's next birthday, so a run only
+    reads the children it changes and a missed day is caught up by the
+    next one.
+    """
+    due = ChildProfile.objects.filter(
+        Q(age_updates_on__lte=timezone.localdate())
+        | Q(age_updates_on__isnull=True, date_of_birth__isnull=False))
+    refreshed = _in_batches(due, _refresh_ages)
+    logger.info("Refreshed the age of %s children", refreshed)
+    return refreshed
+
+
+@shared_task
+def run_user_import(import_id: str):
+    """
+    Run an admin's ``UserImport`` and store its outcome.
+
+    Hashes in this process: Celery's pool processes are daemonic and may
+    not fork a process pool of their own.
+    """
+    # importer imports registration, which imports this module
+    from .importer import UserImporter, read_rows
+
+    # the outbox delivers at least once, only one delivery claims the job
+    claimed = UserImport.objects.filter(
+        pk=import_id,
+        status=UserImport.Status.PENDING).update(
+            status=UserImport.Status.RUNNING) == 1
+    if not claimed:
+        logger.info("No pending user import %s", import_id)
+        return None
+    job = UserImport.objects.get(pk=import_id)
+    try:
+        result = UserImporter(workers=1, verified=job.verified).run(
+            read_rows(io.StringIO(job.content), job.file_format)).as_dict()
+    except Exception:
+        logger.exception("User import %s failed", import_id)
+        job.status = UserImport.Status.FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "finished_at"])
+        raise
+    job.status = UserImport.Status.DONE
+    job.result = result
+    job.content = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "content", "finished_at"])
+    logger.info("users_imported",
+                extra={
+                    "created": result["created"],
+                    "failed": result["failed"],
+                    "admin": job.admin_id
+                })
+    return result
@@ -1,11 +1,11 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth import get_user_model
 
-from .services.helpers import (create_otp_for_user,
-                               _genrate_url_for_account_verification)
-from .helpers import _send_email_to_user, logger
-from .services.templates_service import genrate_context_for_otp
+from .services.registration import queue_verification
+from .authentication import invalidate_user, CLAIM_FIELDS
+from .profiles.models import ChildProfile
+from .helpers import logger
 
 User = get_user_model()
 
@@ -13,17 +13,35 @@ User = get_user_model()
 @receiver(post_save, sender=User)
 def post_save_otp_after_account_registration(sender, instance, created,
                                              **kwargs):
-    """ Automatically create and send OTP and verification URL to user after account registration """
+    """ Queue OTP and verification URL delivery once the registration commits """
     if not isinstance(instance, User):
         return
     if not created:
         return
     logger.debug(f"Signal fired for user: {instance.email}")
     try:
-        code = create_otp_for_user(instance)
-        url = _genrate_url_for_account_verification(code)
-        context = genrate_context_for_otp(code, url, instance.email)
-        _send_email_to_user(context)
-        logger.debug(f"OTP created and email sent for user: {instance.email}")
+        queue_verification(instance)
     except Exception as e:
         logger.error(f"Error in post_save signal for {instance.email}: {e}")
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created, update_fields=None,
+                           **kwargs):
+    """ Drop the cached user and, if a claim field changed, stale tokens' claims """
+    if created:
+        return
+    claims_changed = update_fields is None or bool(
+        CLAIM_FIELDS.intersection(update_fields))
+    invalidate_user(instance.pk, claims_changed=claims_changed)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=ChildProfile)
+def invalidate_guardian_of_child(sender, instance, **kwargs):
+    """ The cached guardian carries its active child account """
+    invalidate_user(instance.guardian_id, claims_changed=False)
@@ -1,4 +1,5 @@
-from .services.helpers import _genrate_url_for_account_verification, create_otp_for_user, _hash_otp_code
+from .services.helpers import _genrate_url_for_account_verification, _hash_otp_code
+from .services.code_store import create_otp_for_user
 from .services.templates_service import genrate_context_for_otp
 from .helpers import _send_email_to_user
 from .services.email_service import _send_mail_base
@@ -25,9 +26,9 @@ class TestUserAuth(TestCase):
                                    password="test-password")
 
     def test_url_generation(self):
-        code = "23455"
-        result = _genrate_url_for_account_verification(code)
-        url = BaseURL + f"api/v1/auth/verify/?code={code}"
+        token = "signed-token"
+        result = _genrate_url_for_account_verification(token)
+        url = BaseURL + f"api/v1/auth/verify/?token={token}"
         self.assertEqual(url, result)
 
     def test_create_otp_for_user(self):
@@ -1,11 +1,18 @@
 
 from ..models import OneTimePassword, PasswordReset
+from ..outbox.models import OutboxMessage
+from ..services.tasks import relay_outbox, send_password_reset
+from ..services.code_store import create_otp_for_user, get_code_store
+from tests_config.factories.user_factory import otp_code
 
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from django.contrib.auth import base_user
+
 import pytest
+from unittest import mock
 from uuid import UUID
 
 
@@ -37,13 +44,24 @@ class TestAuth:
         assert response.status_code == status.HTTP_200_OK
         assert user_id is not None
 
+    def test_login_hashes_password_once(self, api_client: APIClient, user):
+        login_path = "/api/v1/auth/token/obtain/"
+        request_data = {"email": user.email, "password": "secure_password"}
+        with mock.patch.object(base_user,
+                               "check_password",
+                               wraps=base_user.check_password) as hasher:
+            response = api_client.post(path=login_path, data=request_data)
+        result = response.json()
+        assert response.status_code == status.HTTP_200_OK
+        assert hasher.call_count == 1
+        assert result.get("access") and result.get("refresh")
+
     def test_account_verification(self, api_client: APIClient,
                                   user_verification):
         verification_path = "/api/v1/auth/verify/"
-        otp_instance = OneTimePassword.objects.get(user=user_verification,
-                                                   is_active=True)
+        code = create_otp_for_user(user_verification)
         email = user_verification.email
-        request_data = {"email": email, "code": otp_instance.raw_code}
+        request_data = {"email": email, "code": code}
         response = api_client.post(path=verification_path, data=request_data)
         result = response.json()
         assert result["status"] == "success"
@@ -69,14 +87,28 @@ class TestAuth:
         assert result.get("status") == "success"
         assert response.status_code == status.HTTP_200_OK
 
+    def test_password_reset_keeps_the_code_out_of_the_outbox(
+            self, api_client: APIClient, user):
+        response = api_client.post(path="/api/v1/auth/password/reset/",
+                                   data={"email": user.email})
+        assert response.status_code == status.HTTP_200_OK
+        message = OutboxMessage.objects.get(task=send_password_reset.name)
+        assert message.args == [str(user.pk)] and message.kwargs == {}
+        assert not PasswordReset.objects.filter(user=user).exists()
+
+        with mock.patch(
+                "apps.users.services.tasks.send_email_on_quene.delay") as send:
+            relay_outbox()
+        context = send.call_args.args[0]
+        assert context["to_email"] == user.email
+        assert "token=" in context["verification_url"]
+        assert get_code_store().find_reset(context["code"]).user == user
+
     def test_password_reset_confirm_code(self, api_client: APIClient, user,
                                          password_reset):
         confirm_path = "/api/v1/auth/password/reset/confirm/"
-        password_reset.user = user
-        password = PasswordReset.objects.get(user__email=user.email,
-                                             is_active=True)
         request_data = {
-            "code": password.raw_code,
+            "code": otp_code,
             "password": "secure_password30",
             "confirm_password": "secure_password30"
         }
@@ -84,6 +116,31 @@ class TestAuth:
         result = response.json()
         assert response.status_code == status.HTTP_200_OK
         assert result["status"] == "success"
+        password_reset.refresh_from_db()
+        assert not password_reset.is_active
+
+    def test_account_verification_locks_after_max_attempts(
+            self, api_client: APIClient, user_verification, settings):
+        settings.OTP_MAX_ATTEMPTS = 2
+        verification_path = "/api/v1/auth/verify/"
+        code = create_otp_for_user(user_verification)
+        wrong_code = "x" + code
+        for _ in range(settings.OTP_MAX_ATTEMPTS):
+            response = api_client.post(path=verification_path,
+                                       data={
+                                           "email": user_verification.email,
+                                           "code": wrong_code
+                                       })
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        otp_instance = OneTimePassword.objects.get(user=user_verification,
+                                                   attempts=2)
+        assert not otp_instance.is_active
+        response = api_client.post(path=verification_path,
+                                   data={
+                                       "email": user_verification.email,
+                                       "code": code
+                                   })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_logout(self, authenticated_client, user):
         logout_path = "/api/v1/auth/logout/"
@@ -0,0 +1,132 @@
+from ..auth import CustomObtainPairSerializer
+from ..authentication import ClaimsJWTAuthentication, ClaimsUser
+from ..profiles.permissions import IsGuardian, ChildRole
+from ..profiles.models import ChildProfile
+from ..services.tasks import purge_expired_tokens
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from django.utils import timezone
+
+import pytest
+
+User = get_user_model()
+
+
+def _request_with(token):
+    return APIRequestFactory().get(
+        "/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestClaimsAuthentication:
+
+    def test_current_claims_need_no_query(self, guardian_user,
+                                          django_assert_num_queries):
+        token = CustomObtainPairSerializer.get_token(guardian_user)
+        request = _request_with(token.access_token)
+        with django_assert_num_queries(0):
+            user, _ = ClaimsJWTAuthentication().authenticate(request)
+            request.user = user
+            assert isinstance(user, User)
+            assert user == guardian_user and user.pk == guardian_user.pk
+            assert IsGuardian().has_permission(request, None)
+            assert not ChildRole().has_permission(request, None)
+            assert str(guardian_user.pk.hex) in str(
+                ChildProfile.objects.filter(guardian=user).query)
+
+    def test_saved_user_invalidates_claims(self, guardian_user):
+        token = CustomObtainPairSerializer.get_token(guardian_user)
+        guardian_user.active_profile = User.ActiveProfile.CHILD
+        guardian_user.save()
+        user, _ = ClaimsJWTAuthentication().authenticate(
+            _request_with(token.access_token))
+        assert not isinstance(user, ClaimsUser)
+        assert user.active_profile == User.ActiveProfile.CHILD
+
+    def test_suspended_user_is_rejected(self, guardian_user):
+        token = CustomObtainPairSerializer.get_token(guardian_user)
+        guardian_user.is_active = False
+        guardian_user.save()
+        with pytest.raises(Exception) as exc:
+            ClaimsJWTAuthentication().authenticate(
+                _request_with(token.access_token))
+        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_without_claims_uses_user_cache(self, user,
+                                                  django_assert_num_queries):
+        token = RefreshToken.for_user(user)
+        request = _request_with(token.access_token)
+        # revocation epoch and user, both cached afterwards
+        with django_assert_num_queries(2):
+            ClaimsJWTAuthentication().authenticate(request)
+        with django_assert_num_queries(0):
+            cached, _ = ClaimsJWTAuthentication().authenticate(request)
+        assert cached == user
+
+    def test_logout_with_claims_token(self, api_client: APIClient, user):
+        token = CustomObtainPairSerializer.get_token(user)
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        response = api_client.post(path="/api/v1/auth/logout/",
+                                   data={"refresh_token": str(token)})
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestTokenRevocation:
+
+    def test_logout_revokes_issued_tokens(self, api_client: APIClient, user,
+                                          django_assert_max_num_queries):
+        first = CustomObtainPairSerializer.get_token(user)
+        second = CustomObtainPairSerializer.get_token(user)
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {first.access_token}")
+        # blacklist check of the refresh token and the epoch update
+        with django_assert_max_num_queries(2):
+            response = api_client.post(path="/api/v1/auth/logout/",
+                                       data={"refresh_token": str(first)})
+        assert response.status_code == status.HTTP_200_OK
+        for token in (first, second):
+            with pytest.raises(AuthenticationFailed):
+                ClaimsJWTAuthentication().authenticate(
+                    _request_with(token.access_token))
+        user.refresh_from_db()
+        assert user.tokens_valid_after is not None
+
+        fresh = CustomObtainPairSerializer.get_token(user)
+        authenticated, _ = ClaimsJWTAuthentication().authenticate(
+            _request_with(fresh.access_token))
+        assert authenticated == user
+
+    def test_logout_twice_does_not_fail(self, api_client: APIClient, user):
+        token = CustomObtainPairSerializer.get_token(user)
+        api_client.force_authenticate(user)
+        for _ in range(2):
+            response = api_client.post(path="/api/v1/auth/logout/",
+                                       data={"refresh_token": str(token)})
+            assert response.status_code == status.HTTP_200_OK
+
+    def test_purge_expired_tokens(self, user, settings):
+        settings.TOKEN_PURGE_BATCH_SIZE = 2
+        for _ in range(5):
+            RefreshToken.for_user(user).blacklist()
+        live = RefreshToken.for_user(user)
+        OutstandingToken.objects.exclude(jti=live["jti"]).update(
+            expires_at=timezone.now() - timezone.timedelta(minutes=1))
+        assert purge_expired_tokens() == 5
+        assert list(OutstandingToken.objects.values_list(
+            "jti", flat=True)) == [live["jti"]]
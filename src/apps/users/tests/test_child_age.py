@@ -0,0 +1,92 @@
+from ..profiles.ages import age_on, next_birthday
+from ..profiles.models import ChildProfile
+from ..services.tasks import refresh_child_ages
+from ...skills.helpers import _child_age_or_none
+from ...skills.models import Skills
+from ...lesson.recommendation.services.recommendation_service import \
+    AgeRecommendation
+
+from tests_config.factories import ChildProfileFactory
+
+from django.utils import timezone
+
+import datetime
+import pytest
+
+DATE = datetime.date
+
+
+class TestAges:
+
+    @pytest.mark.parametrize("today, age", [
+        (DATE(2024, 3, 9), 9),
+        (DATE(2024, 3, 10), 10),
+        (DATE(2024, 12, 31), 10),
+    ])
+    def test_age_to_the_day(self, today, age):
+        assert age_on(DATE(2014, 3, 10), today) == age
+
+    def test_leap_day_birthday(self):
+        born = DATE(2016, 2, 29)
+        assert age_on(born, DATE(2025, 2, 28)) == 8
+        assert age_on(born, DATE(2025, 3, 1)) == 9
+        assert next_birthday(born, DATE(2025, 1, 1)) == DATE(2025, 3, 1)
+        assert next_birthday(born, DATE(2027, 6, 1)) == DATE(2028, 2, 29)
+
+
+@pytest.mark.django_db
+class TestStoredAge:
+
+    def test_age_is_stored_on_save(self, guardian_user):
+        today = timezone.localdate()
+        child = ChildProfileFactory(
+            guardian=guardian_user,
+            date_of_birth=DATE(today.year - 8, 1, 1).isoformat())
+        child.refresh_from_db()
+        assert child.age == 8 and _child_age_or_none(child) == 8
+        assert child.age_updates_on == DATE(today.year + 1, 1, 1)
+
+        child.date_of_birth = DATE(today.year - 10, 1, 1)
+        child.save(update_fields=["date_of_birth"])
+        child.refresh_from_db()
+        assert child.age == 10
+
+    def test_daily_refresh_moves_only_due_children(self, guardian_user):
+        due, later = (ChildProfileFactory(guardian=guardian_user)
+                      for _ in range(2))
+        yesterday = timezone.localdate() - datetime.timedelta(days=1)
+        ChildProfile.objects.filter(pk=due.pk).update(age=1,
+                                                      age_updates_on=yesterday)
+        ChildProfile.objects.filter(pk=later.pk).update(age=1)
+
+        assert refresh_child_ages() == 1
+        due.refresh_from_db()
+        later.refresh_from_db()
+        assert due.age == age_on(due.date_of_birth)
+        assert due.age_updates_on > timezone.localdate()
+        assert later.age == 1
+
+    def test_age_gated_skills_for_many_children(self, guardian_user,
+                                                instructor_user,
+                                                django_assert_num_queries):
+        young, old, toddler = (ChildProfileFactory(guardian=guardian_user)
+                               for _ in range(3))
+        ChildProfile.objects.filter(pk=young.pk).update(age=6)
+        ChildProfile.objects.filter(pk=old.pk).update(age=12)
+        ChildProfile.objects.filter(pk=toddler.pk).update(age=2)
+        skills = {
+            name: Skills.objects.create(user=instructor_user,
+                                        name=name,
+                                        min_age=low,
+                                        max_age=high).pk
+            for name, low, high in [("blocks", 5, 7), ("coding", 10, 15),
+                                    ("drawing", 5, 15)]
+        }
+        with django_assert_num_queries(1):
+            gated = AgeRecommendation.for_children(
+                ChildProfile.objects.filter(guardian=guardian_user))
+        assert sorted(gated[young.pk]) == sorted(
+            [skills["blocks"], skills["drawing"]])
+        assert sorted(gated[old.pk]) == sorted(
+            [skills["coding"], skills["drawing"]])
+        assert gated[toddler.pk] == []
@@ -0,0 +1,157 @@
+from ..services.code_store import (get_code_store, create_otp_for_user,
+                                  create_password_reset_for_user)
+from ..models import OneTimePassword
+from ..services.tasks import auto_expire_otp
+from ..services.signed_links import make_reset_token, make_verification_token
+
+from django.utils import timezone
+
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+
+STORES = [
+    "apps.users.services.code_store.DatabaseCodeStore",
+    "apps.users.services.code_store.RedisCodeStore",
+]
+
+
+@pytest.fixture(params=STORES, ids=["database", "redis"])
+def code_store(request, settings):
+    settings.USER_CODE_STORE = request.param
+    cache.clear()
+    yield get_code_store()
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCodeStore:
+
+    def test_otp_is_consumed_once(self, code_store, user):
+        code = create_otp_for_user(user)
+        stored = code_store.find_otp(code, user)
+        assert stored is not None and stored.user == user
+        assert code_store.consume_otp(stored)
+        assert not code_store.consume_otp(stored)
+        assert code_store.find_otp(code) is None
+
+    def test_new_otp_supersedes_previous(self, code_store, user):
+        first = create_otp_for_user(user)
+        second = create_otp_for_user(user)
+        assert code_store.find_otp(first) is None
+        assert code_store.find_otp(second).user_id == user.pk
+
+    def test_otp_locked_after_max_attempts(self, code_store, user,
+                                           settings):
+        settings.OTP_MAX_ATTEMPTS = 2
+        code = create_otp_for_user(user)
+        for _ in range(settings.OTP_MAX_ATTEMPTS):
+            assert code_store.find_otp("x" + code, user) is None
+        assert code_store.find_otp(code, user) is None
+
+    def test_reset_code_is_consumed_once(self, code_store, user):
+        first = create_password_reset_for_user(user)
+        code = create_password_reset_for_user(user)
+        assert code_store.find_reset(first) is None
+        stored = code_store.find_reset(code)
+        assert stored.user == user
+        assert code_store.consume_reset(stored)
+        assert not code_store.consume_reset(stored)
+        assert code_store.find_reset(code) is None
+
+    def test_redis_store_keeps_no_rows(self, settings, user):
+        settings.USER_CODE_STORE = STORES[1]
+        OneTimePassword.objects.filter(user=user).delete()
+        create_otp_for_user(user)
+        assert not get_code_store().requires_sweep
+        assert not OneTimePassword.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+class TestCodeSweep:
+
+    def _otp(self, user, minutes_old, is_active=True):
+        otp = OneTimePassword.objects.create(user=user,
+                                             hash_code=f"digest-{minutes_old}",
+                                             is_active=is_active)
+        OneTimePassword.objects.filter(pk=otp.pk).update(
+            created_at=timezone.now() - timezone.timedelta(minutes=minutes_old))
+        return otp
+
+    def test_sweep_expires_in_batches_and_purges(self, user, settings):
+        settings.USER_CODE_STORE = STORES[0]
+        settings.CODE_EXPIRY_BATCH_SIZE = 2
+        settings.CODE_RETENTION_DAYS = 1
+        OneTimePassword.objects.filter(user=user).delete()
+        fresh = self._otp(user, 1)
+        stale = [self._otp(user, minutes) for minutes in (30, 40, 50)]
+        ancient = self._otp(user, 60 * 48, is_active=False)
+
+        stats = auto_expire_otp()
+
+        assert stats["expired"] == len(stale) and stats["deleted"] == 1
+        assert "duration_ms" in stats
+        assert OneTimePassword.objects.get(pk=fresh.pk).is_active
+        assert not OneTimePassword.objects.filter(pk__in=[
+            otp.pk for otp in stale
+        ], is_active=True).exists()
+        assert not OneTimePassword.objects.filter(pk=ancient.pk).exists()
+        assert auto_expire_otp()["expired"] == 0
+
+    def test_sweep_skipped_for_redis_store(self, settings):
+        settings.USER_CODE_STORE = STORES[1]
+        assert auto_expire_otp() is None
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestCodeStoreApi:
+
+    def test_account_verification_by_url(self, code_store,
+                                         api_client: APIClient,
+                                         user_verification):
+        code = create_otp_for_user(user_verification)
+        response = api_client.get("/api/v1/auth/verify/", {"code": code})
+        assert response.status_code == status.HTTP_200_OK
+        user_verification.refresh_from_db()
+        assert user_verification.is_verified
+        response = api_client.get("/api/v1/auth/verify/", {"code": code})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_password_reset_confirm_with_code(self, code_store,
+                                              api_client: APIClient, user):
+        code = create_password_reset_for_user(user)
+        confirm_path = "/api/v1/auth/password/reset/confirm/"
+        request_data = {
+            "code": code,
+            "password": "secure_password30",
+            "confirm_password": "secure_password30"
+        }
+        response = api_client.post(path=confirm_path, data=request_data)
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.check_password("secure_password30")
+        response = api_client.post(path=confirm_path, data=request_data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_link_revokes_the_emailed_code(self, code_store,
+                                                 api_client: APIClient, user):
+        code = create_password_reset_for_user(user)
+        token = make_reset_token(user)
+        response = api_client.post(
+            f"/api/v1/auth/password/reset/confirm/?token={token}", {
+                "password": "secure_password30",
+                "confirm_password": "secure_password30"
+            })
+        assert response.status_code == status.HTTP_200_OK
+        assert code_store.find_reset(code) is None
+
+    def test_verification_link_revokes_the_emailed_code(
+            self, code_store, api_client: APIClient, user_verification):
+        code = create_otp_for_user(user_verification)
+        token = make_verification_token(user_verification)
+        response = api_client.get("/api/v1/auth/verify/", {"token": token})
+        assert response.status_code == status.HTTP_200_OK
+        assert code_store.find_otp(code) is None
@@ -0,0 +1,82 @@
+from ..services import deliverability
+from ..helpers import _validate_email
+
+from django.core.cache import cache
+
+from email_validator import EmailUndeliverableError
+from unittest import mock
+import dns.exception
+import dns.resolver
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_domain_cache():
+    cache.clear()
+    deliverability.clear_local_cache()
+    yield
+    deliverability.clear_local_cache()
+
+
+@pytest.mark.unit
+class TestEmailDeliverability:
+
+    def test_syntax_policy_skips_dns(self):
+        with mock.patch.object(
+                deliverability,
+                "validate_email_deliverability") as resolver:
+            result = _validate_email("Someone@Example.com")
+        assert result["valid_email"] == "Someone@example.com"
+        resolver.assert_not_called()
+
+    def test_deliverable_domain_is_cached(self):
+        with mock.patch.object(deliverability,
+                               "validate_email_deliverability",
+                               return_value={"mx": [(10, "mx.example.com")]
+                                             }) as resolver:
+            assert deliverability.check_domain_deliverability("example.com")
+            assert deliverability.check_domain_deliverability("example.com")
+        assert resolver.call_count == 1
+
+    @pytest.mark.parametrize("cause", [None, dns.resolver.NXDOMAIN()])
+    def test_undeliverable_domain_is_negatively_cached(self, cause):
+        error = EmailUndeliverableError("no mx")
+        error.__cause__ = cause
+        with mock.patch.object(deliverability,
+                               "validate_email_deliverability",
+                               side_effect=error) as resolver:
+            assert deliverability.check_domain_deliverability(
+                "nowhere-mail.com") is False
+        deliverability.clear_local_cache()
+        with pytest.raises(EmailUndeliverableError):
+            _validate_email("someone@nowhere-mail.com",
+                            policy=deliverability.CACHED)
+        assert resolver.call_count == 1
+
+    def test_resolver_timeout_is_not_cached(self):
+        with mock.patch.object(
+                deliverability,
+                "validate_email_deliverability",
+                return_value={"unknown-deliverability": "timeout"
+                              }) as resolver:
+            assert deliverability.check_domain_deliverability(
+                "slow.test") is None
+            assert deliverability.check_domain_deliverability(
+                "slow.test") is None
+        assert resolver.call_count == 2
+
+    @pytest.mark.parametrize(
+        "cause", [dns.exception.Timeout(),
+                  OSError("network unreachable")])
+    def test_resolver_error_is_not_cached(self, cause):
+        error = EmailUndeliverableError("error while checking")
+        error.__cause__ = cause
+        with mock.patch.object(deliverability,
+                               "validate_email_deliverability",
+                               side_effect=error) as resolver:
+            assert deliverability.check_domain_deliverability(
+                "flaky.test") is None
+            assert deliverability.check_domain_deliverability(
+                "flaky.test") is None
+        assert resolver.call_count == 2
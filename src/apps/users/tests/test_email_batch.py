@@ -0,0 +1,174 @@
+from ..services import email_batch
+from ..services.email_batch import (build_batch_payloads, dispatch_batch,
+                                    queue_email, flush_buffer)
+from ..services.email_service import reset_email_client
+from ..services.fake_sendgrid import FakeSendGridServer
+from ..services.templates_service import (genrate_context_for_otp,
+                                          generate_context_for_password_reset)
+from ..helpers import _send_email_to_user
+
+from unittest import mock
+from collections import deque
+import pytest
+
+
+def _otp_context(index, code=None):
+    email = f"user{index}@gmail.com"
+    context = genrate_context_for_otp(code=code or f"{index:06d}",
+                                      verification_url=f"https://x.io/?t={index}",
+                                      email=email)
+    context["to_email"] = email
+    return context
+
+
+class ListBuffer:
+    """The Redis buffer's interface over a list."""
+
+    def __init__(self):
+        self.messages = deque()
+
+    def push(self, context):
+        self.messages.append(context)
+
+    def pop_batch(self, size):
+        return [
+            self.messages.popleft()
+            for _ in range(min(size, len(self.messages)))
+        ]
+
+    def __len__(self):
+        return len(self.messages)
+
+
+@pytest.fixture
+def shared_buffer(monkeypatch):
+    buffer = ListBuffer()
+    monkeypatch.setattr(email_batch, "get_email_buffer", lambda: buffer)
+    # keep the window open, the test flushes it
+    monkeypatch.setattr(email_batch, "schedule_flush", lambda: None)
+    return buffer
+
+
+@pytest.fixture
+def fake_sendgrid(settings):
+    with FakeSendGridServer() as server:
+        settings.SENDGRID_API_HOST = server.url
+        settings.EMAIL_SEND_RETRIES = 2
+        settings.EMAIL_RETRY_BASE_DELAY = 0
+        reset_email_client()
+        yield server
+    reset_email_client()
+
+
+class TestBatchPayloads:
+
+    def test_groups_by_template_and_substitutes(self):
+        contexts = [_otp_context(index) for index in range(3)]
+        contexts.append(_otp_context(3, code="<b>1</b>"))
+        contexts.append(
+            generate_context_for_password_reset(code="1",
+                                                email="user0@gmail.com",
+                                                name="Ada"))
+        contexts[-1]["to_email"] = "user0@gmail.com"
+
+        payloads = build_batch_payloads(contexts)
+
+        assert sorted(len(members) for _, members in payloads) == [1, 4]
+        payload = next(payload for payload, members in payloads
+                       if len(members) == 4)
+        html = payload["content"][0]["value"]
+        assert "%code%" in html and "000001" not in html
+        codes = {
+            p["to"][0]["email"]: p["substitutions"]["%code%"]
+            for p in payload["personalizations"]
+        }
+        assert codes == {
+            "user0@gmail.com": "000000",
+            "user1@gmail.com": "000001",
+            "user2@gmail.com": "000002",
+            "user3@gmail.com": "&lt;b&gt;1&lt;/b&gt;",
+        }
+
+    def test_falsy_values_render_apart(self):
+        # `name|default:email` must pick the same branch for a whole request
+        contexts = []
+        for index, name in enumerate(["Ada", None]):
+            context = generate_context_for_password_reset(
+                code="1", email=f"user{index}@gmail.com", name=name)
+            context["to_email"] = context["email"]
+            contexts.append(context)
+        assert len(build_batch_payloads(contexts)) == 2
+
+
+class TestDispatch:
+
+    def test_one_call_per_template_with_retry(self, fake_sendgrid):
+        fake_sendgrid.throttle_every = 2
+        contexts = [_otp_context(index) for index in range(5)]
+        contexts.append(
+            generate_context_for_password_reset(code="1",
+                                                email="user0@gmail.com",
+                                                name="Ada"))
+        contexts[-1]["to_email"] = "user0@gmail.com"
+
+        result = dispatch_batch(contexts)
+
+        assert result == {"sent": 6, "failed": 0, "calls": 2}
+        # the throttled call was retried on the same pooled connection
+        assert fake_sendgrid.calls == 3
+        assert fake_sendgrid.recipients == 6
+        assert fake_sendgrid.connections == 1
+
+    @pytest.mark.django_db
+    def test_queued_emails_are_flushed(self, fake_sendgrid, shared_buffer,
+                                       user,
+                                       django_capture_on_commit_callbacks):
+        context = _otp_context(0)
+        context["email"] = user.email
+        with django_capture_on_commit_callbacks(execute=True):
+            _send_email_to_user(context)
+            assert len(shared_buffer) == 0
+        queue_email(_otp_context(1))
+        assert len(shared_buffer) == 2 and fake_sendgrid.calls == 0
+
+        assert flush_buffer() == {"sent": 2, "failed": 0, "calls": 1}
+        assert len(shared_buffer) == 0
+        assert fake_sendgrid.recipients == 2
+
+    def test_failed_batch_is_sent_one_by_one(self, fake_sendgrid,
+                                             shared_buffer):
+        fake_sendgrid.throttle_every = 1
+        for index in range(2):
+            queue_email(_otp_context(index))
+        with mock.patch(
+                "apps.users.services.tasks.send_email_on_quene.delay") as task:
+            assert flush_buffer() == {"sent": 0, "failed": 2, "calls": 1}
+        assert [call.args[0]["to_email"] for call in task.call_args_list
+                ] == ["user0@gmail.com", "user1@gmail.com"]
+
+    def test_no_batching_without_a_shared_buffer(self):
+        # the test cache is process local, a worker could never drain it
+        assert email_batch.get_email_buffer() is None
+        with mock.patch(
+                "apps.users.services.tasks.send_email_on_quene.delay") as task:
+            queue_email(_otp_context(0))
+        task.assert_called_once()
+
+    def test_failed_schedule_keeps_the_buffered_message(self, monkeypatch):
+        buffer = ListBuffer()
+        monkeypatch.setattr(email_batch, "get_email_buffer", lambda: buffer)
+        cache = email_batch._cache()
+        cache.delete(email_batch.SCHEDULED_KEY)
+        with mock.patch(
+                "apps.users.services.tasks.send_email_on_quene.delay"
+        ) as task, mock.patch(
+                "apps.users.services.tasks.flush_email_batch.apply_async",
+                side_effect=ConnectionError) as schedule:
+            queue_email(_otp_context(0))
+            assert cache.get(email_batch.SCHEDULED_KEY) is None
+            schedule.side_effect = None
+            queue_email(_otp_context(1))
+        # sent once, by the flush, never on its own as well
+        task.assert_not_called()
+        assert len(buffer) == 2 and schedule.call_count == 2
+        cache.delete(email_batch.SCHEDULED_KEY)
@@ -0,0 +1,59 @@
+from ..services.email_render import render_email, clear_render_cache
+from ..services import email_render
+from ..services.templates_service import (genrate_context_for_otp,
+                                          generate_context_for_password_reset)
+
+from django.template.loader import render_to_string
+
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def render_cache():
+    clear_render_cache()
+    yield
+    clear_render_cache()
+
+
+def _reset_context(index, name):
+    context = generate_context_for_password_reset(
+        code=f"{index:06d}",
+        verification_url=f"https://x.io/?token={index}&a=<b>",
+        email=f"user{index}@gmail.com",
+        name=name)
+    context["app_name"] = "SkillSpeed"
+    return context
+
+
+class TestEmailRender:
+
+    @pytest.mark.parametrize("name", ["Ada & <Bob>", None, ""])
+    def test_matches_full_render(self, name):
+        for index in range(3):
+            context = _reset_context(index, name)
+            assert render_email(context) == render_to_string(
+                context["template_name"], context)
+
+    def test_template_compiled_once_per_layout(self):
+        with mock.patch.object(email_render.CompiledEmail,
+                               "compile",
+                               wraps=email_render.CompiledEmail.compile) as compile:
+            for index in range(5):
+                context = genrate_context_for_otp(code=str(index),
+                                                  verification_url="u",
+                                                  email=f"{index}@gmail.com")
+                context["app_name"] = "SkillSpeed"
+                render_email(context)
+            render_email(_reset_context(0, "Ada"))
+            # a falsy name takes the other branch of `default`
+            render_email(_reset_context(1, None))
+        assert compile.call_count == 3
+
+    def test_unsplittable_template_renders_in_full(self):
+        context = _reset_context(0, "Ada")
+        with mock.patch.object(email_render.CompiledEmail, "compile",
+                               return_value=None):
+            html = render_email(context)
+        assert html == render_to_string(context["template_name"], context)
@@ -0,0 +1,64 @@
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management import call_command
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+from io import StringIO
+
+TUNED_PBKDF2 = "apps.users.hashers.TunedPBKDF2PasswordHasher"
+TUNED_SCRYPT = "apps.users.hashers.TunedScryptPasswordHasher"
+
+
+@pytest.mark.django_db
+class TestPasswordHashers:
+
+    def test_login_rehashes_to_tuned_cost(self, api_client: APIClient, user,
+                                          settings):
+        # the factory user was hashed with the MD5 test hasher
+        settings.PASSWORD_HASHERS = [
+            TUNED_PBKDF2, "django.contrib.auth.hashers.MD5PasswordHasher"
+        ]
+        settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+        login_path = "/api/v1/auth/token/obtain/"
+        request_data = {"email": user.email, "password": "secure_password"}
+
+        response = api_client.post(path=login_path, data=request_data)
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$1000$")
+
+        settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+        response = api_client.post(path=login_path, data=request_data)
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+
+    def test_scrypt_verifies_after_a_cost_reduction(self, settings):
+        settings.PASSWORD_HASHERS = [TUNED_SCRYPT]
+        settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**16
+        encoded = make_password("secure_password")
+        assert encoded.startswith("scrypt$65536$")
+
+        settings.PASSWORD_SCRYPT_WORK_FACTOR = 2**14
+        assert check_password("secure_password", encoded)
+        assert not check_password("wrong_password", encoded)
+
+    def test_tune_command_writes_env_file(self, tmp_path):
+        env_file = tmp_path / ".env"
+        env_file.write_text('DEBUG="False"\nPASSWORD_PBKDF2_ITERATIONS="1"\n')
+        out = StringIO()
+        call_command("tune_password_hashers",
+                     "--target-ms=1",
+                     "--rounds=1",
+                     "--min-pbkdf2-iterations=1000",
+                     "--min-scrypt-work-factor=1024",
+                     "--max-scrypt-work-factor=1024",
+                     f"--env-file={env_file}",
+                     stdout=out)
+        written = env_file.read_text()
+        assert 'DEBUG="False"' in written
+        assert written.count("PASSWORD_PBKDF2_ITERATIONS") == 1
+        assert 'PASSWORD_SCRYPT_WORK_FACTOR="1024"' in written
+        assert TUNED_PBKDF2 in written
@@ -0,0 +1,105 @@
+from ..services.importer import UserImporter, read_rows, CSV, JSONL
+from ..outbox.models import OutboxMessage
+from ..models import UserImport
+from ..services.tasks import relay_outbox, run_user_import
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import pytest
+from io import StringIO
+
+User = get_user_model()
+
+CSV_ROWS = """email,first_name,last_name,password,user_role
+ada@gmail.com,ada,lovelace,secure_password,guardian
+alan@gmail.com,alan,turing,,instructor
+ada@gmail.com,ada,again,secure_password,
+not-an-email,bad,row,secure_password,
+grace@gmail.com,grace,,secure_password,
+"""
+
+
+def _verification_batches():
+    return list(
+        OutboxMessage.objects.filter(
+            task__endswith="send_registration_verifications").values_list(
+                "args", flat=True))
+
+
+@pytest.mark.django_db
+class TestUserImporter:
+
+    def test_csv_import_batches_verification(self, user):
+        rows = CSV_ROWS + f"{user.email},existing,user,secure_password,\n"
+        result = UserImporter(workers=2, chunk_size=2).run(
+            read_rows(StringIO(rows), CSV))
+
+        assert result.created == 2
+        assert result.skipped == 2
+        assert [error["line"] for error in result.errors] == [5, 6]
+        ada = User.objects.get(email="ada@gmail.com")
+        assert ada.check_password("secure_password")
+        assert ada.user_role == User.UserRoles.GUARDIAN
+        assert not ada.is_verified
+        assert not User.objects.get(
+            email="alan@gmail.com").has_usable_password()
+        # one batched job for the whole file, no per-row signal
+        batches = _verification_batches()
+        assert len(batches) == 1
+        assert sorted(batches[0][0]) == sorted(
+            str(pk) for pk in User.objects.filter(
+                email__in=["ada@gmail.com", "alan@gmail.com"]).values_list(
+                    "pk", flat=True))
+
+    def test_verified_jsonl_import_sends_nothing(self):
+        rows = ('{"email": "kid@gmail.com", "first_name": "k", '
+                '"last_name": "id"}\n\nnot json\n')
+        result = UserImporter(workers=1, verified=True).run(
+            read_rows(StringIO(rows), JSONL))
+        assert result.created == 1 and result.errors[0]["line"] == 3
+        assert User.objects.get(email="kid@gmail.com").is_verified
+        assert _verification_batches() == []
+
+    def test_import_command(self, tmp_path):
+        path = tmp_path / "school.csv"
+        path.write_text(CSV_ROWS)
+        out = StringIO()
+        call_command("import_users", str(path), "--workers=1", stdout=out)
+        assert "Created 2 users" in out.getvalue()
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestUserImportApi:
+    import_path = "/api/v1/auth/users/import/"
+
+    def test_admin_upload(self, admin_client: APIClient):
+        upload = SimpleUploadedFile("school.csv", CSV_ROWS.encode(),
+                                    content_type="text/csv")
+        response = admin_client.post(self.import_path, {"file": upload},
+                                     format="multipart")
+        # queued, the request never runs the import
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        import_id = response.json()["detail"]["import_id"]
+        assert not User.objects.filter(email="ada@gmail.com").exists()
+
+        relay_outbox()
+        response = admin_client.get(f"{self.import_path}{import_id}/")
+        detail = response.json()["detail"]
+        assert detail["state"] == UserImport.Status.DONE
+        assert detail["result"]["created"] == 2
+        assert UserImport.objects.get(pk=import_id).content == ""
+        # a second delivery of the outbox message finds the job claimed
+        assert run_user_import(import_id) is None
+
+    def test_requires_admin(self, authenticated_client: APIClient):
+        upload = SimpleUploadedFile("school.csv", CSV_ROWS.encode())
+        response = authenticated_client.post(self.import_path,
+                                             {"file": upload},
+                                             format="multipart")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -2,7 +2,9 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
 
 from ..models import OneTimePassword
+from ..services.tasks import relay_outbox
 
+from unittest import mock
 import pytest
 
 
@@ -13,8 +15,10 @@ class TestModel:
     email = "test_user@gmail.com"
 
     def test_customuser_model(self):
-        user = self.User.objects.create_user(email=self.email,
-                                             password=self.password)
+        with mock.patch("apps.users.services.tasks._send_mail_base"):
+            user = self.User.objects.create_user(email=self.email,
+                                                 password=self.password)
+            relay_outbox()
 
         assert check_password(self.password, user.password)
         assert self.email == user.email
@@ -0,0 +1,59 @@
+from ..outbox.models import OutboxMessage
+from ..outbox.relay import enqueue, relay_pending
+from ..services.tasks import verify_email_deliverability
+
+from django.db import transaction
+from django.utils import timezone
+
+from unittest import mock
+
+import pytest
+
+TASK = "apps.users.services.tasks.verify_email_deliverability"
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_rolled_back_write_sends_nothing(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue(verify_email_deliverability, "ada@gmail.com")
+                raise RuntimeError
+        assert not OutboxMessage.objects.exists()
+
+    def test_duplicate_key_is_dropped(self):
+        for _ in range(2):
+            enqueue(TASK, "ada@gmail.com", dedup_key="deliverability:ada")
+        assert OutboxMessage.objects.count() == 1
+
+    def test_relay_dispatches_once(self):
+        enqueue(TASK, "ada@gmail.com")
+        with mock.patch("apps.users.services.tasks."
+                        "verify_email_deliverability.run") as run:
+            stats = relay_pending()
+            assert relay_pending()["dispatched"] == 0
+        run.assert_called_once_with("ada@gmail.com")
+        assert stats["dispatched"] == 1 and stats["lag_seconds"] == 0
+        assert OutboxMessage.objects.get().dispatched_at is not None
+
+    def test_failed_send_backs_off(self):
+        enqueue(TASK, "ada@gmail.com")
+        with mock.patch("celery.canvas.Signature.apply_async",
+                        side_effect=ConnectionError("broker down")):
+            stats = relay_pending()
+        message = OutboxMessage.objects.get()
+        assert stats["failed"] == 1 and stats["dispatched"] == 0
+        assert message.attempts == 1 and "broker down" in message.last_error
+        assert message.available_at > timezone.now()
+        assert stats["lag_seconds"] >= 0
+        # not due yet, so the next run leaves it alone
+        assert relay_pending()["failed"] == 0
+
+    def test_dispatched_messages_are_purged(self, settings):
+        settings.OUTBOX_RETENTION_HOURS = 1
+        OutboxMessage.objects.create(task=TASK,
+                                     dispatched_at=timezone.now() -
+                                     timezone.timedelta(hours=2))
+        assert relay_pending()["purged"] == 1
+        assert not OutboxMessage.objects.exists()
@@ -1,7 +1,16 @@
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests_config.factories import (UserFactory, GuardianFactory,
+                                    InstructorFactory, ChildProfileFactory)
+from ..profiles.models import ChildInterest, Certificates
+from ..profiles.resolver import resolve_profile, resolve_user_profile
+
 import pytest
+import uuid
 from typing import Any
 
 
@@ -120,3 +129,97 @@ class TestUsers:
         result = response.json()
         assert result["status"] == "success"
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestProfileResolver:
+
+    def test_guardian_in_one_query(self, guardian, django_assert_num_queries):
+        # the join, then the (empty) children prefetch
+        with django_assert_num_queries(2):
+            profile = resolve_profile(guardian.pk)
+        assert profile == guardian
+
+    def test_instructor_in_one_query(self, instructor,
+                                     django_assert_num_queries):
+        Certificates.objects.create(user=instructor,
+                                    name="certificate",
+                                    issued_by="board")
+        # the join, children and certificates prefetches
+        with django_assert_num_queries(3):
+            profile = resolve_profile(str(instructor.pk))
+            assert len(profile.certificates.all()) == 1
+        assert profile == instructor
+
+    def test_inactive_or_unknown_profile(self, guardian, instructor_user):
+        guardian.is_deleted = True
+        guardian.save()
+        assert resolve_profile(guardian.pk) is None
+        assert resolve_profile(uuid.uuid4()) is None
+        assert resolve_user_profile(instructor_user) is None
+
+    def test_missing_profile_is_404(self, instructor_client: APIClient):
+        response = instructor_client.get(f"/api/v1/profile/{uuid.uuid4()}/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["status"] == "failed"
+
+
+def _populate_directory(count):
+    for index in range(count):
+        guardian = GuardianFactory(user=UserFactory(user_role="GUARDIAN"))
+        child = ChildProfileFactory(guardian=guardian.user)
+        ChildInterest.objects.create(child=child,
+                                     name=f"interest{index}",
+                                     description="")
+        instructor = InstructorFactory(user=UserFactory(
+            user_role="INSTRUCTOR"))
+        Certificates.objects.create(user=instructor,
+                                    name=f"certificate{index}",
+                                    issued_by="board")
+
+
+@pytest.mark.django_db
+class TestProfileDirectory:
+    path = "/api/v1/profile/directory/"
+
+    def _page_queries(self, client, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.path, {"page_size": page_size})
+        assert response.status_code == status.HTTP_200_OK
+        return response.json(), len(queries)
+
+    def test_query_count_is_constant(self, admin_client: APIClient):
+        _populate_directory(6)
+        # warm the authentication caches
+        admin_client.get(self.path)
+        small, small_queries = self._page_queries(admin_client, 2)
+        large, large_queries = self._page_queries(admin_client, 12)
+        assert len(small["detail"]) == 2 and len(large["detail"]) == 12
+        # users joined to their profiles, then children, interests and
+        # certificates
+        assert small_queries == large_queries == 4
+
+        roles = {entry["user_role"] for entry in large["detail"]}
+        assert roles == {"GUARDIAN", "INSTRUCTOR"}
+        guardian = next(entry["profile"] for entry in large["detail"]
+                        if entry["user_role"] == "GUARDIAN")
+        child = guardian["children"][0]
+        assert child["interests"][0]["name"].startswith("interest")
+        assert child["guardian"]["email"] == guardian["user"]["email"]
+        instructor = next(entry["profile"] for entry in large["detail"]
+                          if entry["user_role"] == "INSTRUCTOR")
+        assert len(instructor["certificates"]) == 1
+
+    def test_pages_follow_the_cursor(self, admin_client: APIClient):
+        _populate_directory(3)
+        seen = []
+        url = f"{self.path}?page_size=4"
+        while url:
+            result = admin_client.get(url).json()
+            seen.extend(entry["user_id"] for entry in result["detail"])
+            url = result["next"]
+        assert len(seen) == len(set(seen)) == 6
+
+    def test_guardians_cannot_list(self, guardian_client: APIClient):
+        response = guardian_client.get(self.path)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,70 @@
+from ..services.registration import bulk_registration
+from ..services.tasks import relay_outbox
+from ..models import OneTimePassword
+from ..outbox.models import OutboxMessage
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from unittest import mock
+import pytest
+
+User = get_user_model()
+
+
+@pytest.fixture
+def send_mail():
+    with mock.patch("apps.users.services.tasks._send_mail_base") as sender, \
+            mock.patch("apps.users.services.tasks.check_domain_deliverability",
+                       return_value=True):
+        yield sender
+
+
+@pytest.mark.django_db
+class TestRegistrationPipeline:
+
+    def test_registration_defers_code_and_email(self, api_client: APIClient,
+                                                send_mail):
+        request_data = {
+            "email": "deferred@gmail.com",
+            "first_name": "test_user",
+            "last_name": "test_user_last",
+            "password": "secure_password",
+            "confirm_password": "secure_password"
+        }
+        response = api_client.post(path="/api/v1/auth/register/",
+                                   data=request_data)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not OneTimePassword.objects.filter(
+            user__email="deferred@gmail.com").exists()
+        send_mail.assert_not_called()
+        assert OutboxMessage.objects.filter(
+            dispatched_at__isnull=True).count() == 2
+
+        stats = relay_outbox()
+        assert stats["dispatched"] == 2 and stats["lag_seconds"] == 0
+        assert OneTimePassword.objects.filter(
+            user__email="deferred@gmail.com", is_active=True).count() == 1
+        assert send_mail.call_count == 1
+        assert send_mail.call_args.kwargs["context"][
+            "to_email"] == "deferred@gmail.com"
+
+    def test_bulk_registration_queues_one_job(self, send_mail):
+        with bulk_registration():
+            for index in range(3):
+                User.objects.create_user(email=f"bulk{index}@gmail.com",
+                                         password="secure_password")
+        message = OutboxMessage.objects.get()
+        assert message.task.endswith("send_registration_verifications")
+        assert len(message.args[0]) == 3
+        send_mail.assert_not_called()
+
+    def test_bulk_registration_without_notify(self, send_mail):
+        with bulk_registration(notify=False):
+            User.objects.create_user(email="silent@gmail.com",
+                                     password="secure_password")
+        assert not OutboxMessage.objects.exists()
+        relay_outbox()
+        assert not OneTimePassword.objects.filter(
+            user__email="silent@gmail.com").exists()
@@ -0,0 +1,83 @@
+from ..services.signed_links import (make_verification_token,
+                                     make_reset_token,
+                                     resolve_verification_token,
+                                     resolve_reset_token)
+from ..models import PasswordReset
+from ..services.tasks import relay_outbox
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from unittest import mock
+import pytest
+
+RESET_CONFIRM_PATH = "/api/v1/auth/password/reset/confirm/"
+NEW_PASSWORD = {
+    "password": "secure_password30",
+    "confirm_password": "secure_password30"
+}
+
+
+@pytest.mark.django_db
+class TestSignedLinks:
+
+    def test_links_are_bound_to_their_purpose(self, user):
+        token = make_reset_token(user)
+        assert resolve_reset_token(token) == user
+        assert resolve_verification_token(token) is None
+        assert resolve_reset_token(token[:-2] + "xx") is None
+        assert resolve_reset_token("garbage") is None
+
+    def test_reset_link_expires(self, user, settings):
+        token = make_reset_token(user)
+        settings.PASSWORD_RESET_TIMEOUT = -1
+        assert resolve_reset_token(token) is None
+
+    def test_reset_link_dies_with_password(self, user):
+        token = make_reset_token(user)
+        user.set_password("another_password")
+        user.save()
+        assert resolve_reset_token(token) is None
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestSignedLinkApi:
+
+    def test_verification_link(self, api_client: APIClient,
+                               user_verification):
+        token = make_verification_token(user_verification)
+        response = api_client.get("/api/v1/auth/verify/", {"token": token})
+        assert response.status_code == status.HTTP_200_OK
+        user_verification.refresh_from_db()
+        assert user_verification.is_verified
+        response = api_client.get("/api/v1/auth/verify/", {"token": token})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_link_confirm(self, api_client: APIClient, user,
+                                django_assert_max_num_queries):
+        token = make_reset_token(user)
+        # load the user, then write the password and revoke the emailed
+        # code in one savepoint
+        with django_assert_max_num_queries(5):
+            response = api_client.post(
+                path=f"{RESET_CONFIRM_PATH}?token={token}",
+                data=NEW_PASSWORD)
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.check_password(NEW_PASSWORD["password"])
+        response = api_client.post(path=f"{RESET_CONFIRM_PATH}?token={token}",
+                                   data=NEW_PASSWORD)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_request_stores_only_the_code(self, api_client: APIClient,
+                                                user):
+        response = api_client.post(path="/api/v1/auth/password/reset/",
+                                   data={"email": user.email})
+        assert response.status_code == status.HTTP_200_OK
+        with mock.patch(
+                "apps.users.services.tasks.send_email_on_quene.delay"):
+            relay_outbox()
+        assert PasswordReset.objects.filter(user=user,
+                                            is_active=True).count() == 1
+        assert not user.one_time_codes.exists()
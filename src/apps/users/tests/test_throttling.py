@@ -0,0 +1,128 @@
+from ..throttling import (LocalSlidingWindow, RedisSlidingWindow,
+                          get_sliding_window, parse_rate)
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.contrib.auth import base_user
+
+import pytest
+from unittest import mock
+
+LOGIN_PATH = "/api/v1/auth/token/obtain/"
+
+
+@pytest.fixture
+def rate_limits(settings):
+    settings.AUTH_RATE_LIMITS = {
+        "login": {
+            "ip": "5/m",
+            "email": "2/m"
+        },
+        "code_resend": {
+            "ip": "1/h"
+        },
+        "code_verify": {
+            "ip": "2/h"
+        },
+        "password_reset_confirm": {
+            "ip": "2/h"
+        },
+    }
+    get_sliding_window().clear()
+    yield settings.AUTH_RATE_LIMITS
+    get_sliding_window().clear()
+
+
+class TestSlidingWindow:
+
+    def test_parse_rate(self):
+        assert parse_rate("5/m") == (5, 60)
+        assert parse_rate("20/hour") == (20, 3600)
+
+    def test_window_slides(self):
+        window = LocalSlidingWindow()
+        with mock.patch("apps.users.throttling.time.monotonic") as clock:
+            clock.return_value = 100.0
+            assert window.hit("key", 2, 10) == 0
+            clock.return_value = 105.0
+            assert window.hit("key", 2, 10) == 0
+            assert window.hit("key", 2, 10) == pytest.approx(5.0)
+            clock.return_value = 110.5
+            # the first hit left the window, the second still counts
+            assert window.hit("key", 2, 10) == 0
+            assert window.hit("key", 2, 10) > 0
+
+    def test_redis_failure_falls_back_to_local(self):
+        local = LocalSlidingWindow()
+        # the locmem test cache has no redis client
+        window = RedisSlidingWindow("default", local)
+        assert window.hit("key", 1, 60) == 0
+        assert window.hit("key", 1, 60) > 0
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestAuthRateLimits:
+
+    def test_login_limited_per_email_before_hashing(self,
+                                                    api_client: APIClient,
+                                                    user, rate_limits):
+        request_data = {"email": user.email, "password": "wrong_password"}
+        for _ in range(2):
+            response = api_client.post(path=LOGIN_PATH, data=request_data)
+            assert response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+        with mock.patch.object(base_user, "check_password") as hasher:
+            response = api_client.post(path=LOGIN_PATH,
+                                       data={
+                                           "email": user.email.upper(),
+                                           "password": "secure_password"
+                                       })
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response["Retry-After"]) > 0
+        hasher.assert_not_called()
+
+        response = api_client.post(path=LOGIN_PATH,
+                                   data={
+                                       "email": "other@gmail.com",
+                                       "password": "secure_password"
+                                   })
+        assert response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_login_limited_per_ip(self, api_client: APIClient, rate_limits):
+        responses = [
+            api_client.post(path=LOGIN_PATH,
+                            data={
+                                "email": f"user{index}@gmail.com",
+                                "password": "secure_password"
+                            }).status_code for index in range(6)
+        ]
+        assert status.HTTP_429_TOO_MANY_REQUESTS not in responses[:5]
+        assert responses[5] == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_code_resend_limited(self, api_client: APIClient, user,
+                                 rate_limits):
+        resend_path = "/api/v1/auth/code/resend/"
+        with mock.patch("apps.users.views.enqueue") as issue:
+            first = api_client.post(path=resend_path,
+                                    data={"email": user.email})
+            second = api_client.post(path=resend_path,
+                                     data={"email": user.email})
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert issue.call_count == 1
+
+    @pytest.mark.parametrize("method, path, data", [
+        ("get", "/api/v1/auth/verify/", {"code": "123456"}),
+        ("post", "/api/v1/auth/password/reset/confirm/", {
+            "code": "123456",
+            "password": "secure_password",
+            "confirm_password": "secure_password"
+        }),
+    ])
+    def test_code_guesses_limited(self, api_client: APIClient, rate_limits,
+                                  method, path, data):
+        send = getattr(api_client, method)
+        responses = [send(path, data).status_code for _ in range(3)]
+        assert status.HTTP_429_TOO_MANY_REQUESTS not in responses[:2]
+        assert responses[2] == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,162 @@
+from rest_framework.throttling import BaseThrottle
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+from collections import defaultdict, deque
+import threading
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+# trims the window, then records the hit only while under the limit;
+# returns 0 when allowed, else milliseconds until the oldest hit leaves
+_SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+if redis.call("ZCARD", key) < limit then
+    redis.call("ZADD", key, now, ARGV[4])
+    redis.call("PEXPIRE", key, window)
+    return 0
+end
+local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+return math.max(1, tonumber(oldest[2]) + window - now)
+"""
+
+
+def parse_rate(rate: str) -> tuple:
+    """``"5/m"`` or ``"20/hour"`` to ``(5, 60)``."""
+    num, period = rate.split("/")
+    return int(num), _PERIODS[period.strip()[0]]
+
+
+class LocalSlidingWindow:
+    """
+    In-process sliding window, per worker process only.
+
+    Used when no Redis cache is configured and as a fallback while Redis
+    is unreachable.
+    """
+
+    def __init__(self):
+        self._hits = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits[key]
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) < limit:
+                hits.append(now)
+                return 0
+            return hits[0] + window - now
+
+    def clear(self):
+        with self._lock:
+            self._hits.clear()
+
+
+class RedisSlidingWindow:
+    """Sliding window kept in a Redis sorted set, updated by one Lua call."""
+
+    def __init__(self, cache_alias: str, fallback: LocalSlidingWindow):
+        self.cache_alias = cache_alias
+        self.fallback = fallback
+        self._scripts = {}
+
+    def _script(self, client):
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = self._scripts[id(client)] = client.register_script(
+                _SLIDING_WINDOW_SCRIPT)
+        return script
+
+    def hit(self, key: str, limit: int, window: int) -> float:
+        cache = caches[self.cache_alias]
+        key = cache.make_and_validate_key(key)
+        try:
+            client = cache._cache.get_client(key, write=True)
+            wait_ms = self._script(client)(
+                keys=[key],
+                args=[int(time.time() * 1000), window * 1000, limit,
+                      uuid.uuid4().hex])
+        except Exception:
+            logger.warning("Rate limit store unavailable, limiting locally",
+                           exc_info=True)
+            return self.fallback.hit(key, limit, window)
+        return int(wait_ms) / 1000
+
+
+_local_window = LocalSlidingWindow()
+_windows = {}
+
+
+def get_sliding_window():
+    alias = getattr(settings, "AUTH_RATE_LIMIT_CACHE", "default")
+    window = _windows.get(alias)
+    if window is None:
+        if isinstance(caches[alias], RedisCache):
+            window = RedisSlidingWindow(alias, _local_window)
+        else:
+            window = _local_window
+        _windows[alias] = window
+    return window
+
+
+def _rate_limits() -> dict:
+    return getattr(settings, "AUTH_RATE_LIMITS", {})
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Per-IP and per-email sliding window limits for the auth endpoints.
+
+    Views set ``throttle_scope``; the limits for a scope come from
+    ``AUTH_RATE_LIMITS``, e.g. ``{"login": {"ip": "20/m", "email": "5/m"}}``.
+    DRF checks throttles before the handler runs, so a rejected call never
+    reaches the serializer, the password hasher or the mail queue.
+    """
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        limits = _rate_limits().get(getattr(view, "throttle_scope", None))
+        if not limits:
+            return True
+        scope = view.throttle_scope
+        window = get_sliding_window()
+        for ident_kind, rate in limits.items():
+            ident = self.get_identity(request, ident_kind)
+            if ident is None:
+                continue
+            limit, period = parse_rate(rate)
+            wait = window.hit(f"rl:{scope}:{ident_kind}:{ident}", limit,
+                              period)
+            if wait:
+                self.wait_seconds = wait
+                logger.info("Rate limited %s by %s", scope, ident_kind)
+                return False
+        return True
+
+    def get_identity(self, request, ident_kind):
+        if ident_kind == "ip":
+            return self.get_ident(request)
+        if ident_kind == "email":
+            email = request.data.get("email") if hasattr(
+                request.data, "get") else None
+            if isinstance(email, str) and email.strip():
+                return email.strip().lower()
+            return None
+        raise ValueError(f"Unknown rate limit identity '{ident_kind}'")
+
+    def wait(self):
+        return self.wait_seconds
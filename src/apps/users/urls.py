@@ -20,6 +20,12 @@ urlpatterns = [
     path("auth/code/resend/",
          views.OneTimePasswordResendView.as_view(),
          name="code_resend"),
+    path("auth/users/import/",
+         views.UserImportView.as_view(),
+         name="users_import"),
+    path("auth/users/import/<uuid:import_id>/",
+         views.UserImportView.as_view(),
+         name="users_import_status"),
     path("auth/token/obtain/", token_obtain_view, name="login"),
     path("auth/logout/", custom_logout_view, name="logout")
 ]
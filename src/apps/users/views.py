@@ -3,25 +3,31 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 
 from .serializers import (UserRegistrationSerializer, User, _,
                           UserVerificationSerializer,
                           OneTimePasswordResendSerializer,
                           PasswordResetRequestSerializer,
                           PasswordResetCodeSerializer,
-                          PasswordResetUrlSerializer)
+                          PasswordResetUrlSerializer, UserImportSerializer)
 from .helpers import (_validate_serializer, _get_user_by_email, _get_code,
-                      _verify_account, _send_email_to_user,
-                      _get_reset_token_or_none, save_user_password,
+                      _verify_account, save_user_password,
                       _get_reset_code_or_none)
-from .models import OneTimePassword
-from .services.helpers import create_otp_for_user, create_password_reset_for_user, _generate_url_for_password_reset
-from .services.templates_service import genrate_context_for_otp, generate_context_for_password_reset
+from .models import OneTimePassword, UserImport
+from .services.code_store import get_code_store
+from .services.signed_links import (resolve_reset_token,
+                                    resolve_verification_token)
+from .services.importer import detect_format
+from .services.tasks import (run_user_import, send_password_reset,
+                             send_registration_verification)
+from .outbox.relay import enqueue
+from .throttling import AuthRateThrottle
 
 from django.db import transaction
+from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils import timezone
-from django.contrib.auth.tokens import PasswordResetTokenGenerator
 
 import logging
 
@@ -33,6 +39,8 @@ class RegisterViewSet(viewsets.ModelViewSet):
     http_method_names = ["post"]
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "register"
 
     @method_decorator(transaction.atomic)
     def create(self, request, *args, **kwargs):
@@ -50,6 +58,10 @@ class RegisterViewSet(viewsets.ModelViewSet):
 class CodeUrlVerificationViewSet(viewsets.ModelViewSet):
     http_method_names = ["post", "get"]
     serializer_class = UserVerificationSerializer
+    # ``?code=`` is looked up across every pending user, the limit keeps
+    # the six digit space out of reach
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "code_verify"
 
     def get_permissions(self):
         if self.action == "retrieve":
@@ -82,7 +94,31 @@ class CodeUrlVerificationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return OneTimePassword.objects.select_related("users")
 
+    def _verify_by_link(self, token):
+        user = resolve_verification_token(token)
+        if user is None:
+            return Response(
+                {
+                    "status": "Failed",
+                    "detail": "Verification link is invalid or expired"
+                },
+                status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            user.verify_account()
+            # the emailed code must not outlive the link that replaced it
+            get_code_store().revoke_otp(user)
+        return Response(
+            {
+                "status": "success",
+                "detail": "Account Verification Completed Successfully"
+            },
+            status=status.HTTP_200_OK)
+
     def list(self, request, *args, **kwargs):
+        token = request.query_params.get("token", None)
+        if token is not None:
+            # signed link from the verification email, see signed_links
+            return self._verify_by_link(token)
         code = request.query_params.get("code", None)
         if code is None:
             return Response(
@@ -127,6 +163,8 @@ class CodeUrlVerificationViewSet(viewsets.ModelViewSet):
 class OneTimePasswordResendView(APIView):
     http_method_names = ["post"]
     serializer_class = OneTimePasswordResendSerializer
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "code_resend"
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -135,9 +173,10 @@ class OneTimePasswordResendView(APIView):
         email = validated_data.get("email")
         try:
             user = _get_user_by_email(email)
-            code = create_otp_for_user(user)
-            context = genrate_context_for_otp(code=code, email=user.email)
-            _send_email_to_user(context=context)
+            if user is None:
+                raise User.DoesNotExist
+            # the worker issues the code, the outbox only holds the user id
+            enqueue(send_registration_verification, str(user.pk))
             logger.info("code_resend_request", extra={"email": email})
         except User.DoesNotExist:
             logger.info(
@@ -164,6 +203,8 @@ class OneTimePasswordResendView(APIView):
 class PasswordResetViewSet(viewsets.ModelViewSet):
     http_method_names = ["post"]
     serializer_class = PasswordResetRequestSerializer
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "password_reset"
 
     @method_decorator(transaction.atomic)
     def create(self, request, *args, **kwargs):
@@ -172,18 +213,9 @@ class PasswordResetViewSet(viewsets.ModelViewSet):
         email = valid_serializer.validated_data.get("email")
         try:
             user = _get_user_by_email(email)
-            code = create_otp_for_user(user)
-            token = create_password_reset_for_user(user, code=code)
-
-            url = _generate_url_for_password_reset(token)
-
-            context = generate_context_for_password_reset(
-                code=code,
-                verification_url=url,
-                email=user.email,
-                name=user.get_full_name_or_none(),
-            )
-            _send_email_to_user(context=context)
+            if user is None:
+                raise User.DoesNotExist
+            enqueue(send_password_reset, str(user.pk))
             logger.info(
                 "password_reset_requested",
                 extra={
@@ -218,42 +250,29 @@ class PasswordResetViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
-    @action(methods=['post'], detail=False, url_path="confirm")
+    @action(methods=['post'],
+            detail=False,
+            url_path="confirm",
+            throttle_scope="password_reset_confirm")
     def password_comfirm(self, request, *args, **kwargs):
         if "token" in request.query_params:
             serializer = PasswordResetUrlSerializer(data=request.data)
             valid_serializer = _validate_serializer(serializer)
             validated_data = valid_serializer.validated_data
             password = validated_data.get("password")
-            token = request.query_params.get("token")
-            if token is None:
-                return Response(
-                    {
-                        "status": "failed",
-                        "detail": {
-                            "message": "Invalid request"
-                        }
-                    },
-                    status=status.HTTP_400_BAD_REQUEST)
-            token = _get_reset_token_or_none(token=token)
-            if token is None:
-                return Response(
-                    {
-                        "status": "failed",
-                        "deatil": "Invalid request"
-                    },
-                    status=status.HTTP_400_BAD_REQUEST)
-            user = token.user
-            default_token_generator = PasswordResetTokenGenerator()
-            if not default_token_generator.check_token(user,
-                                                       token.reset_token):
+            # the signed link dies with the password hash it was made for
+            user = resolve_reset_token(request.query_params.get("token"))
+            if user is None:
                 return Response(
                     {
                         "status": "failed",
                         "detail": "Invalid request"
                     },
                     status=status.HTTP_400_BAD_REQUEST)
-            save_user_password(user=user, password=password)
+            with transaction.atomic():
+                save_user_password(user=user, password=password)
+                # the code sent with the link would allow a second reset
+                get_code_store().revoke_reset(user)
             return Response(
                 {
                     "status": "success",
@@ -275,7 +294,9 @@ class PasswordResetViewSet(viewsets.ModelViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
         user = code_instance.user
         try:
-            save_user_password(user, password)
+            with transaction.atomic():
+                save_user_password(user, password)
+                get_code_store().consume_reset(code_instance)
         except Exception as exc:
             logger.exception(f"password_reset_failed: {str(exc)}",
                              extra={"email": user.email})
@@ -285,3 +306,61 @@ class PasswordResetViewSet(viewsets.ModelViewSet):
                 "detail": "password_reset_confirmed"
             },
             status=status.HTTP_200_OK)
+
+
+class UserImportView(APIView):
+    """
+    Bulk import users from an uploaded CSV or JSONL file (admins only).
+
+    The import runs on a worker, the upload answers with the id of the
+    ``UserImport`` to poll.
+    """
+    http_method_names = ["get", "post"]
+    serializer_class = UserImportSerializer
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    @method_decorator(transaction.atomic)
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        valid_serializer = _validate_serializer(serializer)
+        upload = valid_serializer.validated_data["file"]
+        try:
+            content = upload.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ValidationError(_("the file must be utf-8 encoded text"))
+        job = UserImport.objects.create(
+            admin=request.user,
+            file_name=upload.name,
+            file_format=detect_format(upload.name),
+            content=content,
+            verified=valid_serializer.validated_data["verified"])
+        enqueue(run_user_import, str(job.pk))
+        logger.info("users_import_queued",
+                    extra={
+                        "import_id": job.pk,
+                        "admin": request.user.pk
+                    })
+        return Response(
+            {
+                "status": "success",
+                "detail": {
+                    "import_id": job.pk,
+                    "state": job.status
+                }
+            },
+            status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request, import_id=None, *args, **kwargs):
+        job = get_object_or_404(UserImport, pk=import_id)
+        return Response(
+            {
+                "status": "success",
+                "detail": {
+                    "import_id": job.pk,
+                    "state": job.status,
+                    "result": job.result,
+                    "finished_at": job.finished_at
+                }
+            },
+            status=status.HTTP_200_OK)
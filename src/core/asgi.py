@@ -8,3 +8,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', os.getenv("DJANGO_SETTINGS_MODULE", "src.core.settings.production"))
 
 application = get_asgi_application()
+
+# load the autocomplete index and start its refresher, see core.wsgi
+from apps.skills.search.autocomplete import warm_autocomplete
+warm_autocomplete()
@@ -18,12 +18,92 @@ SECRET_KEY = env("SECRET_KEY")
 
 SENDGRID_API_KEY = env("SENDGRID_API_KEY")
 SENDGRID_SENDER = env('SENDGRID_SENDER')
+SENDGRID_API_HOST = env("SENDGRID_API_HOST", default="https://api.sendgrid.com")
+
+# batched email dispatch: seconds queued emails wait to be grouped, emails
+# per flush, pooled connections per worker and retries with jittered backoff.
+# EMAIL_BATCH_CACHE must be a Redis cache, emails are sent one by one otherwise
+EMAIL_BATCH_WINDOW = env.int("EMAIL_BATCH_WINDOW", default=2)
+EMAIL_BATCH_MAX = env.int("EMAIL_BATCH_MAX", default=500)
+EMAIL_BATCH_CACHE = env("EMAIL_BATCH_CACHE", default="default")
+EMAIL_POOL_SIZE = env.int("EMAIL_POOL_SIZE", default=10)
+EMAIL_SEND_TIMEOUT = env.int("EMAIL_SEND_TIMEOUT", default=10)
+EMAIL_SEND_RETRIES = env.int("EMAIL_SEND_RETRIES", default=3)
+EMAIL_RETRY_BASE_DELAY = env.float("EMAIL_RETRY_BASE_DELAY", default=0.5)
+EMAIL_RETRY_MAX_DELAY = env.float("EMAIL_RETRY_MAX_DELAY", default=8)
+# compiled email layouts kept per worker
+EMAIL_RENDER_CACHE_SIZE = env.int("EMAIL_RENDER_CACHE_SIZE", default=256)
 
 DJANGO_SETTINGS_MODULE =  env("DJANGO_SETTINGS_MODULE", default="core.settings.development")
 
 AUTH_USER_MODEL = "users.CustomUser"
 
-OTP_LIFE = env("OTP_LIFE", default=10)  # in minutes
+OTP_LIFE = env.int("OTP_LIFE", default=10)  # in minutes
+OTP_MAX_ATTEMPTS = env.int("OTP_MAX_ATTEMPTS", default=5)
+
+# where OTP and password reset codes live:
+# "apps.users.services.code_store.DatabaseCodeStore" (rows swept by beat) or
+# "apps.users.services.code_store.RedisCodeStore" (keys with native TTL)
+USER_CODE_STORE = env("USER_CODE_STORE",
+                      default="apps.users.services.code_store.DatabaseCodeStore")
+USER_CODE_STORE_CACHE = env("USER_CODE_STORE_CACHE", default="default")
+
+# lifetime in seconds of the signed links sent by email
+VERIFICATION_LINK_MAX_AGE = env.int("VERIFICATION_LINK_MAX_AGE",
+                                    default=60 * 60 * 24)
+PASSWORD_RESET_TIMEOUT = env.int("PASSWORD_RESET_TIMEOUT", default=60 * 60)
+
+# beat sweep of database codes: rows deactivated per batch and days an
+# expired code is kept before it is deleted
+CODE_EXPIRY_BATCH_SIZE = env.int("CODE_EXPIRY_BATCH_SIZE", default=1000)
+CODE_RETENTION_DAYS = env.int("CODE_RETENTION_DAYS", default=30)
+
+# sliding window limits of the auth endpoints per client IP and per email,
+# enforced by apps.users.throttling.AuthRateThrottle through the Redis cache
+AUTH_RATE_LIMIT_CACHE = env("AUTH_RATE_LIMIT_CACHE", default="default")
+AUTH_RATE_LIMITS = {
+    "login": {"ip": "30/m", "email": "10/m"},
+    "register": {"ip": "10/h"},
+    "code_resend": {"ip": "10/h", "email": "3/h"},
+    "password_reset": {"ip": "20/h", "email": "5/h"},
+    # code guesses, the bare code paths match any user's pending code
+    "code_verify": {"ip": "20/h", "email": "5/h"},
+    "password_reset_confirm": {"ip": "20/h"},
+}
+
+# bulk user import: rows per bulk_create and password hashing processes
+# (defaults to the CPU count)
+USER_IMPORT_CHUNK_SIZE = env.int("USER_IMPORT_CHUNK_SIZE", default=1000)
+USER_IMPORT_WORKERS = env.int("USER_IMPORT_WORKERS", default=0)
+
+# seconds a user loaded for authentication stays cached
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=60)
+
+# email domain deliverability cache (seconds)
+EMAIL_DOMAIN_CACHE_TTL = env.int("EMAIL_DOMAIN_CACHE_TTL", default=60 * 60 * 24)
+EMAIL_DOMAIN_NEGATIVE_TTL = env.int("EMAIL_DOMAIN_NEGATIVE_TTL", default=60 * 60)
+EMAIL_DOMAIN_LOCAL_CACHE_SIZE = env.int("EMAIL_DOMAIN_LOCAL_CACHE_SIZE", default=1024)
+EMAIL_DNS_TIMEOUT = env.int("EMAIL_DNS_TIMEOUT", default=5)
+
+# guardian dashboard: seconds a built dashboard is cached and rows listed
+# per child in the recent submissions and purchases
+GUARDIAN_DASHBOARD_CACHE_TTL = env.int("GUARDIAN_DASHBOARD_CACHE_TTL", default=60 * 5)
+GUARDIAN_DASHBOARD_RECENT = env.int("GUARDIAN_DASHBOARD_RECENT", default=5)
+
+# children an interest needs before the nightly job derives skill weights
+INTEREST_SKILL_MIN_CHILDREN = env.int("INTEREST_SKILL_MIN_CHILDREN", default=3)
+
+# best matches a skill search ranks, pages never go past them
+SKILL_SEARCH_MAX_RESULTS = env.int("SKILL_SEARCH_MAX_RESULTS", default=200)
+
+# skill autocomplete: seconds between change feed reads and full reloads of
+# the in-process index, and the share of trigrams a misspelt word must keep
+SKILL_AUTOCOMPLETE_REFRESH_SECONDS = env.int("SKILL_AUTOCOMPLETE_REFRESH_SECONDS", default=5)
+SKILL_AUTOCOMPLETE_RELOAD_SECONDS = env.int("SKILL_AUTOCOMPLETE_RELOAD_SECONDS", default=60 * 60)
+SKILL_AUTOCOMPLETE_MIN_SIMILARITY = env.float("SKILL_AUTOCOMPLETE_MIN_SIMILARITY", default=0.4)
+
+# seconds catalogue facet counts are cached, writes retire them sooner
+SKILL_FACETS_CACHE_TTL = env.int("SKILL_FACETS_CACHE_TTL", default=60 * 10)
 
 BASE_URL = env("BASE_URL", default="http://localhost:8000/")
 APP_NAME = env("APP_NAME", default="SkillSpeed")
@@ -85,7 +165,7 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.ClaimsJWTAuthentication',
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny"
@@ -139,6 +219,21 @@ DATABASES = {
     }
 }
 
+# Password hashing, the first hasher encodes new passwords and the stored
+# hash of any user is re-encoded on login when the cost below changes.
+# Measure it on the deployment hardware with `manage.py tune_password_hashers`
+PASSWORD_HASHERS = env.list("PASSWORD_HASHERS", default=[
+    "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "apps.users.hashers.TunedScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+])
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS",
+                                     default=1_000_000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR",
+                                      default=2**14)
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -189,6 +284,12 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 timezone = 'Africa/Lagos'
 
+# transactional outbox: relay period (seconds), messages per batch and
+# hours dispatched messages are kept
+OUTBOX_RELAY_INTERVAL = env.int("OUTBOX_RELAY_INTERVAL", default=2)
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=500)
+OUTBOX_RETENTION_HOURS = env.int("OUTBOX_RETENTION_HOURS", default=24)
+
 CELERY_BEAT_SCHEDULE = {
     'auto-expire-otp-every-5-minutes': {
         'task': 'apps.users.services.tasks.auto_expire_otp',
@@ -197,5 +298,27 @@ CELERY_BEAT_SCHEDULE = {
     "auto-expire-reset-code": {
         "task": "apps.users.services.tasks.auto_deactivate_reset_code",
         "schedule": crontab(minute="*/5")
+    },
+    "flush-email-batch": {
+        "task": "apps.users.services.tasks.flush_email_batch",
+        "schedule": 60  # seconds
+    },
+    "relay-outbox": {
+        "task": "apps.users.services.tasks.relay_outbox",
+        "schedule": OUTBOX_RELAY_INTERVAL  # seconds
+    },
+    "purge-expired-tokens": {
+        "task": "apps.users.services.tasks.purge_expired_tokens",
+        "schedule": crontab(minute=0, hour="*/6")
+    },
+    "refresh-child-ages": {
+        "task": "apps.users.services.tasks.refresh_child_ages",
+        "schedule": crontab(minute=5, hour=0)
+    },
+    "rebuild-interest-skill-weights": {
+        "task": "apps.skills.tasks.rebuild_interest_skill_weights",
+        "schedule": crontab(minute=30, hour=1)
     }
 }
+
+TOKEN_PURGE_BATCH_SIZE = env.int("TOKEN_PURGE_BATCH_SIZE", default=1000)
@@ -7,3 +7,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', os.getenv("DJANGO_SETTINGS_MODULE", "src.core.settings.production"))
 application = get_wsgi_application()
+
+# every worker imports this module, load the autocomplete index before the
+# first request rather than during it
+from apps.skills.search.autocomplete import warm_autocomplete
+warm_autocomplete()
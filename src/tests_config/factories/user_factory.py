@@ -42,7 +42,6 @@ class PasswordResetFactory(factory.django.DjangoModelFactory):
     
     reset_code = _hash_otp_code(code=otp_code)
     user = factory.SubFactory(UserFactory)
-    raw_code = otp_code
     
 class GuardianFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -25,7 +25,10 @@ from .user_fixtures import (
 )
 
 from .utils_fixtures import (
-    create_certificate   
+    create_certificate,
+    setup_celery_test_config,
+    otp_code,
+    password_reset
 )
 
 __all__ = [
@@ -42,5 +45,8 @@ __all__ = [
     "instructor_user",
     "admin_user",
     "create_certificate",
+    "setup_celery_test_config",
+    "otp_code",
+    "password_reset",
     "child_profile"
 ]
@@ -9,4 +9,12 @@ def password_reset_token(user):
         token = default_token_generator.make_token(user=user)
     except Exception as e:
         raise Exception(f"Error creating password reset token: {str(e)}")
-    return token
\ No newline at end of file
+    return token
+
+def assert_no_full_scan(queryset):
+    """Fail unless the plan of ``queryset`` reads its table through an index."""
+    table = queryset.model._meta.db_table
+    plan = queryset.explain()
+    # sqlite reports a full scan as SCAN, postgres as Seq Scan
+    assert f"SCAN {table}" not in plan and "Seq Scan" not in plan, plan
+    assert f"{table} USING" in plan or "Index" in plan, plan
@@ -13,4 +13,9 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
     }
-}
\ No newline at end of file
+}
+# throttling tests enable their own limits
+AUTH_RATE_LIMITS = {}
+
+# failed provider calls are not retried in tests
+EMAIL_SEND_RETRIES = 0